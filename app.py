@@ -1,9 +1,24 @@
-from fastapi import FastAPI, File, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from typing import List, Optional
+import json
+import os
+import tempfile
 import urllib
 from src.extractors import CVExtractor, BirthCertExtractor, IDExtractor, DiplomaExtractor, WorkPerminExtractor, AirtableExtractor
 import logging
 import sys
-from src.utils import ExtractionProcess, UpdateAirtable, ProcessAirtable
+from src.utils import (ExtractionProcess, UpdateAirtable, ProcessAirtable, BatchExtraction, configure_transport,
+                       configure_resilience, get_retry_policy, get_breaker_registry,
+                       configure_ocr_cache, get_ocr_cache, get_single_flight,
+                       configure_hedging, get_hedger, JobQueue, JobWorkerPool,
+                       configure_excel_pool, get_excel_pool, configure_preflight, get_preflight,
+                       get_slimming_stats, negotiate_format, configure_result_store, get_result_store,
+                       CandidateExport, get_update_stats, configure_rate_limits, get_rate_limiters,
+                       get_sweep_stats, configure_airtable_sync, get_airtable_sync,
+                       configure_work_ledger, get_work_ledger, WebhookIngestor, AirtablePayloadSource,
+                       ReplayPayloadSource, verify_notification, PollScheduler)
 from src.mapper import EXTRACTOR_MAP, DOCUMENT_REQUIREMENTS, CONSTANT_COLUMN, CONSTANT_COLUMN_EXTRACTED, extract_url
 import threading
 import time
@@ -21,11 +36,99 @@ AIRTABLE_TABLE_NAME = "Candidate Data copy"
 # Google Drive folder ID
 PARENT_FOLDER_ID = "152BmT2NwrO9PQegVf5BZHI0D23hZ7OBD"
 
-# Run Time
+# Run Time: seconds between background sweeps while they find work. Each idle
+# sweep multiplies the wait by POLL_BACKOFF, up to POLL_MAX_INTERVAL.
 RUN_TIME = 5
+POLL_MAX_INTERVAL = 120
+POLL_BACKOFF = 2.0
+
+# Incremental Airtable polling: only records modified since the last poll are read,
+# with a full reconciliation poll every AIRTABLE_FULL_SYNC_INTERVAL seconds
+AIRTABLE_SYNC_DB_PATH = "airtable_sync.sqlite3"
+AIRTABLE_FULL_SYNC_INTERVAL = 3600
+AIRTABLE_SYNC_OVERLAP = 60
+
+# Airtable webhook ingestion (POST /airtable/webhook). While it is enabled the poll
+# above becomes a safety net running every SAFETY_POLL_TIME seconds to catch missed notifications.
+AIRTABLE_WEBHOOK_ID = None
+AIRTABLE_WEBHOOK_MAC_SECRET = None
+# Table ids whose changes are swept, e.g. ["tblXXXXXXXXXXXXXX"]; None for every table
+AIRTABLE_WEBHOOK_TABLE_IDS = None
+# Recorded list-payloads responses replayed instead of a live webhook, for offline testing
+AIRTABLE_WEBHOOK_REPLAY_PATH = None
+AIRTABLE_WEBHOOK_DEBOUNCE = 0.5
+WEBHOOK_RECORD_CHUNK = 100
+SAFETY_POLL_TIME = 300
+
+# Outbound HTTP connection pool shared by every extractor and Airtable call
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 20
+HTTP_KEEPALIVE_TIMEOUT = 30
+
+# OCR result cache (memory LRU tier + SQLite tier shared by all workers)
+OCR_CACHE_MAX_ENTRIES = 512
+OCR_CACHE_TTL = 3600
+OCR_CACHE_PATH = "ocr_cache.sqlite3"
+OCR_CACHE_DISK_TTL = 7 * 24 * 3600
+
+# Retry and circuit breaker settings for outbound API calls
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 10
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RECOVERY_TIMEOUT = 30
+
+# Hedged requests for extractors that opt in (hedge_requests = True)
+HEDGE_PERCENTILE = 0.95
+HEDGE_BUDGET_RATIO = 0.05
+
+# Maximum number of documents of one /extract_batch call processed at once
+BATCH_CONCURRENCY = 4
+
+# Worker processes generating Excel/CSV output off the event loop
+EXCEL_POOL_WORKERS = 2
+
+# Pre-flight limits applied before a document is sent for OCR
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+MAX_PDF_PAGES = 50
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+MAX_BATCH_REQUEST_BYTES = 200 * 1024 * 1024
+
+# Durable asynchronous extraction jobs
+JOBS_DB_PATH = "jobs.sqlite3"
+JOBS_STORAGE_DIR = "job_files"
+JOB_WORKERS = 2
+JOB_MAX_ATTEMPTS = 3
+JOB_LEASE_TIMEOUT = 300
+
+# Requests per second and burst allowed per provider scope (each Airtable base is its own scope)
+RATE_LIMITS = {
+    "airtable": {"rate": 5, "burst": 5},
+    "airtable_content": {"rate": 10, "burst": 10},
+    "drive": {"rate": 10, "burst": 10},
+}
+
+# Airtable record updates are merged and sent in multi-record PATCH calls
+AIRTABLE_UPDATE_BATCH_SIZE = 10
+AIRTABLE_UPDATE_FLUSH_INTERVAL = 1.0
+
+# Workers per Airtable sweep stage and work items buffered between stages
+SWEEP_CONCURRENCY = {"download": 4, "extract": 4, "drive": 2, "update": 2}
+SWEEP_QUEUE_SIZE = 8
+
+# Extraction results kept for the consolidated candidate export
+RESULTS_DB_PATH = "results.sqlite3"
+
+# Stages each Airtable attachment completed, so sweeps resume instead of redoing work
+WORK_LEDGER_PATH = "work_ledger.sqlite3"
 
 SHUTDOWN_EVENT = asyncio.Event()
 BACKGROUND_TASK = None
+JOB_QUEUE = None
+WEBHOOK_INGESTOR = None
+POLL_SCHEDULER = None
+# Webhook and polling sweeps run one at a time
+SWEEP_LOCK = asyncio.Lock()
 
 # Set up logging with detailed information
 logging.basicConfig(
@@ -43,109 +146,439 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup code (runs when the app starts)
-    global BACKGROUND_TASK
+    global BACKGROUND_TASK, JOB_QUEUE, WEBHOOK_INGESTOR, POLL_SCHEDULER
+    # Shared keep-alive pool used by every outbound HTTP call
+    transport = configure_transport(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+    )
+    await transport.start()
+    configure_resilience(
+        retry={"max_attempts": RETRY_MAX_ATTEMPTS,
+               "base_delay": RETRY_BASE_DELAY, "max_delay": RETRY_MAX_DELAY},
+        breaker={"failure_threshold": BREAKER_FAILURE_THRESHOLD,
+                 "recovery_timeout": BREAKER_RECOVERY_TIMEOUT}
+    )
+    configure_rate_limits(RATE_LIMITS)
+    configure_preflight(max_size=MAX_UPLOAD_BYTES,
+                        max_pdf_pages=MAX_PDF_PAGES)
+    excel_pool = configure_excel_pool(workers=EXCEL_POOL_WORKERS)
+    await asyncio.to_thread(excel_pool.start)
+    configure_hedging(percentile=HEDGE_PERCENTILE,
+                      budget_ratio=HEDGE_BUDGET_RATIO)
+    configure_ocr_cache(
+        max_entries=OCR_CACHE_MAX_ENTRIES,
+        ttl=OCR_CACHE_TTL,
+        db_path=OCR_CACHE_PATH,
+        disk_ttl=OCR_CACHE_DISK_TTL
+    )
+    configure_result_store(RESULTS_DB_PATH)
+    configure_work_ledger(WORK_LEDGER_PATH)
+    configure_airtable_sync(AIRTABLE_SYNC_DB_PATH,
+                            full_sync_interval=AIRTABLE_FULL_SYNC_INTERVAL,
+                            overlap=AIRTABLE_SYNC_OVERLAP)
+    payload_source = None
+    if AIRTABLE_WEBHOOK_REPLAY_PATH:
+        if not AIRTABLE_WEBHOOK_MAC_SECRET:
+            logger.warning(
+                "Webhook replay is enabled without AIRTABLE_WEBHOOK_MAC_SECRET; "
+                "/airtable/webhook accepts unsigned notifications")
+        payload_source = ReplayPayloadSource(AIRTABLE_WEBHOOK_REPLAY_PATH)
+    elif AIRTABLE_WEBHOOK_ID and not AIRTABLE_WEBHOOK_MAC_SECRET:
+        logger.error(
+            "AIRTABLE_WEBHOOK_ID is set without AIRTABLE_WEBHOOK_MAC_SECRET; webhook ingestion "
+            "stays disabled so unauthenticated notifications cannot trigger sweeps")
+    elif AIRTABLE_WEBHOOK_ID:
+        payload_source = AirtablePayloadSource(
+            AIRTABLE_BASE_ID, AIRTABLE_WEBHOOK_ID, AIRTABLE_API_KEY)
+    if payload_source is not None:
+        WEBHOOK_INGESTOR = WebhookIngestor(
+            payload_source, sweep_records, sync=get_airtable_sync(),
+            table_ids=AIRTABLE_WEBHOOK_TABLE_IDS, debounce=AIRTABLE_WEBHOOK_DEBOUNCE)
+    JOB_QUEUE = JobQueue(JOBS_DB_PATH, JOBS_STORAGE_DIR,
+                         lease_timeout=JOB_LEASE_TIMEOUT, max_attempts=JOB_MAX_ATTEMPTS)
+    job_workers = JobWorkerPool(
+        JOB_QUEUE, EXTRACTOR_MAP, HEADERS, workers=JOB_WORKERS)
+    job_workers.start()
+    if WEBHOOK_INGESTOR is not None:
+        POLL_SCHEDULER = PollScheduler(SAFETY_POLL_TIME, SAFETY_POLL_TIME)
+    else:
+        POLL_SCHEDULER = PollScheduler(
+            RUN_TIME, POLL_MAX_INTERVAL, backoff=POLL_BACKOFF)
     # ✅ Uses FastAPI's event loop
-    task = asyncio.create_task(run_airtable_update_task())
+    BACKGROUND_TASK = asyncio.create_task(
+        POLL_SCHEDULER.run(run_airtable_update_task, SHUTDOWN_EVENT))
     logger.info("Background Airtable update service started")
 
     yield  # This line separates startup from shutdown code
 
     SHUTDOWN_EVENT.set()  # Signal the loop to stop on shutdown
     await BACKGROUND_TASK   # Ensure the background task exits cleanly
+    if WEBHOOK_INGESTOR is not None:
+        await WEBHOOK_INGESTOR.close()
+    await job_workers.stop()
+    await transport.close()
+    excel_pool.shutdown()
     logger.info("Shutting down background tasks")
 
 # Create FastAPI app with lifespan
 app = FastAPI(lifespan=lifespan)
 
 
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """
+    Reject uploads whose Content-Length exceeds the limit before the body is read.
+
+    Args:
+        request (Request): The incoming request.
+        call_next: The next handler in the middleware chain.
+
+    Returns:
+        Response: 413 for oversized uploads, otherwise the endpoint's response.
+    """
+    content_length = request.headers.get("content-length", "")
+    if request.method == "POST" and content_length.isdigit():
+        if request.url.path == "/extract_batch":
+            limit = MAX_BATCH_REQUEST_BYTES
+        else:
+            limit = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+        if int(content_length) > limit:
+            error = get_preflight().reject(
+                "too_large", 413, f"Request is {content_length} bytes; the limit is {limit} bytes")
+            return JSONResponse(content={"detail": error.detail}, status_code=error.status_code)
+    return await call_next(request)
+
+
 @app.post("/extract_cv")
-async def extract(file: UploadFile = File(...)):
+async def extract(request: Request, file: UploadFile = File(...),
+                 output: Optional[str] = Query(None, alias="format")):
     """
     Extract information from a CV/resume document.
 
     Args:
+        request (Request): The incoming request; its Accept header selects the format.
         file (UploadFile): The CV document file to be processed.
+        output (Optional[str]): Response format ("xlsx", "csv", "json" or "ndjson");
+            defaults to the Accept header, then xlsx.
 
     Returns:
         dict: Extracted information from the CV in a structured format.
     """
-    extrator = ExtractionProcess(CVExtractor, file, HEADERS)
+    extrator = ExtractionProcess(CVExtractor, file, HEADERS, negotiate_format(
+        request.headers.get("accept"), output))
     result = await extrator.proccess_extraction()
     return result
 
 
 @app.post("/extract_birth_cert")
-async def extract_birth_cert(file: UploadFile = File(...)):
+async def extract_birth_cert(request: Request, file: UploadFile = File(...),
+                            output: Optional[str] = Query(None, alias="format")):
     """
     Extract information from a birth certificate document.
 
     Args:
+        request (Request): The incoming request; its Accept header selects the format.
         file (UploadFile): The birth certificate document file to be processed.
+        output (Optional[str]): Response format ("xlsx", "csv", "json" or "ndjson");
+            defaults to the Accept header, then xlsx.
 
     Returns:
         dict: Structured data extracted from the birth certificate.
     """
-    extrator = ExtractionProcess(BirthCertExtractor, file, HEADERS)
+    extrator = ExtractionProcess(BirthCertExtractor, file, HEADERS, negotiate_format(
+        request.headers.get("accept"), output))
     result = await extrator.proccess_extraction()
     return result
 
 
 @app.post("/extract_id")
-async def extract_id(file: UploadFile = File(...)):
+async def extract_id(request: Request, file: UploadFile = File(...),
+                    output: Optional[str] = Query(None, alias="format")):
     """
     Extract information from an ID document.
 
     Args:
+        request (Request): The incoming request; its Accept header selects the format.
         file (UploadFile): The ID document file to be processed.
+        output (Optional[str]): Response format ("xlsx", "csv", "json" or "ndjson");
+            defaults to the Accept header, then xlsx.
 
     Returns:
         dict: Structured data extracted from the ID document.
     """
-    extrator = ExtractionProcess(IDExtractor, file, HEADERS)
+    extrator = ExtractionProcess(IDExtractor, file, HEADERS, negotiate_format(
+        request.headers.get("accept"), output))
     result = await extrator.proccess_extraction()
     return result
 
 
 @app.post("/extract_diploma")
-async def extract_diploma(file: UploadFile = File(...)):
+async def extract_diploma(request: Request, file: UploadFile = File(...),
+                         output: Optional[str] = Query(None, alias="format")):
     """
     Extract information from a diploma or educational certificate.
 
     Args:
+        request (Request): The incoming request; its Accept header selects the format.
         file (UploadFile): The diploma document file to be processed.
+        output (Optional[str]): Response format ("xlsx", "csv", "json" or "ndjson");
+            defaults to the Accept header, then xlsx.
 
     Returns:
         dict: Structured data extracted from the diploma document.
     """
-    extrator = ExtractionProcess(DiplomaExtractor, file, HEADERS)
+    extrator = ExtractionProcess(DiplomaExtractor, file, HEADERS, negotiate_format(
+        request.headers.get("accept"), output))
     result = await extrator.proccess_extraction()
     return result
 
 
 @app.post("/extract_working_permit")
-async def extract_working_permit(file: UploadFile = File(...)):
+async def extract_working_permit(request: Request, file: UploadFile = File(...),
+                                output: Optional[str] = Query(None, alias="format")):
     """
     Extract information from a working permit document.
 
     Args:
+        request (Request): The incoming request; its Accept header selects the format.
         file (UploadFile): The working permit document file to be processed.
+        output (Optional[str]): Response format ("xlsx", "csv", "json" or "ndjson");
+            defaults to the Accept header, then xlsx.
 
     Returns:
         dict: Structured data extracted from the working permit document.
     """
-    extrator = ExtractionProcess(WorkPerminExtractor, file, HEADERS)
+    extrator = ExtractionProcess(WorkPerminExtractor, file, HEADERS, negotiate_format(
+        request.headers.get("accept"), output))
     result = await extrator.proccess_extraction()
     return result
 
 
+@app.post("/extract_batch")
+async def extract_batch(files: List[UploadFile] = File(...), doc_types: List[str] = Form(...)):
+    """
+    Extract information from several documents in one request.
+
+    Args:
+        files (List[UploadFile]): The document files to be processed.
+        doc_types (List[str]): Document type of each file, as a key of EXTRACTOR_MAP
+            (e.g. "extract_cv"). A single value applies to every file.
+
+    Returns:
+        StreamingResponse: ZIP archive with one workbook per successful file and a
+        manifest.json describing the status of every file.
+    """
+    if len(doc_types) == 1:
+        doc_types = doc_types * len(files)
+    if len(doc_types) != len(files):
+        raise HTTPException(
+            status_code=400, detail="Provide one doc_type per file or a single doc_type for all files")
+    unknown = sorted(set(doc_types) - set(EXTRACTOR_MAP))
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown doc_type(s): {', '.join(unknown)}")
+
+    batch = BatchExtraction(EXTRACTOR_MAP, list(
+        zip(doc_types, files)), HEADERS, concurrency=BATCH_CONCURRENCY)
+    return StreamingResponse(
+        batch.stream(),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=\"batch_extraction.zip\""}
+    )
+
+
+@app.post("/jobs/{doc_type}", status_code=202)
+async def create_job(doc_type: str, file: UploadFile = File(...)):
+    """
+    Queue a document for asynchronous extraction.
+
+    Args:
+        doc_type (str): Document type, as a key of EXTRACTOR_MAP (e.g. "extract_cv").
+        file (UploadFile): The document file to be processed.
+
+    Returns:
+        dict: The job id and its initial status.
+    """
+    if doc_type not in EXTRACTOR_MAP:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown doc_type: {doc_type}")
+    await asyncio.to_thread(get_preflight().check, file.filename, file.file)
+    job_id = await JOB_QUEUE.enqueue(doc_type, file)
+    return {"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Return the status of an extraction job.
+
+    Args:
+        job_id (str): The job id returned by POST /jobs/{doc_type}.
+
+    Returns:
+        dict: Job status, attempts, error if any, and the result URL once finished.
+    """
+    job = await JOB_QUEUE.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job["id"],
+        "doc_type": job["doc_type"],
+        "filename": job["filename"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "error": job["error"],
+        "result_url": f"/jobs/{job_id}/result" if job["status"] == "succeeded" else None
+    }
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    Download the workbook produced by a finished extraction job.
+
+    Args:
+        job_id (str): The job id returned by POST /jobs/{doc_type}.
+
+    Returns:
+        FileResponse: The generated Excel workbook.
+    """
+    job = await JOB_QUEUE.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "succeeded":
+        return JSONResponse(content={"detail": f"Job is {job['status']}"}, status_code=409)
+    return FileResponse(
+        job["result_path"],
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=job["result_filename"]
+    )
+
+
+async def read_stats(store) -> Optional[dict]:
+    """
+    Read the stats of a SQLite-backed component in a worker thread.
+
+    Args:
+        store: Component with a stats() method, or None if it is disabled
+
+    Returns:
+        Optional[dict]: The component's stats, None if it is disabled
+    """
+    return await asyncio.to_thread(store.stats) if store else None
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Expose runtime counters for monitoring and capacity planning.
+
+    Returns:
+        dict: Counters grouped by component.
+    """
+    cache = get_ocr_cache()
+    jobs, results, work_ledger, airtable_sync = await asyncio.gather(
+        read_stats(JOB_QUEUE), read_stats(get_result_store()),
+        read_stats(get_work_ledger()), read_stats(get_airtable_sync()))
+    return {
+        "ocr_cache": cache.stats() if cache else None,
+        "single_flight": get_single_flight().stats(),
+        "retries": get_retry_policy().stats(),
+        "circuit_breakers": get_breaker_registry().snapshot(),
+        "hedging": get_hedger().stats(),
+        "jobs": jobs,
+        "excel_pool": get_excel_pool().stats(),
+        "preflight": get_preflight().stats(),
+        "slimming": get_slimming_stats().stats(),
+        "results": results,
+        "airtable_updates": get_update_stats(),
+        "rate_limits": get_rate_limiters().stats(),
+        "sweep": get_sweep_stats(),
+        "work_ledger": work_ledger,
+        "webhooks": WEBHOOK_INGESTOR.stats() if WEBHOOK_INGESTOR else None,
+        "poll_scheduler": POLL_SCHEDULER.stats() if POLL_SCHEDULER else None,
+        "airtable_sync": airtable_sync
+    }
+
+
+@app.get("/export")
+async def export_candidates(output: str = Query("xlsx", alias="format"), document: Optional[str] = None):
+    """
+    Export the extraction results of every candidate in one file.
+
+    Walks the Airtable table page by page and joins it with the stored
+    extraction results, so memory stays constant however many candidates
+    the table holds.
+
+    Args:
+        output (str): "xlsx" for a workbook with one sheet per document, or "csv"
+            for a single document.
+        document (Optional[str]): Airtable attachment column to export (e.g.
+            "Birth Certificate"); required for CSV, defaults to every document.
+
+    Returns:
+        FileResponse or StreamingResponse: The workbook, or the CSV file streamed page by page.
+    """
+    if output not in ("xlsx", "csv"):
+        raise HTTPException(
+            status_code=400, detail="Unknown format; expected xlsx or csv")
+    if document is not None and document not in CONSTANT_COLUMN_EXTRACTED:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown document: {document}")
+    if output == "csv" and document is None:
+        raise HTTPException(
+            status_code=400, detail="A CSV export needs a document")
+    store = get_result_store()
+    if store is None:
+        raise HTTPException(
+            status_code=503, detail="Extraction results are not being recorded")
+
+    pages = AirtableExtractor(
+        files={}, headers=AIRTABLE_API_KEY, table_name=urllib.parse.quote(AIRTABLE_TABLE_NAME),
+        dynamic_url=extract_url()).iter_pages()
+    export = CandidateExport(
+        pages, store, [document] if document else list(CONSTANT_COLUMN_EXTRACTED))
+
+    if output == "csv":
+        return StreamingResponse(
+            export.iter_csv(),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f"attachment; filename=\"{document}_export.csv\""}
+        )
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        await export.write_xlsx(path)
+    except Exception as e:
+        os.remove(path)
+        logger.error(f"Candidate export failed: {str(e)}")
+        raise HTTPException(
+            status_code=502, detail=f"Candidate export failed: {str(e)}")
+    return FileResponse(
+        path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename="candidate_export.xlsx",
+        background=BackgroundTask(os.remove, path)
+    )
+
+
 @app.get("/update_airtable")
-async def update_airtable():
+async def update_airtable(full: bool = False):
     """
     Endpoint to update Airtable records and process attachments.
 
     This endpoint fetches data from Airtable, processes attachments based on   specific document requirements,
     downloads files, processes them, uploads the processed files to Google Drive, and updates Airtable with the new information.
 
+    Only records modified since the last completed poll are fetched, except for the
+    periodic full reconciliation poll; the watermark only moves once every page was read.
+
+    Args:
+        full (bool): Read every matching record instead of the ones modified since the last poll.
+
     Returns:
         list: A list of statuses indicating the result of each Airtable update  operation.
 
@@ -161,39 +594,142 @@ async def update_airtable():
         - CONSTANT_COLUMN_EXTRACTED: Dictionary mapping extracted constants to  their respective Airtable fields.
         - AIRTABLE_API_KEY, AIRTABLE_BASE_ID, AIRTABLE_TABLE_NAME,  PARENT_FOLDER_ID: Airtable and Google Drive configuration constants.
     """
+    response, _ = await poll_airtable(full)
+
+    if response:
+        return response
+
+    return {"status": "No records processed"}
+
+
+async def poll_airtable(full: bool = False):
+    """
+    Sweep the records modified since the last completed poll and move the watermark.
+
+    Args:
+        full (bool): Read every matching record instead of the ones modified since the last poll.
+
+    Returns:
+        tuple: The status of each Airtable update operation and the counters of this sweep.
+    """
+    sync = get_airtable_sync()
+    sync_pass = await asyncio.to_thread(
+        sync.begin, AIRTABLE_TABLE_NAME, force_full=full) if sync else None
+
+    response, stats = await run_sweep(
+        modified_after=sync_pass.modified_after if sync_pass else None)
+
+    # A poll that could not read every page is repeated from the same watermark
+    if sync_pass and not any(status.get("stage") == "fetch" for status in response):
+        await asyncio.to_thread(sync.complete, sync_pass)
+
+    return response, stats
+
+
+async def run_sweep(modified_after: Optional[str] = None, record_ids: Optional[List[str]] = None):
+    """
+    Run one Airtable sweep over the matching records.
+
+    Args:
+        modified_after (Optional[str]): Only sweep records modified after this ISO 8601 time.
+        record_ids (Optional[List[str]]): Only sweep these records.
+
+    Returns:
+        tuple: The status of each Airtable update operation and the counters of this sweep.
+    """
     table_name_encoded = urllib.parse.quote(AIRTABLE_TABLE_NAME)
 
     url = extract_url()
 
-    data = AirtableExtractor(
-        files={}, headers=AIRTABLE_API_KEY, table_name=table_name_encoded, dynamic_url=url).extract()
+    async with SWEEP_LOCK:
+        # Every matching record, across all pages, fetched lazily while earlier ones are processed
+        detail = AirtableExtractor(
+            files={}, headers=AIRTABLE_API_KEY, table_name=table_name_encoded, dynamic_url=url,
+            modified_after=modified_after, record_ids=record_ids).iter_records()
 
-    detail = data.get("records", [])
+        airtableClass = UpdateAirtable(
+            AIRTABLE_API_KEY, AIRTABLE_BASE_ID, AIRTABLE_TABLE_NAME, PARENT_FOLDER_ID,
+            batch_size=AIRTABLE_UPDATE_BATCH_SIZE, flush_interval=AIRTABLE_UPDATE_FLUSH_INTERVAL)
 
-    airtableClass = UpdateAirtable(
-        AIRTABLE_API_KEY, AIRTABLE_BASE_ID, AIRTABLE_TABLE_NAME, PARENT_FOLDER_ID)
+        process_airtable = ProcessAirtable(CONSTANT_COLUMN, DOCUMENT_REQUIREMENTS,
+                                           EXTRACTOR_MAP, CONSTANT_COLUMN_EXTRACTED, HEADERS, airtableClass, detail,
+                                           concurrency=SWEEP_CONCURRENCY, queue_size=SWEEP_QUEUE_SIZE)
 
-    process_airtable = ProcessAirtable(CONSTANT_COLUMN, DOCUMENT_REQUIREMENTS,
-                                       EXTRACTOR_MAP, CONSTANT_COLUMN_EXTRACTED, HEADERS, airtableClass, detail)
+        response = await process_airtable.process_airtable()
+        return response, process_airtable.sweep_stats
 
-    response = await process_airtable.process_airtable()
 
-    if response:
-        return response
+async def sweep_records(record_ids: List[str]):
+    """
+    Sweep the records a webhook notification reported as created or changed.
 
-    return {"status": "No records processed"}
+    Args:
+        record_ids (List[str]): Airtable record ids
+
+    Returns:
+        list: A list of statuses indicating the result of each Airtable update operation.
 
+    Raises:
+        RuntimeError: If the records could not be read, so the payloads are pulled again.
+    """
+    response = []
+    for start in range(0, len(record_ids), WEBHOOK_RECORD_CHUNK):
+        statuses, _ = await run_sweep(record_ids=record_ids[start:start + WEBHOOK_RECORD_CHUNK])
+        if any(status.get("stage") == "fetch" for status in statuses):
+            raise RuntimeError("Reading the changed Airtable records failed")
+        response.extend(statuses)
+    return response
 
-# Background task to run update_airtable every 60 seconds
+
+@app.post("/airtable/webhook")
+async def airtable_webhook(request: Request):
+    """
+    Receive an Airtable webhook notification.
+
+    The notification is acknowledged at once; the webhook's payloads are
+    then pulled in the background and only the records they touched are
+    swept. Repeated notifications are ignored.
+
+    Args:
+        request (Request): Notification sent by Airtable.
+
+    Returns:
+        dict: "accepted", or "duplicate" for a notification already received.
+    """
+    if WEBHOOK_INGESTOR is None:
+        raise HTTPException(
+            status_code=503, detail="Webhook ingestion is not enabled")
+    body = await request.body()
+    if AIRTABLE_WEBHOOK_MAC_SECRET and not verify_notification(
+            body, request.headers.get("X-Airtable-Content-MAC"), AIRTABLE_WEBHOOK_MAC_SECRET):
+        raise HTTPException(
+            status_code=401, detail="Invalid notification signature")
+    try:
+        notification = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Notification is not valid JSON")
+    if not isinstance(notification, dict):
+        raise HTTPException(
+            status_code=400, detail="Notification is not a JSON object")
+    accepted = WEBHOOK_INGESTOR.notify(notification)
+    return {"status": "accepted" if accepted else "duplicate"}
+
+
+# Background sweep, run by POLL_SCHEDULER: every RUN_TIME seconds while there is
+# work, backing off while idle, or every SAFETY_POLL_TIME seconds while webhooks drive the sweeps
 async def run_airtable_update_task():
-    while True:
-        try:
-            logger.info("Running scheduled Airtable update")
-            await update_airtable()
-            logger.info("Scheduled Airtable update completed")
-        except Exception as e:
-            logger.error(f"Error in scheduled Airtable update: {e}")
-        await asyncio.sleep(RUN_TIME)
+    """
+    Run one scheduled Airtable update.
+
+    Returns:
+        int: Work items the sweep found, excluding those the ledger already finished.
+    """
+    logger.info("Running scheduled Airtable update")
+    # The sweep's own counters, as a webhook or manual sweep may finish in between
+    _, stats = await poll_airtable()
+    logger.info("Scheduled Airtable update completed")
+    return stats.get("planned", 0) - stats.get("skipped", 0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+"""
+Compare the streaming and pandas Excel engines on a CV with a large
+work-experience table, and on a single-sheet workbook where the pandas
+engine rewrites every cell while formatting.
+
+Usage:
+    python benchmarks/bench_excel_generator.py [rows] [repeats]
+"""
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.excel_generator import ExcelGenerator  # noqa: E402
+
+
+def make_cv(rows: int) -> dict:
+    return {
+        "personal_info": {"Candidate Name": "Jane Doe", "Email": "", "Phone": "555-0100"},
+        "introduction": "Experienced engineer\nwith a long career.",
+        "work_experience": [
+            {"Company": f"Company {i}", "Position": "Engineer",
+             "StartDate": "2001-01", "EndDate": "" if i % 7 == 0 else "2002-01",
+             "Description": "Built things " * 10}
+            for i in range(rows)
+        ],
+        "technical_skills": [f"Skill {i}" for i in range(50)],
+        "education": ["BSc Computer Science"],
+        "awards": [],
+    }
+
+
+def make_ids(rows: int) -> dict:
+    return {"id_info": [
+        {"Candidate Name": f"Jane {i}", "ID Type": "Passport", "ID Number": str(100000 + i),
+         "Date of birth": "" if i % 7 == 0 else "1990-01-01", "Candidate Address": "1 Main St"}
+        for i in range(rows)
+    ]}
+
+
+def run(engine: str, method: str, data: dict, repeats: int) -> dict:
+    generate = getattr(ExcelGenerator(engine=engine), method)
+    generate(data)  # warm-up
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        size = len(generate(data)["excel_data"])
+    elapsed = (time.perf_counter() - started) / repeats
+
+    tracemalloc.start()
+    generate(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_mb": peak / 1e6, "bytes": size}
+
+
+def import_seconds(module: str) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    return float(subprocess.check_output([sys.executable, "-c", code]).decode())
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    scenarios = [
+        (f"CV with {rows} work-experience rows", "generate_cv_excel", make_cv(rows)),
+        (f"ID workbook with {rows} records", "generate_id_excel", make_ids(rows)),
+    ]
+
+    for title, method, data in scenarios:
+        print(f"{title}, {repeats} repeats")
+        for engine in ("pandas", "streaming"):
+            result = run(engine, method, data, repeats)
+            print(f"{engine:>10}: {result['seconds'] * 1000:8.1f} ms/workbook, "
+                  f"peak {result['peak_mb']:6.1f} MB, {result['bytes']} bytes")
+    print(f"import pandas:     {import_seconds('pandas') * 1000:.0f} ms")
+    print(f"import xlsxwriter: {import_seconds('xlsxwriter') * 1000:.0f} ms")
@@ -0,0 +1,94 @@
+"""
+Compare the throughput of the Airtable sweep run one document at a time, as
+the former ProcessAirtable did, with the staged concurrent pipeline.
+
+Network and OCR latencies are simulated with sleeps, so the numbers show how
+much the stages overlap rather than real provider speed.
+
+Usage:
+    python benchmarks/bench_sweep_pipeline.py [documents] [download_ms] [extract_ms] [drive_ms]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import ExtractionProcess, ProcessAirtable  # noqa: E402
+
+SAMPLE_PDF = b"%PDF-1.4\n1 0 obj << /Type /Page >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+LATENCY = {"download": 0.2, "extract": 0.5, "drive": 0.3, "update": 0.0}
+
+
+class SimulatedExtractor:
+    output_format = "xlsx"
+
+    def __init__(self, files, headers):
+        self.files = files
+
+    async def extract(self):
+        await asyncio.sleep(LATENCY["extract"])
+        return {"excel_data": b"workbook", "filename": "result.xlsx",
+                "data": {"personal_info": {"Name": "Jane"}}}
+
+
+class SimulatedAirtable:
+
+    async def download_file(self, url):
+        await asyncio.sleep(LATENCY["download"])
+        return SAMPLE_PDF
+
+    async def send_to_google_drive(self, file_byte, excelname):
+        await asyncio.sleep(LATENCY["drive"])
+        return {"file_id": excelname}
+
+    async def update(self, file_id, candidate_id, column_name):
+        await asyncio.sleep(LATENCY["update"])
+        return {"status": "link queued", "id": candidate_id}
+
+    async def flush(self):
+        return []
+
+
+def make_records(count: int) -> list:
+    return [{"id": f"rec{index}", "fields": {
+        "Name": f"Candidate {index}", "Confirm": "No Attachment",
+        "Upload": [{"url": f"https://example.com/{index}", "filename": f"doc{index}.pdf"}]}}
+        for index in range(count)]
+
+
+async def sweep_sequential(records: list) -> int:
+    """The download, extract, upload and update loop of the former ProcessAirtable"""
+    airtable = SimulatedAirtable()
+    done = 0
+    for record in records:
+        for attachment in record["fields"]["Upload"]:
+            file_data = await airtable.download_file(attachment["url"])
+            response = await ExtractionProcess(SimulatedExtractor, file_data, {}).proccess_extraction()
+            drive = await airtable.send_to_google_drive(response.body, attachment["filename"])
+            await airtable.update(drive["file_id"], record["id"], "Extracted")
+            done += 1
+    return done
+
+
+async def sweep_pipeline(records: list) -> int:
+    process = ProcessAirtable({"Confirm": "Upload"}, {"extract_simulated": ["Upload"]},
+                              {"extract_simulated": SimulatedExtractor}, {"Upload": "Extracted"},
+                              {}, SimulatedAirtable(), records)
+    statuses = await process.process_airtable()
+    return sum(status["status"] == "success" for status in statuses)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for stage, arg in zip(("download", "extract", "drive"), sys.argv[2:5]):
+        LATENCY[stage] = int(arg) / 1000
+    records = make_records(count)
+
+    print(f"Sweeping {count} documents, simulated latency (s): {LATENCY}")
+    for name, sweep in (("sequential", sweep_sequential), ("pipeline", sweep_pipeline)):
+        started = time.perf_counter()
+        done = asyncio.run(sweep(records))
+        seconds = time.perf_counter() - started
+        print(f"{name:>10}: {seconds:6.2f} s, {done * 60 / seconds:7.1f} documents/minute")
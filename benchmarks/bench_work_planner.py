@@ -0,0 +1,82 @@
+"""
+Compare planning the extraction work of synthetic Airtable records with the
+former nested loops of ProcessAirtable and with the precompiled WorkPlanner.
+
+Usage:
+    python benchmarks/bench_work_planner.py [records] [repeats]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.mapper import (CONSTANT_COLUMN, CONSTANT_COLUMN_EXTRACTED, DOCUMENT_REQUIREMENTS,  # noqa: E402
+                        EXTRACTOR_MAP, WorkPlanner)
+
+FIELD_ARGS = 'No Attachment'
+
+
+def make_records(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        fields = {"Name": f"Candidate {index}", "Email": f"c{index}@example.com",
+                  "Status": "Applied", "Notes": "x" * 40}
+        for confirmation, upload in CONSTANT_COLUMN.items():
+            roll = rng.random()
+            if roll < 0.3:
+                fields[confirmation] = FIELD_ARGS
+                fields[upload] = [{"url": f"https://example.com/{index}/{upload}/{n}",
+                                   "filename": f"{upload}_{n}.pdf"} for n in range(rng.randint(1, 2))]
+            elif roll < 0.6:
+                fields[confirmation] = "Extracted"
+                fields[upload] = [{"url": f"https://example.com/{index}/{upload}", "filename": "done.pdf"}]
+        records.append({"id": f"rec{index}", "fields": fields})
+    return records
+
+
+def plan_nested(record: dict) -> list:
+    """The planning part of the former ProcessAirtable.process_airtable"""
+    items = []
+    field = record.get("fields", {})
+    for fieldkey, fieldvalue in field.items():
+        for constcolumnkey, constcolumnvalue in CONSTANT_COLUMN.items():
+            if constcolumnkey == fieldkey:
+                if fieldvalue == FIELD_ARGS and constcolumnvalue in field:
+                    for fielditem in field.get(constcolumnvalue, []):
+                        for doc_method, doc_type in DOCUMENT_REQUIREMENTS.items():
+                            if constcolumnvalue in doc_type:
+                                extractor_class = EXTRACTOR_MAP.get(doc_method)
+                                if extractor_class:
+                                    items.append((record.get("id"), fielditem, extractor_class,
+                                                  CONSTANT_COLUMN_EXTRACTED.get(constcolumnvalue)))
+    return items
+
+
+def run(plan, records: list, repeats: int) -> tuple:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        count = sum(len(plan(record)) for record in records)
+        best = min(best, time.perf_counter() - started)
+    return best, count
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    records = make_records(count)
+    planner = WorkPlanner()
+
+    nested = [(item[0], item[1], item[2], item[3])
+              for record in records for item in plan_nested(record)]
+    planned = [(item.record_id, item.attachment, item.extractor_class, item.target_column)
+               for record in records for item in planner.plan(record)]
+    assert nested == planned, "planner and nested loops disagree"
+
+    print(f"Planning {count} records, best of {repeats}")
+    for name, plan in (("nested loops", plan_nested), ("WorkPlanner", planner.plan)):
+        seconds, items = run(plan, records, repeats)
+        print(f"{name:>13}: {seconds * 1000:8.1f} ms, {seconds / count * 1e6:6.2f} us/record, {items} work items")
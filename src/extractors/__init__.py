@@ -4,11 +4,11 @@ from .birth_cert_extractor import BirthCertExtractor
 from .id_extractor import IDExtractor
 from .diploma_extractor import DiplomaExtractor
 from .work_permit_extractor import WorkPerminExtractor
-from .base_extractor import ExtractorError, APITimeoutError, APIResponseError
+from .base_extractor import ExtractorError, APITimeoutError, APIResponseError, CircuitOpenError
 from .airtable_extractor import AirtableExtractor
 
 __all__ = ['BirthCertExtractor',
            'ExtractorError', 'APITimeoutError',
-           'APIResponseError', 'IDExtractor',
+           'APIResponseError', 'CircuitOpenError', 'IDExtractor',
            "DiplomaExtractor", "WorkPerminExtractor",
            "AirtableExtractor", "CVExtractor"]
@@ -1,15 +1,19 @@
-import pandas as pd
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
 import logging
+import urllib.parse
 from .base_extractor import BaseExtractor
 
 logger = logging.getLogger(__name__)
 
+AIRTABLE_BASE_ID = "appZo3a2wKyMLh3UC"
+
 
 class AirtableExtractor(BaseExtractor):
     """Extractor specialized for Birth Certificate data"""
 
-    def __init__(self, files: Dict, headers: Dict, table_name: str, dynamic_url: str):
+    def __init__(self, files: Dict, headers: Dict, table_name: str, dynamic_url: str,
+                 modified_after: Optional[str] = None, record_ids: Optional[List[str]] = None):
         """
         Initialize the AirtableExtractor with specific configuration.
 
@@ -17,13 +21,24 @@ class AirtableExtractor(BaseExtractor):
             files (Dict): Dictionary containing file data to be processed
             headers (Dict): API authentication headers containing the bearer token
             table_name (str): Name of the Airtable table to query
+            dynamic_url (str): Comma separated conditions, any of which selects a record
+            modified_after (Optional[str], optional): ISO 8601 time; only records modified
+                after it are returned. Defaults to None, returning every matching record.
+            record_ids (Optional[List[str]], optional): Only return these records.
+                Defaults to None.
 
         Note:
             Sets up the API URL with a complex filter formula to retrieve records
             that have at least one document field populated.
         """
+        formula = f"OR({dynamic_url})"
+        if modified_after:
+            formula = f"AND({formula},IS_AFTER(LAST_MODIFIED_TIME(),DATETIME_PARSE('{modified_after}')))"
+        if record_ids:
+            ids = ",".join(f"RECORD_ID()='{record_id}'" for record_id in record_ids)
+            formula = f"AND({formula},OR({ids}))"
         super().__init__(
-            api_url=f"https://api.airtable.com/v0/appZo3a2wKyMLh3UC/{table_name}?filterByFormula=OR({dynamic_url})",
+            api_url=f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{table_name}?filterByFormula={formula}",
             files=files,
             headers={
                 "Authorization": f"Bearer {headers}",
@@ -31,8 +46,11 @@ class AirtableExtractor(BaseExtractor):
             },
             operation=2
         )
+        self.base_url = self.api_url
+        # Airtable's request limit applies per base
+        self.rate_limit_scope = f"airtable:{AIRTABLE_BASE_ID}"
 
-    def extract(self) -> Dict[str, Any]:
+    async def extract(self) -> Dict[str, Any]:
         """
         Extract AirTable data from API and convert to Excel format.
 
@@ -49,7 +67,7 @@ class AirtableExtractor(BaseExtractor):
         """
         try:
             # Make API request
-            data = self._make_api_request()
+            data = await self._make_api_request()
 
             return data
 
@@ -58,3 +76,60 @@ class AirtableExtractor(BaseExtractor):
             import traceback
             logger.error(traceback.format_exc())
             return {"error": f"Unexpected error: {str(e)}"}
+
+    async def _fetch_page(self, offset: Optional[str]) -> Dict[str, Any]:
+        """
+        Fetch one page of the table.
+
+        Args:
+            offset (Optional[str]): Offset returned with the previous page, None for the first page
+
+        Returns:
+            Dict[str, Any]: The page's "records" and, unless it is the last page, its "offset"
+        """
+        self.api_url = self.base_url
+        if offset:
+            self.api_url += f"&offset={urllib.parse.quote(offset)}"
+        return await self._make_api_request()
+
+    async def iter_pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Walk every record of the table, one page at a time.
+
+        Follows the offset Airtable returns until the last page. Page N+1 is
+        fetched in the background while the caller works on page N, and only
+        those two pages are held at once however large the table is.
+
+        Returns:
+            AsyncIterator[List[Dict[str, Any]]]: The records of each page
+
+        Raises:
+            ExtractorError: If a page cannot be fetched
+        """
+        pending = asyncio.create_task(self._fetch_page(None))
+        pages = 0
+        try:
+            while pending is not None:
+                data = await pending
+                pages += 1
+                offset = data.get("offset")
+                # Only one request is in flight at a time, so api_url is never shared
+                pending = asyncio.create_task(
+                    self._fetch_page(offset)) if offset else None
+                yield data.get("records", [])
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+            logger.info(f"Read {pages} Airtable page(s)")
+
+    async def iter_records(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Walk every record of the table, fetching pages lazily.
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: Airtable records
+        """
+        async for records in self.iter_pages():
+            for record in records:
+                yield record
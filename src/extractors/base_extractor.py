@@ -1,6 +1,22 @@
-import requests
+import asyncio
+import copy
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import os
+import time
+from typing import IO, Any, Callable, Dict, Iterator, Optional
+
+import aiohttp
+
+from ..utils.http_client import FileChunkPayload, HTTPResponse, UPLOAD_CHUNK_SIZE, file_size, get_transport, read_at
+from ..utils.ocr_cache import OCRCache, get_ocr_cache
+from ..utils.single_flight import get_single_flight
+from ..utils.resilience import get_breaker_registry, get_retry_policy, parse_retry_after
+from ..utils.hedging import get_hedger
+from ..utils.slimming import SlimmingProfile, get_slimming_stats, slim_document
+from ..utils.excel_pool import collect_chunks, get_excel_pool
+from ..utils.rate_limiter import get_rate_limiters
+from ..utils.output_formats import XLSX_MEDIA_TYPE
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +36,11 @@ class APIResponseError(ExtractorError):
     pass
 
 
+class CircuitOpenError(ExtractorError):
+    """Exception raised when the API circuit breaker is open and requests fail fast"""
+    pass
+
+
 class BaseExtractor:
     """
     Base class for all extractors
@@ -27,8 +48,19 @@ class BaseExtractor:
     1 is for POST request
     else is for GET request
 
+    Subclasses set hedge_requests to True to opt in to hedged API calls,
+    and slimming to a SlimmingProfile to shrink documents before upload.
+    rate_limit_scope names the shared rate limiter every request waits on.
+    output_format selects what extract() renders: "xlsx", "csv", or
+    "json"/"ndjson" for the structured data alone.
     """
 
+    hedge_requests = False
+    slimming: Optional[SlimmingProfile] = None
+    output_format = "xlsx"
+    rate_limit_scope: Optional[str] = None
+    _owned_upload: Optional[IO[bytes]] = None
+
     def __init__(self, api_url: str, files: Dict, headers: Dict, operation=1):
         """
         Initialize the BaseExtractor with API connection details.
@@ -56,43 +88,326 @@ class BaseExtractor:
             return self.files['file'][0]
         return "unknown_file"
 
-    def _make_api_request(self) -> Dict[str, Any]:
+    def _content_hash(self) -> str:
+        """
+        Compute the SHA-256 digest of the uploaded document.
+
+        Returns:
+            str: Hex digest of the file content
+        """
+        content = self.files['file'][1] if isinstance(
+            self.files['file'], tuple) else self.files['file']
+        if isinstance(content, (bytes, bytearray)):
+            return hashlib.sha256(content).hexdigest()
+
+        # Hash file objects chunk by chunk so they are never fully buffered
+        digest = hashlib.sha256()
+        offset = 0
+        while True:
+            chunk = read_at(content, offset, UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                return digest.hexdigest()
+            digest.update(chunk)
+            offset += len(chunk)
+
+    async def _fetch_api_data(self) -> Dict[str, Any]:
+        """
+        Return the API response for the document, served from the OCR cache when possible.
+
+        Responses are cached by document content and extractor class, so a
+        re-uploaded document skips _make_api_request entirely. Concurrent
+        misses for the same document and extractor share one in-flight API
+        call. Requests that do not upload a file go straight to the API.
+
+        Returns:
+            Dict[str, Any]: The JSON response from the API or the cache
+        """
+        if self.operation != 1:
+            return await self._make_api_request()
+
+        # Hashing a large upload would block the event loop
+        content_hash = await asyncio.to_thread(self._content_hash)
+        key = OCRCache.make_key(content_hash, type(self).__name__)
+        cache = get_ocr_cache()
+        if cache is not None:
+            data = await cache.get(key)
+            if data is not None:
+                logger.info(f"OCR cache hit for {type(self).__name__}")
+                return data
+
+        return await get_single_flight().do(key, lambda: self._detached()._request_and_cache(key))
+
+    def _detached(self) -> "BaseExtractor":
+        """
+        Copy the extractor with its own handle on the uploaded document.
+
+        A single-flight call outlives the request that started it, whose
+        upload is closed when that request ends or is cancelled. The copy
+        keeps the document readable for every caller coalesced onto the call:
+        file-backed uploads get a duplicated descriptor, in-memory ones a copy
+        of their bytes.
+
+        Returns:
+            BaseExtractor: Copy owning its upload, or self if the document is already bytes
+        """
+        value = self.files['file']
+        content = value[1] if isinstance(value, tuple) else value
+        if isinstance(content, (bytes, bytearray)):
+            return self
+
+        # SpooledTemporaryFile keeps the actual file in _file; asking the
+        # wrapper for its descriptor would roll an in-memory upload to disk
+        inner = getattr(content, "_file", content)
+        try:
+            inner.flush()
+            fd = inner.fileno()
+        except (AttributeError, OSError, ValueError):
+            owned = read_at(content, 0, file_size(content))
+        else:
+            owned = os.fdopen(os.dup(fd), "rb")
+
+        detached = copy.copy(self)
+        detached.files = {**self.files, 'file': (value[0], owned, *value[2:])
+                          if isinstance(value, tuple) else owned}
+        detached._owned_upload = None if isinstance(owned, bytes) else owned
+        return detached
+
+    async def _request_and_cache(self, key: str) -> Dict[str, Any]:
+        """
+        Call the API and store the response in the OCR cache.
+
+        Args:
+            key (str): OCR cache key of the document
+
+        Returns:
+            Dict[str, Any]: The JSON response from the API
+        """
+        try:
+            slimmed = await self._slim_upload()
+            started = time.monotonic()
+            data = await self._make_api_request()
+            get_slimming_stats().record_request(
+                type(self).__name__, slimmed, time.monotonic() - started)
+            cache = get_ocr_cache()
+            if cache is not None:
+                await cache.set(key, data)
+            return data
+        finally:
+            if self._owned_upload is not None:
+                self._owned_upload.close()
+
+    async def _slim_upload(self) -> bool:
+        """
+        Replace the uploaded document with a slimmed version if the extractor has a profile.
+
+        The OCR cache key is computed from the original document, so slimming
+        only happens on cache misses.
+
+        Returns:
+            bool: True if a smaller document will be sent
+        """
+        if self.slimming is None or not isinstance(self.files.get('file'), tuple):
+            return False
+        filename, content = self.files['file'][0], self.files['file'][1]
+        size = len(content) if isinstance(
+            content, (bytes, bytearray)) else file_size(content)
+
+        started = time.monotonic()
+        slimmed = await asyncio.to_thread(slim_document, filename, content, self.slimming)
+        elapsed = time.monotonic() - started
+        name = type(self).__name__
+        if slimmed is None:
+            get_slimming_stats().record_slimming(name, size, size, elapsed)
+            return False
+
+        get_slimming_stats().record_slimming(
+            name, size, len(slimmed[1]), elapsed)
+        logger.info(
+            f"Slimmed {filename} from {size} to {len(slimmed[1])} bytes in {elapsed:.2f}s")
+        self.files = {**self.files, 'file': slimmed}
+        return True
+
+    def _build_form_data(self) -> aiohttp.FormData:
+        """
+        Build the multipart body for a POST request from the files dictionary.
+
+        File objects are wrapped in a FileChunkPayload so they are streamed
+        to the API in chunks instead of being copied into the request body.
+
+        Returns:
+            aiohttp.FormData: Multipart form containing every entry of the files dictionary
+        """
+        form = aiohttp.FormData()
+        for field_name, value in self.files.items():
+            if isinstance(value, tuple):
+                filename, content = value[0], value[1]
+                content_type = value[2] if len(value) > 2 else None
+                if not isinstance(content, (bytes, bytearray)):
+                    content = FileChunkPayload(
+                        content, filename=filename, content_type=content_type)
+                    content_type = None
+                form.add_field(field_name, content,
+                               filename=filename, content_type=content_type)
+            else:
+                form.add_field(field_name, value)
+        return form
+
+    async def _send_request(self) -> HTTPResponse:
+        """
+        Send a single request to the API through the shared HTTPTransport.
+
+        Returns:
+            HTTPResponse: The API response, whatever its status code
+
+        Raises:
+            APITimeoutError: If the API request times out
+            ExtractorError: For connection-level failures
+        """
+        transport = get_transport()
+        limiters = get_rate_limiters()
+        if self.rate_limit_scope:
+            await limiters.acquire(self.rate_limit_scope)
+        try:
+            if self.operation == 1:
+                response = await transport.request(
+                    "POST",
+                    self.api_url,
+                    headers=self.headers,
+                    data=self._build_form_data(),
+                    timeout=self.timeout
+                )
+            else:
+                response = await transport.request(
+                    "GET",
+                    self.api_url,
+                    headers=self.headers,
+                    timeout=self.timeout
+                )
+            if self.rate_limit_scope:
+                limiters.observe(self.rate_limit_scope, response.status_code,
+                                 parse_retry_after(response.headers.get("Retry-After")))
+            return response
+        except asyncio.TimeoutError:
+            raise APITimeoutError(
+                f"API request timed out after {self.timeout} seconds")
+        except aiohttp.ClientError as e:
+            raise ExtractorError(f"API request failed: {str(e)}")
+
+    async def _make_api_request(self) -> Dict[str, Any]:
         """
         Make API request with error handling.
 
         Sends either a POST or GET request to the configured API endpoint
-        based on the operation type specified during initialization.
+        based on the operation type specified during initialization. The
+        request goes through the shared HTTPTransport so it never blocks
+        the event loop and reuses pooled keep-alive connections.
+
+        Extractors that opt in to hedging send a second identical request
+        when the first is slower than the endpoint's recent latency percentile.
+        Timeouts, connection failures, 429 and 5xx responses are retried
+        with jittered exponential backoff, honoring Retry-After. Every
+        attempt is reported to the endpoint's circuit breaker, which makes
+        requests fail fast while the API is down.
 
         Returns:
             Dict[str, Any]: The JSON response from the API
 
         Raises:
-            APITimeoutError: If the API request times out
+            CircuitOpenError: If the endpoint's circuit breaker is open
+            APITimeoutError: If the API request times out on the last attempt
             APIResponseError: If the API returns a non-200 status code or invalid JSON
             ExtractorError: For other request failures
         """
-        response: any
-        if self.operation == 1:
-            response = requests.post(
-                self.api_url,
-                files=self.files,
-                headers=self.headers,
-                timeout=self.timeout
-            )
-        else:
-            response = requests.get(
-                self.api_url,
-                headers=self.headers,
-                timeout=self.timeout
-            )
-        logger.info(f"API Response: {response.status_code}")
-        
-        if response.status_code != 200:
-            raise APIResponseError(
-                f"API returned status code {response.status_code}")
-            
-        return response.json()
+        policy = get_retry_policy()
+        breaker = get_breaker_registry().get(self.api_url.split("?")[0])
+        attempt = 0
+        while True:
+            if not breaker.allow_request():
+                raise CircuitOpenError(
+                    f"Circuit open for {breaker.name}, failing fast")
+
+            try:
+                if self.hedge_requests:
+                    response = await get_hedger().run(
+                        breaker.name, self._send_request,
+                        accept=lambda sent: not policy.is_retryable_status(sent.status_code))
+                else:
+                    response = await self._send_request()
+            except ExtractorError as e:
+                breaker.record_failure()
+                delay = policy.next_delay(attempt)
+                if delay is None:
+                    raise
+                logger.warning(
+                    f"API attempt {attempt + 1} failed ({str(e)}), retrying in {delay:.2f}s")
+            except BaseException:
+                # Cancelled, or failed locally before the API answered
+                breaker.release()
+                raise
+            else:
+                logger.info(f"API Response: {response.status_code}")
+                if not policy.is_retryable_status(response.status_code):
+                    # Anything but 429/5xx means the API itself is healthy
+                    breaker.record_success()
+                    if response.status_code != 200:
+                        raise APIResponseError(
+                            f"API returned status code {response.status_code}")
+                    return response.json()
+
+                breaker.record_failure()
+                delay = policy.next_delay(attempt, parse_retry_after(
+                    response.headers.get("Retry-After")))
+                if delay is None:
+                    raise APIResponseError(
+                        f"API returned status code {response.status_code}")
+                logger.warning(
+                    f"API returned {response.status_code}, retrying in {delay:.2f}s")
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _build_output(self, extracted_data: Dict[str, Any], output_name: str,
+                            excel_fn: Callable[[Dict[str, Any]], Dict[str, Any]],
+                            csv_fn: Callable[[Dict[str, Any]], Iterator[bytes]]) -> Dict[str, Any]:
+        """
+        Render extracted data in the requested output format.
+
+        Workbooks and CSV files are generated in the process pool, so the
+        serving process only awaits them; the CSV chunks are then streamed
+        one by one. Nothing is generated when only the structured data was
+        requested.
+
+        Args:
+            extracted_data (Dict[str, Any]): Structured data of the document
+            output_name (str): Download filename without extension
+            excel_fn (Callable): Generator producing {"excel_data": bytes} from extracted_data
+            csv_fn (Callable): Picklable function returning the CSV chunks of extracted_data
+
+        Returns:
+            Dict[str, Any]: The structured data under "data" plus the generated
+            file and its filename, or error information
+        """
+        if self.output_format == "xlsx":
+            excel_result = await get_excel_pool().run(excel_fn, extracted_data)
+            if excel_result.get("error"):
+                return {"error": excel_result["error"]}
+            return {
+                "excel_data": excel_result["excel_data"],
+                "filename": f"{output_name}.xlsx",
+                "content_type": XLSX_MEDIA_TYPE,
+                "data": extracted_data
+            }
+
+        if self.output_format == "csv":
+            chunks = await get_excel_pool().run(collect_chunks, csv_fn, extracted_data)
+            return {
+                "csv_stream": iter(chunks),
+                "filename": f"{output_name}.csv",
+                "content_type": "text/csv",
+                "data": extracted_data
+            }
 
+        return {"data": extracted_data, "filename": f"{output_name}.{self.output_format}"}
 
     def _sanitize_filename(self, filename: str) -> str:
         """
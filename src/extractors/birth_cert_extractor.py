@@ -1,8 +1,9 @@
-import pandas as pd
 from typing import Dict, Any
 import logging
 from .base_extractor import BaseExtractor
 from ..utils.excel_generator import ExcelGenerator
+from ..utils.csv_generator import CSVGenerator
+from ..utils.slimming import SlimmingProfile
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +11,9 @@ logger = logging.getLogger(__name__)
 class BirthCertExtractor(BaseExtractor):
     """Extractor specialized for Birth Certificate data"""
 
+    # Only the first page is needed, at modest resolution
+    slimming = SlimmingProfile(max_pixels=2_000_000, target_dpi=200, pages=(0,))
+
     def __init__(self, files: Dict, headers: Dict):
         """
         Initialize the BirthCertExtractor with files and headers.
@@ -24,17 +28,18 @@ class BirthCertExtractor(BaseExtractor):
             headers=headers
         )
 
-    def extract(self) -> Dict[str, Any]:
+    async def extract(self) -> Dict[str, Any]:
         """
-        Extract Birth Certificate data from API and convert to Excel format.
+        Extract Birth Certificate data from API and convert it to the requested output format.
 
         Returns:
-            Dict[str, Any]: Dictionary containing Excel data, filename, and content type,
-            or error information if extraction fails
+            Dict[str, Any]: Dictionary containing the extracted data and, for xlsx/csv
+            output, the generated file, filename, and content type, or error information
+            if extraction fails
         """
         try:
             # Make API request
-            data = self._make_api_request()
+            data = await self._fetch_api_data()
 
             # Process filename
             original_filename = self._get_original_filename()
@@ -45,19 +50,11 @@ class BirthCertExtractor(BaseExtractor):
             # Extract data from API response
             extracted_data = self._extract_birth_cert_data(data)
 
-            # Generate Excel file
+            # Generate the requested output format
             excel_generator = ExcelGenerator()
-            excel_result = excel_generator.generate_birth_cert_excel(
-                extracted_data)
-
-            if excel_result.get("error"):
-                return {"error": excel_result["error"]}
-
-            return {
-                "excel_data": excel_result["excel_data"],
-                "filename": f"{filename}_birth_cert_data.xlsx",
-                "content_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            }
+            return await self._build_output(
+                extracted_data, f"{filename}_birth_cert_data",
+                excel_generator.generate_birth_cert_excel, CSVGenerator().iter_birth_cert_csv)
 
         except Exception as e:
             logger.error(f"Error in extract: {str(e)}")
@@ -1,8 +1,8 @@
-import pandas as pd
 from typing import Dict, Any, List, Optional
 import logging
 from .base_extractor import BaseExtractor
 from ..utils.excel_generator import ExcelGenerator
+from ..utils.csv_generator import CSVGenerator
 
 logger = logging.getLogger(__name__)
 
@@ -24,17 +24,18 @@ class DiplomaExtractor(BaseExtractor):
             headers=headers
         )
 
-    def extract(self) -> Dict[str, Any]:
+    async def extract(self) -> Dict[str, Any]:
         """
-        Extract Diploma data from API and convert to Excel format.
+        Extract Diploma data from API and convert it to the requested output format.
 
         Returns:
-            Dict[str, Any]: Dictionary containing Excel data, filename, and content type,
-            or error information if extraction fails
+            Dict[str, Any]: Dictionary containing the extracted data and, for xlsx/csv
+            output, the generated file, filename, and content type, or error information
+            if extraction fails
         """
         try:
             # Make API request
-            data = self._make_api_request()
+            data = await self._fetch_api_data()
 
             # Process filename
             original_filename = self._get_original_filename()
@@ -45,19 +46,11 @@ class DiplomaExtractor(BaseExtractor):
             # Extract data from API response
             extracted_data = self._extract_diploma_data(data)
 
-            # Generate Excel file
+            # Generate the requested output format
             excel_generator = ExcelGenerator()
-            excel_result = excel_generator.generate_diploma_excel(
-                extracted_data)
-
-            if excel_result.get("error"):
-                return {"error": excel_result["error"]}
-
-            return {
-                "excel_data": excel_result["excel_data"],
-                "filename": f"{filename}_diploma.xlsx",
-                "content_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            }
+            return await self._build_output(
+                extracted_data, f"{filename}_diploma",
+                excel_generator.generate_diploma_excel, CSVGenerator().iter_diploma_csv)
 
         except Exception as e:
             logger.error(f"Error in extract: {str(e)}")
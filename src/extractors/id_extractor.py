@@ -1,8 +1,9 @@
-import pandas as pd
 from typing import Dict, Any, List, Optional
 import logging
 from .base_extractor import BaseExtractor
 from ..utils.excel_generator import ExcelGenerator
+from ..utils.csv_generator import CSVGenerator
+from ..utils.slimming import SlimmingProfile
 from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
@@ -11,6 +12,9 @@ logger = logging.getLogger(__name__)
 class IDExtractor(BaseExtractor):
     """Extractor specialized for ID data"""
 
+    # Only the first page is needed, at modest resolution
+    slimming = SlimmingProfile(max_pixels=2_000_000, target_dpi=200, pages=(0,))
+
     def __init__(self, files: Dict, headers: Dict):
         """
         Initialize the IDExtractor with files and headers.
@@ -25,17 +29,18 @@ class IDExtractor(BaseExtractor):
             headers=headers
         )
 
-    def extract(self) -> Dict[str, Any]:
+    async def extract(self) -> Dict[str, Any]:
         """
-        Extract ID data from API and convert to Excel format.
+        Extract ID data from API and convert it to the requested output format.
 
         Returns:
-            Dict[str, Any]: Dictionary containing Excel data, filename, and content type,
-            or error information if extraction fails
+            Dict[str, Any]: Dictionary containing the extracted data and, for xlsx/csv
+            output, the generated file, filename, and content type, or error information
+            if extraction fails
         """
         try:
             # Make API request
-            data = self._make_api_request()
+            data = await self._fetch_api_data()
 
             # Process filename
             original_filename = self._get_original_filename()
@@ -46,19 +51,11 @@ class IDExtractor(BaseExtractor):
             # Extract data from API response
             extracted_data = self._extract_id_data(data)
 
-            # Generate Excel file
+            # Generate the requested output format
             excel_generator = ExcelGenerator()
-            excel_result = excel_generator.generate_id_excel(
-                extracted_data)
-
-            if excel_result.get("error"):
-                return {"error": excel_result["error"]}
-
-            return {
-                "excel_data": excel_result["excel_data"],
-                "filename": f"{filename}_id.xlsx",
-                "content_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            }
+            return await self._build_output(
+                extracted_data, f"{filename}_id",
+                excel_generator.generate_id_excel, CSVGenerator().iter_id_csv)
 
         except Exception as e:
             logger.error(f"Error in extract: {str(e)}")
@@ -1,8 +1,10 @@
 from .extractor_mapper import CONSTANT_COLUMN, CONSTANT_COLUMN_EXTRACTED, DOCUMENT_REQUIREMENTS, EXTRACTOR_MAP, extract_url
+from .work_planner import WORK_INDEX, WorkItem, WorkPlanner, build_work_index
 
 __all__ = [
     'CONSTANT_COLUMN',
     'CONSTANT_COLUMN_EXTRACTED',
     'DOCUMENT_REQUIREMENTS',
-    'EXTRACTOR_MAP', 'extract_url'
+    'EXTRACTOR_MAP', 'extract_url',
+    'WORK_INDEX', 'WorkItem', 'WorkPlanner', 'build_work_index'
 ]
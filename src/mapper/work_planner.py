@@ -0,0 +1,115 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .extractor_mapper import (CONSTANT_COLUMN, CONSTANT_COLUMN_EXTRACTED, DOCUMENT_REQUIREMENTS,
+                               EXTRACTOR_MAP)
+
+"""
+This module compiles the mapping constants into a direct lookup index and
+plans the extraction work of an Airtable record from it.
+
+The index maps each confirmation column to the attachment column it
+guards, the column receiving the extracted file link, and the extractors
+reading that document type, so planning a record costs one dict lookup
+per field.
+"""
+
+# Confirmation value marking an attachment that still needs extracting
+FIELD_ARGS = 'No Attachment'
+
+
+class ColumnRoute(NamedTuple):
+    """Where the attachments guarded by one confirmation column go"""
+    upload_column: str
+    target_column: Optional[str]
+    extractors: Tuple[Tuple[str, Any], ...]
+
+
+class WorkItem(NamedTuple):
+    """One attachment of one record to extract with one extractor"""
+    record_id: str
+    candidate: Optional[str]
+    upload_column: str
+    attachment: Dict[str, Any]
+    doc_method: str
+    extractor_class: Any
+    target_column: Optional[str]
+
+
+def build_work_index(constant_column: Dict[str, str], constant_column_extracted: Dict[str, str],
+                     document_requirements: Dict[str, List[str]],
+                     extractor_map: Dict[str, Any]) -> Dict[str, ColumnRoute]:
+    """
+    Compile the mapping constants into a lookup index keyed by confirmation column.
+
+    Args:
+        constant_column (Dict[str, str]): Confirmation column to attachment column
+        constant_column_extracted (Dict[str, str]): Attachment column to extracted link column
+        document_requirements (Dict[str, List[str]]): Extraction method to the attachment
+            columns it reads
+        extractor_map (Dict[str, Any]): Extraction method to extractor class
+
+    Returns:
+        Dict[str, ColumnRoute]: Route of every confirmation column with at least one extractor
+    """
+    extractors_by_column: Dict[str, List[Tuple[str, Any]]] = {}
+    for doc_method, doc_types in document_requirements.items():
+        extractor_class = extractor_map.get(doc_method)
+        if extractor_class:
+            for doc_type in doc_types:
+                extractors_by_column.setdefault(doc_type, []).append(
+                    (doc_method, extractor_class))
+
+    return {
+        confirmation_column: ColumnRoute(
+            upload_column, constant_column_extracted.get(upload_column),
+            tuple(extractors_by_column[upload_column]))
+        for confirmation_column, upload_column in constant_column.items()
+        if upload_column in extractors_by_column
+    }
+
+
+class WorkPlanner:
+    """Turns Airtable records into the extraction work they need"""
+
+    def __init__(self, index: Optional[Dict[str, ColumnRoute]] = None):
+        """
+        Initialize the WorkPlanner.
+
+        Args:
+            index (Optional[Dict[str, ColumnRoute]], optional): Index from build_work_index.
+                Defaults to WORK_INDEX, compiled from this module's constants.
+        """
+        self.index = WORK_INDEX if index is None else index
+
+    def plan(self, record: Dict[str, Any]) -> List[WorkItem]:
+        """
+        List the attachments of a record that still need extracting.
+
+        An attachment needs extracting when its confirmation column reads
+        "No Attachment" and the attachment column holds files; each file
+        yields one item per extractor of its document type.
+
+        Args:
+            record (Dict[str, Any]): Airtable record with "id" and "fields"
+
+        Returns:
+            List[WorkItem]: Work items, in the record's field order
+        """
+        fields = record.get("fields", {})
+        items = []
+        for field_name, value in fields.items():
+            if value != FIELD_ARGS:
+                continue
+            route = self.index.get(field_name)
+            if route is None or route.upload_column not in fields:
+                continue
+            for attachment in fields[route.upload_column] or []:
+                for doc_method, extractor_class in route.extractors:
+                    items.append(WorkItem(
+                        record.get("id"), fields.get("Name"), route.upload_column, attachment,
+                        doc_method, extractor_class, route.target_column))
+        return items
+
+
+WORK_INDEX = build_work_index(
+    CONSTANT_COLUMN, CONSTANT_COLUMN_EXTRACTED, DOCUMENT_REQUIREMENTS, EXTRACTOR_MAP)
@@ -1,7 +1,44 @@
+from .http_client import HTTPTransport, get_transport, configure_transport
+from .ocr_cache import OCRCache, get_ocr_cache, configure_ocr_cache
+from .single_flight import SingleFlight, get_single_flight
+from .resilience import RetryPolicy, CircuitBreaker, configure_resilience, get_retry_policy, get_breaker_registry
+from .preflight import Preflight, get_preflight, configure_preflight
+from .slimming import SlimmingProfile, get_slimming_stats
+from .output_formats import negotiate_format
 from .excel_generator import ExcelGenerator
 from .extraction_process import ExtractionProcess
+from .work_ledger import WorkLedger, get_work_ledger, configure_work_ledger
+from .rate_limiter import TokenBucket, get_rate_limiters, configure_rate_limits
+from .airtable_batcher import AirtableUpdateBatcher, get_update_stats
 from .update_airtable import UpdateAirtable
-from .process_airtable import ProcessAirtable
+from .process_airtable import ProcessAirtable, get_sweep_stats
+from .poll_scheduler import PollScheduler
+from .batch_extraction import BatchExtraction
+from .hedging import Hedger, get_hedger, configure_hedging
+from .job_queue import JobQueue, JobWorkerPool
+from .excel_pool import ExcelPool, get_excel_pool, configure_excel_pool
+from .result_store import ResultStore, get_result_store, configure_result_store
+from .candidate_export import CandidateExport
+from .airtable_sync import AirtableSync, get_airtable_sync, configure_airtable_sync
+from .airtable_webhooks import (WebhookIngestor, AirtablePayloadSource, ReplayPayloadSource,
+                                verify_notification)
 
 __all__ = ['ExcelGenerator', 'ExtractionProcess',
-           'UpdateAirtable', 'ProcessAirtable']
+           'UpdateAirtable', 'ProcessAirtable',
+           'HTTPTransport', 'get_transport', 'configure_transport',
+           'OCRCache', 'get_ocr_cache', 'configure_ocr_cache',
+           'SingleFlight', 'get_single_flight',
+           'BatchExtraction', 'RetryPolicy', 'CircuitBreaker', 'configure_resilience',
+           'get_retry_policy', 'get_breaker_registry',
+           'Hedger', 'get_hedger', 'configure_hedging',
+           'JobQueue', 'JobWorkerPool',
+           'ExcelPool', 'get_excel_pool', 'configure_excel_pool',
+           'Preflight', 'get_preflight', 'configure_preflight',
+           'SlimmingProfile', 'get_slimming_stats', 'negotiate_format',
+           'ResultStore', 'get_result_store', 'configure_result_store', 'CandidateExport',
+           'AirtableUpdateBatcher', 'get_update_stats',
+           'TokenBucket', 'get_rate_limiters', 'configure_rate_limits', 'get_sweep_stats',
+           'AirtableSync', 'get_airtable_sync', 'configure_airtable_sync',
+           'WorkLedger', 'get_work_ledger', 'configure_work_ledger',
+           'WebhookIngestor', 'AirtablePayloadSource', 'ReplayPayloadSource', 'verify_notification',
+           'PollScheduler']
@@ -0,0 +1,257 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .http_client import get_transport
+from .rate_limiter import get_rate_limiters
+from .resilience import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Most records Airtable accepts in one update request
+AIRTABLE_MAX_BATCH = 10
+
+
+class AirtableUpdateBatcher:
+    """
+    Queues Airtable field updates and sends them as multi-record PATCH calls.
+
+    Updates to the same record are merged into one entry, so several column
+    changes cost a single record slot. A batch is sent as soon as it is full
+    or flush_interval seconds after the first update was queued. Records
+    missing from Airtable's response, or belonging to a failed request, are
+    requeued until they run out of attempts; a rejected batch is retried one
+    record per request so one bad record does not block the others, and a
+    record Airtable still rejects on its own is reported as failed at once.
+    """
+
+    def __init__(self, url: str, headers: Dict[str, str], batch_size: int = AIRTABLE_MAX_BATCH,
+                 flush_interval: float = 1.0, max_attempts: int = 3,
+                 rate_limit_scope: Optional[str] = None):
+        """
+        Initialize the AirtableUpdateBatcher.
+
+        Args:
+            url (str): Table endpoint, e.g. https://api.airtable.com/v0/{base}/{table}
+            headers (Dict[str, str]): Authorization and content type headers
+            batch_size (int, optional): Records per request, at most 10. Defaults to 10.
+            flush_interval (float, optional): Seconds an update may wait for its batch to fill.
+                Defaults to 1.0.
+            max_attempts (int, optional): Attempts before an update is reported as failed.
+                Defaults to 3.
+            rate_limit_scope (Optional[str], optional): Rate limiter every request waits on,
+                e.g. "airtable:<base id>". Defaults to None.
+        """
+        self.url = url
+        self.headers = headers
+        self.batch_size = min(batch_size, AIRTABLE_MAX_BATCH)
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.rate_limit_scope = rate_limit_scope
+        # record id -> {"fields": dict, "attempts": int, "alone": bool}
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._failed: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    async def add(self, record_id: str, fields: Dict[str, Any]) -> None:
+        """
+        Queue field changes for a record, merging them with changes already queued.
+
+        Args:
+            record_id (str): Airtable record id
+            fields (Dict[str, Any]): Column name to new value
+        """
+        entry = self._pending.get(record_id)
+        if entry is None:
+            self._pending[record_id] = {
+                "fields": dict(fields), "attempts": 0, "alone": False}
+        else:
+            entry["fields"].update(fields)
+            _stats["merged"] += 1
+        _stats["queued"] += 1
+
+        if len(self._pending) >= self.batch_size:
+            await self.flush(full_only=True)
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        """
+        Flush whatever is queued once flush_interval has passed, then again
+        while requeued updates remain.
+        """
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Scheduled Airtable flush failed: {str(e)}")
+            if not self._pending:
+                break
+
+    def _take_batch(self, full_only: bool) -> List[tuple]:
+        """
+        Remove the next batch from the queue.
+
+        Args:
+            full_only (bool): Only take a batch if it is full
+
+        Returns:
+            List[tuple]: (record id, entry) pairs; empty when nothing should be sent
+        """
+        if not self._pending or (full_only and len(self._pending) < self.batch_size):
+            return []
+        record_id, entry = next(iter(self._pending.items()))
+        if entry["alone"]:
+            return [(record_id, self._pending.pop(record_id))]
+        batch = []
+        for record_id in list(self._pending):
+            if len(batch) == self.batch_size:
+                break
+            if not self._pending[record_id]["alone"]:
+                batch.append((record_id, self._pending.pop(record_id)))
+        return batch
+
+    async def flush(self, full_only: bool = False) -> None:
+        """
+        Send queued updates.
+
+        Records that fail are requeued for the next flush, not retried here.
+
+        Args:
+            full_only (bool, optional): Only send full batches. Defaults to False.
+        """
+        async with self._lock:
+            retry = []
+            while True:
+                batch = self._take_batch(full_only)
+                if not batch:
+                    break
+                retry.extend(await self._send(batch))
+            for record_id, entry in retry:
+                self._requeue(record_id, entry)
+
+    async def _send(self, batch: List[tuple]) -> List[tuple]:
+        """
+        PATCH one batch of records.
+
+        Args:
+            batch (List[tuple]): (record id, entry) pairs
+
+        Returns:
+            List[tuple]: The pairs that were not updated
+        """
+        payload = {"records": [{"id": record_id, "fields": entry["fields"]}
+                               for record_id, entry in batch]}
+        _stats["requests"] += 1
+        limiters = get_rate_limiters()
+        try:
+            if self.rate_limit_scope:
+                await limiters.acquire(self.rate_limit_scope)
+            response = await get_transport().request(
+                "PATCH", self.url, headers=self.headers, json=payload)
+            if self.rate_limit_scope:
+                limiters.observe(self.rate_limit_scope, response.status_code,
+                                 parse_retry_after(response.headers.get("Retry-After")))
+        except Exception as e:
+            logger.warning(
+                f"Airtable batch update of {len(batch)} record(s) failed: {str(e)}")
+            return self._mark_failed(batch, str(e), alone=False)
+
+        if response.status_code != 200:
+            error = f"Airtable returned status code {response.status_code}"
+            logger.warning(
+                f"Airtable batch update of {len(batch)} record(s) failed: {error}")
+            # 4xx other than 429 is caused by one of the records; isolate them
+            alone = response.status_code != 429 and response.status_code < 500
+            # A record rejected on its own would only be rejected again
+            final = alone and len(batch) == 1
+            return self._mark_failed(batch, error, alone=alone, final=final)
+
+        try:
+            updated = {record.get("id") for record in response.json().get("records", [])}
+        except ValueError:
+            updated = set()
+        missing = [(record_id, entry)
+                   for record_id, entry in batch if record_id not in updated]
+        _stats["records_updated"] += len(batch) - len(missing)
+        return self._mark_failed(missing, "Record missing from Airtable response", alone=True)
+
+    @staticmethod
+    def _mark_failed(batch: List[tuple], error: str, alone: bool, final: bool = False) -> List[tuple]:
+        """
+        Record the failure of a set of updates.
+
+        Args:
+            batch (List[tuple]): (record id, entry) pairs that failed
+            error (str): Failure description
+            alone (bool): Whether the records should be retried one per request
+            final (bool, optional): Whether retrying cannot help. Defaults to False.
+
+        Returns:
+            List[tuple]: The same pairs, with their attempt counted
+        """
+        for _, entry in batch:
+            entry["attempts"] += 1
+            entry["error"] = error
+            entry["alone"] = entry["alone"] or (alone and len(batch) > 1)
+            entry["final"] = final
+        return batch
+
+    def _requeue(self, record_id: str, entry: Dict[str, Any]) -> None:
+        """
+        Put a failed update back in the queue, or give up on it after max_attempts
+        or when retrying cannot help.
+
+        Args:
+            record_id (str): Airtable record id
+            entry (Dict[str, Any]): The failed update
+        """
+        if entry["attempts"] >= self.max_attempts or entry.get("final"):
+            _stats["failed"] += 1
+            logger.error(
+                f"Giving up on Airtable update of {record_id}: {entry['error']}")
+            self._failed.append(
+                {"id": record_id, "fields": entry["fields"], "error": entry["error"]})
+            return
+        _stats["requeued"] += 1
+        queued = self._pending.pop(record_id, None)
+        if queued is not None:
+            # Changes queued since the failed attempt win over the failed ones
+            entry["fields"].update(queued["fields"])
+        self._pending[record_id] = entry
+
+    async def close(self) -> List[Dict[str, Any]]:
+        """
+        Send every queued update, retrying failures until they run out of attempts.
+
+        Returns:
+            List[Dict[str, Any]]: Updates that could not be applied, with their error
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            await asyncio.gather(self._timer, return_exceptions=True)
+            self._timer = None
+        await self.flush()
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+        failed, self._failed = self._failed, []
+        return failed
+
+
+_stats: Dict[str, int] = {"queued": 0, "merged": 0, "requests": 0,
+                          "records_updated": 0, "requeued": 0, "failed": 0}
+
+
+def get_update_stats() -> Dict[str, int]:
+    """
+    Return Airtable update counters across every batcher.
+
+    Returns:
+        Dict[str, int]: Updates queued and merged, PATCH requests sent, records
+            updated, requeued and given up on
+    """
+    return dict(_stats)
@@ -0,0 +1,222 @@
+import logging
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SyncPass(NamedTuple):
+    """One poll of an Airtable table, as planned by AirtableSync.begin"""
+    name: str
+    full: bool
+    modified_after: Optional[str]
+    started: float
+
+
+def format_airtable_time(timestamp: float) -> str:
+    """
+    Format a Unix timestamp the way Airtable formulas parse it.
+
+    Args:
+        timestamp (float): Seconds since the epoch
+
+    Returns:
+        str: UTC ISO 8601 time, e.g. "2024-05-01T08:30:00.000Z"
+    """
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+class AirtableSync:
+    """
+    Persisted modification watermark for incremental Airtable polling.
+
+    Each completed poll records the time it started. The next poll then only
+    asks Airtable for records whose LAST_MODIFIED_TIME() is after that
+    watermark, minus an overlap covering clock skew between this host and
+    Airtable. Every full_sync_interval seconds, and whenever no watermark is
+    stored yet, a full reconciliation poll reads every matching record
+    instead, picking up anything an incremental poll missed (e.g. a document
+    that failed and was not modified since).
+    """
+
+    def __init__(self, db_path: str, full_sync_interval: float = 3600, overlap: float = 60):
+        """
+        Initialize the AirtableSync.
+
+        Args:
+            db_path (str): Path of the SQLite database holding the watermarks
+            full_sync_interval (float, optional): Seconds between full reconciliation polls.
+                Defaults to 3600.
+            overlap (float, optional): Seconds subtracted from the watermark so records
+                modified around the previous poll are read again. Defaults to 60.
+        """
+        self.db_path = db_path
+        self.full_sync_interval = full_sync_interval
+        self.overlap = overlap
+        self._counters = {"incremental": 0, "full": 0, "completed": 0}
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the watermark database.
+
+        Returns:
+            sqlite3.Connection: A new connection in autocommit mode
+        """
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def _init_db(self) -> None:
+        """
+        Create the watermark table if it does not exist yet.
+        """
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                "name TEXT PRIMARY KEY, watermark REAL, full_sync_at REAL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS webhook_cursors ("
+                "name TEXT PRIMARY KEY, cursor INTEGER NOT NULL)")
+
+    def _load(self, name: str) -> tuple:
+        """
+        Read the stored watermark of a table.
+
+        Args:
+            name (str): Table name
+
+        Returns:
+            tuple: (watermark, full_sync_at), both None if the table was never polled
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT watermark, full_sync_at FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return row or (None, None)
+
+    def begin(self, name: str, force_full: bool = False, now: Optional[float] = None) -> SyncPass:
+        """
+        Plan the next poll of a table.
+
+        Args:
+            name (str): Table name
+            force_full (bool, optional): Read every record whatever the watermark. Defaults to False.
+            now (Optional[float], optional): Current Unix time. Defaults to time.time().
+
+        Returns:
+            SyncPass: Whether the poll is a full one and, if not, the time records
+                must have been modified after
+        """
+        now = time.time() if now is None else now
+        watermark, full_sync_at = self._load(name)
+        full = (force_full or watermark is None or full_sync_at is None
+                or now - full_sync_at >= self.full_sync_interval)
+        self._counters["full" if full else "incremental"] += 1
+        modified_after = None if full else format_airtable_time(
+            watermark - self.overlap)
+        return SyncPass(name, full, modified_after, now)
+
+    def complete(self, sync_pass: SyncPass) -> None:
+        """
+        Move the watermark to the start of a poll whose records were all read.
+
+        The watermark never moves backwards, so an older poll finishing late
+        does not widen the next incremental window.
+
+        Args:
+            sync_pass (SyncPass): The finished poll
+        """
+        full_sync_at = sync_pass.started if sync_pass.full else None
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sync_state (name, watermark, full_sync_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET "
+                "watermark = MAX(watermark, excluded.watermark), "
+                "full_sync_at = MAX(COALESCE(full_sync_at, 0), COALESCE(excluded.full_sync_at, 0))",
+                (sync_pass.name, sync_pass.started, full_sync_at))
+        self._counters["completed"] += 1
+        logger.info(
+            f"Airtable {'full' if sync_pass.full else 'incremental'} sync of {sync_pass.name} "
+            f"completed; watermark {format_airtable_time(sync_pass.started)}")
+
+    def cursor(self, name: str) -> Optional[int]:
+        """
+        Return the stored payload cursor of a webhook.
+
+        Args:
+            name (str): Webhook name
+
+        Returns:
+            Optional[int]: Cursor of the next payload to read, None if never stored
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT cursor FROM webhook_cursors WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def save_cursor(self, name: str, cursor: int) -> None:
+        """
+        Store the payload cursor of a webhook once its payloads were processed.
+
+        Args:
+            name (str): Webhook name
+            cursor (int): Cursor of the next payload to read
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO webhook_cursors (name, cursor) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET cursor = MAX(cursor, excluded.cursor)",
+                (name, cursor))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the stored watermarks and poll counters.
+
+        Returns:
+            Dict[str, Any]: Polls planned per mode, polls completed, and the watermark
+                and last full sync of every table
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT name, watermark, full_sync_at FROM sync_state").fetchall()
+        return {
+            **self._counters,
+            "tables": {name: {"watermark": format_airtable_time(watermark),
+                              "last_full_sync": format_airtable_time(full_sync_at) if full_sync_at else None}
+                       for name, watermark, full_sync_at in rows},
+        }
+
+
+_sync: Optional[AirtableSync] = None
+
+
+def get_airtable_sync() -> Optional[AirtableSync]:
+    """
+    Return the process-wide AirtableSync.
+
+    Returns:
+        Optional[AirtableSync]: The shared watermark store, or None if every poll is a full one
+    """
+    return _sync
+
+
+def configure_airtable_sync(db_path: str, full_sync_interval: float = 3600,
+                            overlap: float = 60) -> AirtableSync:
+    """
+    Replace the process-wide AirtableSync.
+
+    Args:
+        db_path (str): Path of the SQLite database holding the watermarks
+        full_sync_interval (float, optional): Seconds between full reconciliation polls.
+            Defaults to 3600.
+        overlap (float, optional): Seconds of overlap between consecutive incremental
+            polls. Defaults to 60.
+
+    Returns:
+        AirtableSync: The new shared watermark store
+    """
+    global _sync
+    _sync = AirtableSync(db_path, full_sync_interval, overlap)
+    return _sync
@@ -0,0 +1,281 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from .http_client import get_transport
+from .rate_limiter import get_rate_limiters
+from .resilience import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Most payloads Airtable returns per list-payloads call
+PAYLOAD_PAGE_SIZE = 50
+
+
+def verify_notification(body: bytes, mac_header: Optional[str], mac_secret: str) -> bool:
+    """
+    Check the X-Airtable-Content-MAC header of a webhook notification.
+
+    Args:
+        body (bytes): Raw request body
+        mac_header (Optional[str]): Header value, "hmac-sha256=<hex digest>"
+        mac_secret (str): Base64 macSecretBase64 returned when the webhook was created
+
+    Returns:
+        bool: Whether the body was signed with the webhook's secret
+    """
+    if not mac_header:
+        return False
+    digest = hmac.new(base64.b64decode(mac_secret),
+                      body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(mac_header, f"hmac-sha256={digest}")
+
+
+def changed_record_ids(payload: Dict[str, Any], table_ids: Optional[Iterable[str]] = None) -> Set[str]:
+    """
+    List the records a webhook payload created or changed.
+
+    Args:
+        payload (Dict[str, Any]): One entry of the list-payloads response
+        table_ids (Optional[Iterable[str]], optional): Only look at these tables.
+            Defaults to every table of the payload.
+
+    Returns:
+        Set[str]: Airtable record ids; deleted records are left out
+    """
+    tables = payload.get("changedTablesById", {})
+    if table_ids is not None:
+        tables = {table_id: tables[table_id]
+                  for table_id in table_ids if table_id in tables}
+    record_ids = set()
+    for table in tables.values():
+        record_ids.update(table.get("createdRecordsById", {}))
+        record_ids.update(table.get("changedRecordsById", {}))
+    return record_ids
+
+
+class AirtablePayloadSource:
+    """Reads the change payloads of an Airtable webhook"""
+
+    def __init__(self, base_id: str, webhook_id: str, api_key: str):
+        """
+        Initialize the AirtablePayloadSource.
+
+        Args:
+            base_id (str): Airtable base id
+            webhook_id (str): Id of the webhook registered on the base
+            api_key (str): Airtable token with webhook:manage scope
+        """
+        self.url = f"https://api.airtable.com/v0/bases/{base_id}/webhooks/{webhook_id}/payloads"
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+        # Airtable's request limit applies per base
+        self.rate_limit_scope = f"airtable:{base_id}"
+
+    async def fetch(self, cursor: int) -> Dict[str, Any]:
+        """
+        Fetch the payloads from a cursor on.
+
+        Args:
+            cursor (int): Cursor of the first payload to return
+
+        Returns:
+            Dict[str, Any]: "payloads", the "cursor" to continue from and "mightHaveMore"
+
+        Raises:
+            ValueError: If Airtable does not answer 200
+        """
+        limiters = get_rate_limiters()
+        await limiters.acquire(self.rate_limit_scope)
+        response = await get_transport().request(
+            "GET", f"{self.url}?cursor={cursor}&limit={PAYLOAD_PAGE_SIZE}", headers=self.headers)
+        limiters.observe(self.rate_limit_scope, response.status_code,
+                         parse_retry_after(response.headers.get("Retry-After")))
+        if response.status_code != 200:
+            raise ValueError(
+                f"Listing webhook payloads returned status code {response.status_code}")
+        return response.json()
+
+
+class ReplayPayloadSource:
+    """
+    Offline stand-in for AirtablePayloadSource.
+
+    Serves payloads recorded from the list-payloads endpoint with the same
+    cursor semantics, so webhook ingestion can be exercised without a
+    webhook registered on a live base.
+    """
+
+    def __init__(self, path: str, page_size: int = PAYLOAD_PAGE_SIZE):
+        """
+        Initialize the ReplayPayloadSource.
+
+        Args:
+            path (str): JSON file holding {"payloads": [...]} as returned by Airtable
+            page_size (int, optional): Payloads returned per fetch. Defaults to 50.
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            self.payloads = json.load(file)["payloads"]
+        self.page_size = page_size
+
+    async def fetch(self, cursor: int) -> Dict[str, Any]:
+        """
+        Return the recorded payloads from a cursor on.
+
+        Args:
+            cursor (int): Cursor of the first payload to return, starting at 1
+
+        Returns:
+            Dict[str, Any]: "payloads", the "cursor" to continue from and "mightHaveMore"
+        """
+        page = self.payloads[cursor - 1:cursor - 1 + self.page_size]
+        next_cursor = cursor + len(page)
+        return {"payloads": page, "cursor": next_cursor,
+                "mightHaveMore": next_cursor <= len(self.payloads)}
+
+
+class WebhookIngestor:
+    """
+    Turns Airtable webhook notifications into sweeps of the touched records.
+
+    Notifications only say that something changed. Each one starts a pull
+    of the webhook's payloads from the stored cursor, and the records they
+    created or changed are handed to process_records. Repeated notifications
+    are ignored. Notifications arriving during a pull are coalesced into one
+    more pull. The cursor only moves once the records were processed, so a
+    failed sweep is retried by the next notification.
+    """
+
+    def __init__(self, source: Any, process_records: Callable[[List[str]], Awaitable[Any]],
+                 sync: Any = None, name: str = "webhook", table_ids: Optional[Iterable[str]] = None,
+                 debounce: float = 0.5, seen_size: int = 1024):
+        """
+        Initialize the WebhookIngestor.
+
+        Args:
+            source: AirtablePayloadSource or ReplayPayloadSource
+            process_records (Callable[[List[str]], Awaitable[Any]]): Sweeps the given record ids
+            sync (AirtableSync, optional): Store persisting the cursor across restarts.
+                Defaults to None, keeping it in memory.
+            name (str, optional): Name the cursor is stored under. Defaults to "webhook".
+            table_ids (Optional[Iterable[str]], optional): Tables whose changes are processed.
+                Defaults to every table.
+            debounce (float, optional): Seconds to wait for more notifications before pulling.
+                Defaults to 0.5.
+            seen_size (int, optional): Notifications remembered for deduplication. Defaults to 1024.
+        """
+        self.source = source
+        self.process_records = process_records
+        self.sync = sync
+        self.name = name
+        self.table_ids = list(table_ids) if table_ids is not None else None
+        self.debounce = debounce
+        self.seen_size = seen_size
+        self._cursor = 1
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self._again = False
+        self._counters = {"notifications": 0, "duplicates": 0, "pulls": 0,
+                          "payloads": 0, "records": 0, "failed_pulls": 0}
+
+    def notify(self, notification: Dict[str, Any]) -> bool:
+        """
+        Accept a notification and schedule a pull of the payloads.
+
+        Args:
+            notification (Dict[str, Any]): Notification body, with "webhook" and "timestamp"
+
+        Returns:
+            bool: False if the notification was already received
+        """
+        self._counters["notifications"] += 1
+        key = f"{notification.get('webhook', {}).get('id')}:{notification.get('timestamp')}"
+        if key in self._seen:
+            self._counters["duplicates"] += 1
+            return False
+        self._seen[key] = None
+        if len(self._seen) > self.seen_size:
+            self._seen.popitem(last=False)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+        else:
+            self._again = True
+        return True
+
+    async def _drain(self) -> None:
+        """
+        Pull and process payloads until no notification arrived during the last pull.
+        """
+        while True:
+            await asyncio.sleep(self.debounce)
+            # Notifications from here on need another pull
+            self._again = False
+            try:
+                await self.pull()
+            except Exception as e:
+                self._counters["failed_pulls"] += 1
+                logger.error(f"Webhook payload pull failed: {str(e)}")
+            if not self._again:
+                break
+
+    def _load_cursor(self) -> int:
+        if self.sync is not None:
+            return self.sync.cursor(self.name) or self._cursor
+        return self._cursor
+
+    def _save_cursor(self, cursor: int) -> None:
+        self._cursor = cursor
+        if self.sync is not None:
+            self.sync.save_cursor(self.name, cursor)
+
+    async def pull(self) -> List[str]:
+        """
+        Read every new payload and process the records it touched.
+
+        Returns:
+            List[str]: Record ids handed to process_records
+        """
+        self._counters["pulls"] += 1
+        cursor = await asyncio.to_thread(self._load_cursor)
+        record_ids: Set[str] = set()
+        while True:
+            response = await self.source.fetch(cursor)
+            for payload in response.get("payloads", []):
+                self._counters["payloads"] += 1
+                record_ids |= changed_record_ids(payload, self.table_ids)
+            cursor = response.get("cursor", cursor)
+            if not response.get("mightHaveMore"):
+                break
+
+        records = sorted(record_ids)
+        if records:
+            logger.info(
+                f"Webhook payloads touched {len(records)} record(s); sweeping them")
+            self._counters["records"] += len(records)
+            await self.process_records(records)
+        await asyncio.to_thread(self._save_cursor, cursor)
+        return records
+
+    async def close(self) -> None:
+        """
+        Stop the pull in progress, if any.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the ingestion counters.
+
+        Returns:
+            Dict[str, Any]: Notifications received and ignored as duplicates, pulls run and
+                failed, payloads read, records swept and the current cursor
+        """
+        return {**self._counters, "cursor": self._cursor}
@@ -0,0 +1,180 @@
+import asyncio
+import io
+import json
+import logging
+import zipfile
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+from .extraction_process import ExtractionProcess
+
+logger = logging.getLogger(__name__)
+
+
+class ZipStreamBuffer(io.RawIOBase):
+    """
+    Write-only, non-seekable sink for zipfile.
+
+    zipfile writes each entry here and the streaming response drains the
+    written bytes after every entry, so the archive is never held in memory
+    as a whole.
+    """
+
+    def __init__(self):
+        """
+        Initialize the ZipStreamBuffer with no pending bytes.
+        """
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """
+        Return and clear everything written since the last drain.
+
+        Returns:
+            bytes: The pending archive bytes
+        """
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class BatchExtraction:
+    """
+    Run several document extractions concurrently and stream the results as a ZIP.
+    """
+
+    def __init__(self, extractor_map: Dict[str, Any], items: List[Tuple[str, UploadFile]],
+                 headers: Dict, concurrency: int = 4):
+        """
+        Initialize the BatchExtraction.
+
+        Args:
+            extractor_map (Dict[str, Any]): Mapping of document types to extractor classes
+            items (List[Tuple[str, UploadFile]]): Document type and uploaded file for each document
+            headers (Dict): Headers required for the extraction requests
+            concurrency (int, optional): Maximum number of extractions running at once. Defaults to 4.
+        """
+        self.extractor_map = extractor_map
+        self.items = [(doc_type, self._detach_upload(file))
+                      for doc_type, file in items]
+        self.headers = headers
+        self.concurrency = max(1, concurrency)
+
+    @staticmethod
+    def _detach_upload(upload: UploadFile) -> UploadFile:
+        """
+        Take ownership of an upload's spooled file.
+
+        FastAPI closes form files as soon as the handler returns, which is
+        before a streaming response starts running. The spooled file is
+        moved to a new UploadFile that this batch closes itself.
+
+        Args:
+            upload (UploadFile): The upload received by the endpoint
+
+        Returns:
+            UploadFile: An UploadFile owning the original spooled file
+        """
+        detached = UploadFile(file=upload.file, filename=upload.filename,
+                              size=upload.size, headers=upload.headers)
+        upload.file = io.BytesIO()
+        return detached
+
+    async def _extract_one(self, index: int, doc_type: str, file: UploadFile) -> Dict[str, Any]:
+        """
+        Extract a single document of the batch and capture its outcome.
+
+        Args:
+            index (int): Position of the document in the batch
+            doc_type (str): Key of EXTRACTOR_MAP selecting the extractor
+            file (UploadFile): The uploaded document
+
+        Returns:
+            Dict[str, Any]: Manifest entry, plus the workbook bytes under "data" on success
+        """
+        entry = {"index": index, "filename": file.filename,
+                 "doc_type": doc_type}
+        try:
+            extractor = ExtractionProcess(
+                self.extractor_map[doc_type], file, self.headers)
+            response = await extractor.proccess_extraction()
+            if response.status_code != 200:
+                detail = json.loads(response.body).get("detail")
+                return {**entry, "status": "error", "status_code": response.status_code, "detail": detail}
+
+            stem = (file.filename or "document").rsplit(".", 1)[0]
+            output = f"{index + 1:03d}_{stem}_{doc_type}.xlsx"
+            return {**entry, "status": "success", "status_code": 200, "output": output, "data": response.body}
+        except HTTPException as e:
+            return {**entry, "status": "error", "status_code": e.status_code, "detail": e.detail}
+        except Exception as e:
+            logger.error(f"Error in batch item {index}: {str(e)}")
+            return {**entry, "status": "error", "status_code": 500, "detail": str(e)}
+        finally:
+            await file.close()
+
+    async def _worker(self, pending: asyncio.Queue, results: asyncio.Queue) -> None:
+        """
+        Extract queued documents one at a time until the queue is empty.
+
+        Args:
+            pending (asyncio.Queue): Queue of (index, doc_type, file) still to extract
+            results (asyncio.Queue): Bounded queue receiving manifest entries
+        """
+        while True:
+            try:
+                index, doc_type, file = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await results.put(await self._extract_one(index, doc_type, file))
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        Extract every document and yield the ZIP archive incrementally.
+
+        Each workbook is written to the archive as soon as its extraction
+        finishes, followed by a manifest.json with the status of every file.
+        The results queue is bounded by the concurrency limit, so memory use
+        depends on the concurrency and not on the batch size.
+
+        Yields:
+            bytes: Consecutive chunks of the ZIP archive
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        for index, (doc_type, file) in enumerate(self.items):
+            pending.put_nowait((index, doc_type, file))
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        workers = [asyncio.create_task(self._worker(pending, results))
+                   for _ in range(min(self.concurrency, len(self.items)))]
+
+        buffer = ZipStreamBuffer()
+        manifest = []
+        try:
+            with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for _ in range(len(self.items)):
+                    entry = await results.get()
+                    data = entry.pop("data", None)
+                    if data is not None:
+                        archive.writestr(entry["output"], data)
+                        yield buffer.drain()
+                    manifest.append(entry)
+
+                manifest.sort(key=lambda item: item["index"])
+                archive.writestr("manifest.json", json.dumps(
+                    {"files": manifest}, indent=2))
+            yield buffer.drain()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            while not pending.empty():
+                _, _, file = pending.get_nowait()
+                await file.close()
@@ -0,0 +1,135 @@
+import asyncio
+import csv
+import logging
+from io import StringIO
+from typing import Any, AsyncIterator, Dict, List
+
+from .result_store import ResultStore
+from .workbook_writer import WorkbookWriter, SheetWriter
+
+logger = logging.getLogger(__name__)
+
+# Columns identifying the candidate at the start of every export row
+ID_COLUMNS = ["Record ID", "Candidate"]
+
+# Longest sheet name Excel accepts
+MAX_SHEET_NAME = 31
+
+
+class CandidateExport:
+    """
+    Consolidated export of every candidate's extraction results.
+
+    Walks the Airtable table page by page and joins each page with the
+    stored extraction results, writing one sheet (or CSV file) per document
+    column with one row per candidate. Only one page of records and results
+    is held in memory at a time.
+    """
+
+    def __init__(self, pages: AsyncIterator[List[Dict[str, Any]]], store: ResultStore,
+                 documents: List[str]):
+        """
+        Initialize the CandidateExport.
+
+        Args:
+            pages (AsyncIterator[List[Dict[str, Any]]]): Pages of Airtable records,
+                e.g. AirtableExtractor.iter_pages()
+            store (ResultStore): Store holding the extraction results
+            documents (List[str]): Airtable attachment columns exported, one sheet each
+        """
+        self.pages = pages
+        self.store = store
+        self.documents = documents
+        self.rows = {document: 0 for document in documents}
+        self.candidates = 0
+
+    async def _joined_pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield, for each page of records, the export rows of every document.
+
+        Returns:
+            AsyncIterator[List[Dict[str, Any]]]: One list per page of
+                {"document", "row"} entries, in record order
+        """
+        async for records in self.pages:
+            self.candidates += len(records)
+            results = await asyncio.to_thread(
+                self.store.fetch, [record.get("id") for record in records])
+            entries = []
+            for record in records:
+                candidate = record.get("fields", {}).get("Name")
+                for document in self.documents:
+                    result = results.get((record.get("id"), document))
+                    if result is None:
+                        continue
+                    self.rows[document] += 1
+                    entries.append({"document": document, "row": {
+                        "Record ID": record.get("id"), "Candidate": candidate, **result}})
+            yield entries
+
+    async def write_xlsx(self, path: str) -> None:
+        """
+        Write the export as a workbook with one sheet per document.
+
+        Args:
+            path (str): File the workbook is written to
+        """
+        columns = {document: ID_COLUMNS + await asyncio.to_thread(self.store.columns, document)
+                   for document in self.documents}
+
+        def open_sheets() -> WorkbookWriter:
+            writer = WorkbookWriter(path)
+            sheets.update({document: writer.open_sheet(document[:MAX_SHEET_NAME], columns[document])
+                           for document in self.documents})
+            return writer
+
+        def write_page(entries: List[Dict[str, Any]]) -> None:
+            for entry in entries:
+                sheets[entry["document"]].write_row(entry["row"])
+
+        def close() -> None:
+            for sheet in sheets.values():
+                sheet.finish()
+            writer.close()
+
+        sheets: Dict[str, SheetWriter] = {}
+        writer = await asyncio.to_thread(open_sheets)
+        try:
+            async for entries in self._joined_pages():
+                await asyncio.to_thread(write_page, entries)
+        finally:
+            await asyncio.to_thread(close)
+        logger.info(
+            f"Exported {self.candidates} candidates to {path}: {self.rows}")
+
+    async def iter_csv(self) -> AsyncIterator[bytes]:
+        """
+        Stream the export as CSV, one chunk per page.
+
+        A CSV file has a single sheet, so the export must cover exactly one document.
+
+        Returns:
+            AsyncIterator[bytes]: UTF-8 encoded CSV chunks
+
+        Raises:
+            ValueError: If the export covers more than one document
+        """
+        if len(self.documents) != 1:
+            raise ValueError("A CSV export covers exactly one document")
+        document = self.documents[0]
+        columns = ID_COLUMNS + await asyncio.to_thread(self.store.columns, document)
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        async for entries in self._joined_pages():
+            for entry in entries:
+                writer.writerow([entry["row"].get(column, "")
+                                for column in columns])
+            if buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+        logger.info(
+            f"Exported {self.rows[document]} {document} rows of {self.candidates} candidates as CSV")
@@ -1,14 +1,112 @@
 import csv
 from io import StringIO
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List
 import logging
 import json
 
 logger = logging.getLogger(__name__)
 
+# Characters buffered before a chunk is handed to the response
+CSV_CHUNK_SIZE = 64 * 1024
+
+# A section is the rows written under one "--- TITLE ---" header
+Section = Iterable[List[Any]]
+
+
+def iter_csv_chunks(sections: Iterable[Section], chunk_size: int = CSV_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Serialize CSV sections lazily into text chunks.
+
+    A chunk is emitted whenever the buffer reaches chunk_size and at the end
+    of every section, so the first section reaches the client before the
+    later ones are serialized and memory does not grow with the row count.
+
+    Args:
+        sections (Iterable[Section]): Sections of rows, consumed one at a time
+        chunk_size (int, optional): Characters buffered per chunk. Defaults to CSV_CHUNK_SIZE.
+
+    Returns:
+        Iterator[str]: CSV text chunks
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    for section in sections:
+        for row in section:
+            writer.writerow(row)
+            if buffer.tell() >= chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
+def _encode(chunks: Iterator[str], name: str) -> Iterator[bytes]:
+    """
+    Encode CSV text chunks as UTF-8, logging a failure before it aborts the stream.
+
+    Args:
+        chunks (Iterator[str]): CSV text chunks
+        name (str): Document type, for the log message
+
+    Returns:
+        Iterator[bytes]: Encoded chunks
+    """
+    try:
+        for chunk in chunks:
+            yield chunk.encode("utf-8")
+    except Exception as e:
+        logger.error(f"Error streaming {name} CSV: {str(e)}")
+        raise
+
+
+def _key_value_section(title: str, values: Dict[str, Any]) -> Section:
+    """Rows of a section listing one key/value pair per row"""
+    yield [title]
+    for key, value in (values or {}).items():
+        yield [key, value]
+
+
+def _records_section(title: str, records: List[Dict[str, Any]]) -> Section:
+    """Rows of a section with a header row covering every record's keys"""
+    yield [title]
+    if records:
+        headers = list(dict.fromkeys(key for record in records for key in record))
+        yield headers
+        for record in records:
+            yield [record.get(key, "") for key in headers]
+
+
+def _list_section(title: str, values: List[Any]) -> Section:
+    """Rows of a section listing one value per row"""
+    yield [title]
+    for value in values or []:
+        yield [value]
+
+
+def _cv_sections(cv_data: Dict[str, Any]) -> Iterator[Section]:
+    """Sections of a CV CSV, separated by empty rows"""
+    yield _key_value_section("--- PERSONAL INFORMATION ---", cv_data.get("personal_info"))
+    yield [[]]
+    yield [["--- INTRODUCTION ---"], [cv_data.get("introduction", "")], []]
+    yield _records_section("--- WORK EXPERIENCE ---", cv_data.get("work_experience"))
+    yield [[]]
+    yield _list_section("--- TECHNICAL SKILLS ---", cv_data.get("technical_skills"))
+    yield [[]]
+    yield _list_section("--- EDUCATION ---", cv_data.get("education"))
+    yield [[]]
+    yield _list_section("--- AWARDS ---", cv_data.get("awards"))
+
 
 class CSVGenerator:
-    """Utility class to generate CSV files from structured data"""
+    """
+    Utility class to generate CSV files from structured data.
+
+    The generate_*_csv methods return the whole file as a string; the
+    iter_*_csv methods yield it as UTF-8 chunks for a StreamingResponse.
+    """
 
     def generate_cv_csv(self, cv_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -23,56 +121,7 @@ class CSVGenerator:
             Dict[str, Any]: Dictionary with CSV data as string or error information
         """
         try:
-            # Create CSV file in memory using StringIO
-            csv_buffer = StringIO()
-            writer = csv.writer(csv_buffer)
-
-            # Write Personal Information
-            writer.writerow(["--- PERSONAL INFORMATION ---"])
-            if "personal_info" in cv_data and cv_data["personal_info"]:
-                for key, value in cv_data["personal_info"].items():
-                    writer.writerow([key, value])
-            writer.writerow([])  # Empty row as separator
-
-            # Write Introduction
-            writer.writerow(["--- INTRODUCTION ---"])
-            writer.writerow([cv_data.get("introduction", "")])
-            writer.writerow([])
-
-            # Write Work Experience
-            writer.writerow(["--- WORK EXPERIENCE ---"])
-            if "work_experience" in cv_data and cv_data["work_experience"]:
-                # Write headers
-                if cv_data["work_experience"]:
-                    headers = cv_data["work_experience"][0].keys()
-                    writer.writerow(headers)
-                    # Write data rows
-                    for job in cv_data["work_experience"]:
-                        writer.writerow(job.values())
-            writer.writerow([])
-
-            # Write Technical Skills
-            writer.writerow(["--- TECHNICAL SKILLS ---"])
-            if "technical_skills" in cv_data and cv_data["technical_skills"]:
-                for skill in cv_data["technical_skills"]:
-                    writer.writerow([skill])
-            writer.writerow([])
-
-            # Write Education
-            writer.writerow(["--- EDUCATION ---"])
-            if "education" in cv_data and cv_data["education"]:
-                for edu in cv_data["education"]:
-                    writer.writerow([edu])
-            writer.writerow([])
-
-            # Write Awards
-            writer.writerow(["--- AWARDS ---"])
-            if "awards" in cv_data and cv_data["awards"]:
-                for award in cv_data["awards"]:
-                    writer.writerow([award])
-
-            # Get the CSV data as string
-            csv_data = csv_buffer.getvalue()
+            csv_data = "".join(iter_csv_chunks(_cv_sections(cv_data)))
 
             logger.info(f"CSV data size: {len(csv_data)} bytes")
 
@@ -99,16 +148,8 @@ class CSVGenerator:
             Dict[str, Any]: Dictionary with CSV data as string or error information
         """
         try:
-            csv_buffer = StringIO()
-            writer = csv.writer(csv_buffer)
-
-            # Write Personal Information
-            writer.writerow(["--- PERSONAL INFORMATION ---"])
-            if "personal_info" in data and data["personal_info"]:
-                for key, value in data["personal_info"].items():
-                    writer.writerow([key, value])
-
-            csv_data = csv_buffer.getvalue()
+            csv_data = "".join(iter_csv_chunks([_key_value_section(
+                "--- PERSONAL INFORMATION ---", data.get("personal_info"))]))
             logger.info("CSV data generated for birth certificate")
 
             return {"csv_data": csv_data}
@@ -131,18 +172,8 @@ class CSVGenerator:
             Dict[str, Any]: Dictionary with CSV data as string or error information
         """
         try:
-            csv_buffer = StringIO()
-            writer = csv.writer(csv_buffer)
-
-            # Write ID Information
-            writer.writerow(["--- ID INFORMATION ---"])
-            if "id_info" in data and data["id_info"]:
-                # Write headers
-                writer.writerow(data["id_info"].keys())
-                # Write values
-                writer.writerow(data["id_info"].values())
-
-            csv_data = csv_buffer.getvalue()
+            csv_data = "".join(iter_csv_chunks([_records_section(
+                "--- ID INFORMATION ---", data.get("id_info"))]))
             logger.info("CSV data generated for ID document")
 
             return {"csv_data": csv_data}
@@ -167,16 +198,8 @@ class CSVGenerator:
         try:
             logger.info(
                 f"Generating diploma CSV with data: {json.dumps(data, default=str)}")
-            csv_buffer = StringIO()
-            writer = csv.writer(csv_buffer)
-
-            # Write Diploma Information
-            writer.writerow(["--- DIPLOMA INFORMATION ---"])
-            if "diploma_info" in data and data["diploma_info"]:
-                for key, value in data["diploma_info"].items():
-                    writer.writerow([key, value])
-
-            csv_data = csv_buffer.getvalue()
+            csv_data = "".join(iter_csv_chunks([_key_value_section(
+                "--- DIPLOMA INFORMATION ---", data.get("diploma_info"))]))
             logger.info("CSV data generated for diploma")
 
             return {"csv_data": csv_data}
@@ -201,16 +224,8 @@ class CSVGenerator:
         try:
             logger.info(
                 f"Generating working permit CSV with data: {json.dumps(data, default=str)}")
-            csv_buffer = StringIO()
-            writer = csv.writer(csv_buffer)
-
-            # Write Working Permit Information
-            writer.writerow(["--- WORKING PERMIT INFORMATION ---"])
-            if "working_permit_info" in data and data["working_permit_info"]:
-                for key, value in data["working_permit_info"].items():
-                    writer.writerow([key, value])
-
-            csv_data = csv_buffer.getvalue()
+            csv_data = "".join(iter_csv_chunks([_key_value_section(
+                "--- WORKING PERMIT INFORMATION ---", data.get("working_permit_info"))]))
             logger.info("CSV data generated for working permit")
 
             return {"csv_data": csv_data}
@@ -218,3 +233,68 @@ class CSVGenerator:
         except Exception as e:
             logger.error(f"Error generating working permit CSV: {str(e)}")
             return {"error": f"Failed to generate CSV: {str(e)}"}
+
+    def iter_cv_csv(self, cv_data: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Stream the CSV file of CV data, section by section.
+
+        Args:
+            cv_data (Dict[str, Any]): Dictionary containing structured CV data
+
+        Returns:
+            Iterator[bytes]: UTF-8 encoded CSV chunks
+        """
+        return _encode(iter_csv_chunks(_cv_sections(cv_data)), "CV")
+
+    def iter_birth_cert_csv(self, data: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Stream the CSV file of birth certificate data.
+
+        Args:
+            data (Dict[str, Any]): Dictionary containing structured birth certificate data
+
+        Returns:
+            Iterator[bytes]: UTF-8 encoded CSV chunks
+        """
+        return _encode(iter_csv_chunks([_key_value_section(
+            "--- PERSONAL INFORMATION ---", data.get("personal_info"))]), "birth certificate")
+
+    def iter_id_csv(self, data: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Stream the CSV file of ID document data.
+
+        Args:
+            data (Dict[str, Any]): Dictionary containing structured ID document data
+
+        Returns:
+            Iterator[bytes]: UTF-8 encoded CSV chunks
+        """
+        # id_info holds one record per ID found in the document
+        return _encode(iter_csv_chunks([_records_section(
+            "--- ID INFORMATION ---", data.get("id_info"))]), "ID document")
+
+    def iter_diploma_csv(self, data: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Stream the CSV file of diploma data.
+
+        Args:
+            data (Dict[str, Any]): Dictionary containing structured diploma data
+
+        Returns:
+            Iterator[bytes]: UTF-8 encoded CSV chunks
+        """
+        return _encode(iter_csv_chunks([_key_value_section(
+            "--- DIPLOMA INFORMATION ---", data.get("diploma_info"))]), "diploma")
+
+    def iter_working_permit_csv(self, data: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Stream the CSV file of working permit data.
+
+        Args:
+            data (Dict[str, Any]): Dictionary containing structured working permit data
+
+        Returns:
+            Iterator[bytes]: UTF-8 encoded CSV chunks
+        """
+        return _encode(iter_csv_chunks([_key_value_section(
+            "--- WORKING PERMIT INFORMATION ---", data.get("working_permit_info"))]), "working permit")
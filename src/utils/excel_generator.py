@@ -1,13 +1,36 @@
-import pandas as pd
 from io import BytesIO
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import logging
+from .workbook_writer import BLANK_CELL_TEXT, WorkbookWriter, format_sheet, standard_formats
 
 logger = logging.getLogger(__name__)
 
+# Sheet name, column headers and one dict per row
+Sheet = Tuple[str, List[str], List[Dict[str, Any]]]
+
+STREAMING_ENGINE = "streaming"
+PANDAS_ENGINE = "pandas"
+
 
 class ExcelGenerator:
-    """Utility class to generate Excel files from structured data"""
+    """
+    Utility class to generate Excel files from structured data
+
+    The default "streaming" engine writes rows straight to xlsxwriter in
+    constant_memory mode. The "pandas" engine builds DataFrames first and
+    is kept for comparison.
+    """
+
+    def __init__(self, engine: str = STREAMING_ENGINE):
+        """
+        Initialize the ExcelGenerator.
+
+        Args:
+            engine (str, optional): "streaming" or "pandas". Defaults to "streaming".
+        """
+        if engine not in (STREAMING_ENGINE, PANDAS_ENGINE):
+            raise ValueError(f"Unknown Excel engine: {engine}")
+        self.engine = engine
 
     def generate_cv_excel(self, cv_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -28,53 +51,20 @@ class ExcelGenerator:
             Dict[str, Any]: Dictionary with Excel data as bytes or error information
         """
         try:
-            # Create Excel file in memory using BytesIO
-            excel_buffer = BytesIO()
-
-            with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
-                # Personal Information Sheet
-                personal_info_df = pd.DataFrame(
-                    cv_data["personal_info"], index=[0])
-                personal_info_df.to_excel(
-                    writer, sheet_name='Personal Info', index=False)
-
-                # Introduction Sheet
-                intro_df = pd.DataFrame(
-                    {"Introduction": [cv_data["introduction"]]})
-                intro_df.to_excel(
-                    writer, sheet_name='Introduction', index=False)
-
-                # Work Experience Sheet
-                work_exp_df = pd.DataFrame(cv_data["work_experience"]) if cv_data["work_experience"] else pd.DataFrame(
-                    columns=["Company", "Position", "StartDate", "EndDate"])
-                work_exp_df.to_excel(
-                    writer, sheet_name='Work Experience', index=False)
-
-                # Technical Skills Sheet
-                tech_skills_df = pd.DataFrame(
-                    {"Skills": cv_data["technical_skills"]}) if cv_data["technical_skills"] else pd.DataFrame({"Skills": []})
-                tech_skills_df.to_excel(
-                    writer, sheet_name='Technical Skills', index=False)
-
-                # Education Sheet
-                education_df = pd.DataFrame(
-                    {"Education": cv_data["education"]}) if cv_data["education"] else pd.DataFrame({"Education": []})
-                education_df.to_excel(
-                    writer, sheet_name='Education', index=False)
-
-                # Awards Sheet
-                awards_df = pd.DataFrame(
-                    {"Awards": cv_data["awards"]}) if cv_data["awards"] else pd.DataFrame({"Awards": []})
-                awards_df.to_excel(writer, sheet_name='Awards', index=False)
-
-                # Format worksheets for better readability
-                self._format_worksheets(writer, awards_df)
-
-                logger.info("Excel data written to buffer using xlsxwriter")
-
-            # Get the Excel data as bytes
-            excel_buffer.seek(0)
-            excel_data = excel_buffer.getvalue()
+            sheets = [
+                self._records_sheet(
+                    'Personal Info', [cv_data["personal_info"]]),
+                self._values_sheet(
+                    'Introduction', "Introduction", [cv_data["introduction"]]),
+                self._records_sheet('Work Experience', cv_data["work_experience"], [
+                                    "Company", "Position", "StartDate", "EndDate"]),
+                self._values_sheet(
+                    'Technical Skills', "Skills", cv_data["technical_skills"]),
+                self._values_sheet(
+                    'Education', "Education", cv_data["education"]),
+                self._values_sheet('Awards', "Awards", cv_data["awards"]),
+            ]
+            excel_data = self._write_workbook(sheets)
 
             logger.info(f"Excel data size: {len(excel_data)} bytes")
 
@@ -102,20 +92,8 @@ class ExcelGenerator:
             Dict[str, Any]: Dictionary with Excel data as bytes or error information
         """
         try:
-            excel_buffer = BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
-
-                # Candiate Info Sheet
-                candidate_name_info_df = pd.DataFrame([data["personal_info"]])
-                candidate_name_info_df.to_excel(
-                    writer, sheet_name="Personal Info", index=False)
-
-                # Format worksheets for better readability
-                self._format_worksheets(writer, candidate_name_info_df)
-
-                logger.info("Excel data written to buffer using xlsxwriter")
-
-            excel_data = excel_buffer.getvalue()
+            excel_data = self._write_workbook([self._records_sheet(
+                "Personal Info", [data["personal_info"]])])
             return {"excel_data": excel_data}
 
         except Exception as e:
@@ -136,20 +114,8 @@ class ExcelGenerator:
             Dict[str, Any]: Dictionary with Excel data as bytes or error information
         """
         try:
-            excel_buffer = BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
-
-                # ID Info Sheet
-                _info_df = pd.DataFrame(data["id_info"]) if data["id_info"] else pd.DataFrame(
-                    columns=["ID Type", "ID Number", "Candidate Name", "Candidate LastName", "Candidate Middlename", "Date of birth", "Candidate Address"])
-                _info_df.to_excel(
-                    writer, sheet_name="Personal Info", index=False)
-                # Format worksheets for better readability
-                self._format_worksheets(writer, _info_df)
-
-                logger.info("Excel data written to buffer using xlsxwriter")
-
-            excel_data = excel_buffer.getvalue()
+            excel_data = self._write_workbook([self._records_sheet("Personal Info", data["id_info"], [
+                "ID Type", "ID Number", "Candidate Name", "Candidate LastName", "Candidate Middlename", "Date of birth", "Candidate Address"])])
             return {"excel_data": excel_data}
 
         except Exception as e:
@@ -171,21 +137,9 @@ class ExcelGenerator:
         """
         logger.warning(data)
         try:
-            excel_buffer = BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
-
-                # ID Info Sheet
-                _info_df = pd.DataFrame([data["diploma_info"]]) if data["diploma_info"] else pd.DataFrame(
-                    columns=["ID Type", "Candidate Name", "School Name", "Date Graduated", "Candidate Address"])
-                _info_df.to_excel(
-                    writer, sheet_name="Personal Info", index=False)
-
-                # Format worksheets for better readability
-                self._format_worksheets(writer, _info_df)
-
-                logger.info("Excel data written to buffer using xlsxwriter")
-
-            excel_data = excel_buffer.getvalue()
+            excel_data = self._write_workbook([self._records_sheet(
+                "Personal Info", [data["diploma_info"]] if data["diploma_info"] else [],
+                ["ID Type", "Candidate Name", "School Name", "Date Graduated", "Candidate Address"])])
             return {"excel_data": excel_data}
 
         except Exception as e:
@@ -207,60 +161,116 @@ class ExcelGenerator:
         """
         logger.warning(data)
         try:
-            excel_buffer = BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
-
-                # ID Info Sheet
-                _info_df = pd.DataFrame([data["working_permit_info"]]) if data["working_permit_info"] else pd.DataFrame(
-                    columns=["Candidate Name", "Validity"])
-                _info_df.to_excel(
-                    writer, sheet_name="Personal Info", index=False)
-                # Format worksheets for better readability
-                self._format_worksheets(writer, _info_df)
-
-                logger.info("Excel data written to buffer using xlsxwriter")
-
-            excel_data = excel_buffer.getvalue()
+            excel_data = self._write_workbook([self._records_sheet(
+                "Personal Info", [data["working_permit_info"]] if data["working_permit_info"] else [],
+                ["Candidate Name", "Validity"])])
             return {"excel_data": excel_data}
 
         except Exception as e:
             logger.error(f"Error generating birth certificate Excel: {str(e)}")
             return {"error": f"Failed to generate Excel: {str(e)}"}
 
-    def _format_worksheets(self, writer, df) -> None:
+    @staticmethod
+    def _records_sheet(name: str, records: List[Dict[str, Any]],
+                       default_columns: Optional[List[str]] = None) -> Sheet:
+        """
+        Describe a sheet with one row per record.
+
+        Args:
+            name (str): Sheet name
+            records (List[Dict[str, Any]]): Rows keyed by column header
+            default_columns (Optional[List[str]], optional): Headers used when there
+                are no records. Defaults to None.
+
+        Returns:
+            Sheet: Sheet name, headers in order of first appearance, and rows
+        """
+        if not records:
+            return name, list(default_columns or []), []
+        columns = list(dict.fromkeys(
+            key for record in records for key in record))
+        return name, columns, records
+
+    @staticmethod
+    def _values_sheet(name: str, column: str, values: List[Any]) -> Sheet:
+        """
+        Describe a single-column sheet with one row per value.
+
+        Args:
+            name (str): Sheet name
+            column (str): Column header
+            values (List[Any]): Cell values
+
+        Returns:
+            Sheet: Sheet name, headers and rows
+        """
+        return name, [column], [{column: value} for value in values or []]
+
+    def _write_workbook(self, sheets: List[Sheet]) -> bytes:
+        """
+        Render sheets to an xlsx workbook with the configured engine.
+
+        Args:
+            sheets (List[Sheet]): Sheets to write, in order
+
+        Returns:
+            bytes: The xlsx file
+        """
+        if self.engine == PANDAS_ENGINE:
+            return self._write_workbook_pandas(sheets)
+
+        writer = WorkbookWriter()
+        for name, columns, rows in sheets:
+            writer.add_sheet(name, columns, rows)
+        logger.info("Excel data written to buffer using xlsxwriter")
+        return writer.close()
+
+    def _write_workbook_pandas(self, sheets: List[Sheet]) -> bytes:
+        """
+        Render sheets through pandas DataFrames, as the generator originally did.
+
+        Args:
+            sheets (List[Sheet]): Sheets to write, in order
+
+        Returns:
+            bytes: The xlsx file
+        """
+        import pandas as pd
+
+        excel_buffer = BytesIO()
+        with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
+            frames = {}
+            for name, columns, rows in sheets:
+                df = pd.DataFrame(rows, columns=columns)
+                # Mark blanks and flatten newlines for the whole sheet at once
+                df = df.mask(df.isna() | df.eq(''), BLANK_CELL_TEXT)
+                df = df.replace('\n', ' ', regex=True)
+                df.to_excel(writer, sheet_name=name, index=False)
+                frames[name] = df
+
+            # Format worksheets for better readability
+            self._format_worksheets(writer, frames)
+
+            logger.info("Excel data written to buffer using pandas")
+        return excel_buffer.getvalue()
+
+    def _format_worksheets(self, writer, frames) -> None:
         """
         Format Excel worksheets for better readability.
 
         Applies consistent formatting to all worksheets in the Excel document,
-        including text wrapping and column width adjustments.
+        including text wrapping, column width adjustments and a conditional
+        rule highlighting cells that could not be extracted. Each sheet uses
+        its own DataFrame's dimensions.
 
         Args:
             writer: The ExcelWriter object containing the worksheets to format
+            frames (Dict[str, pd.DataFrame]): DataFrame written to each sheet, keyed by sheet name
 
         Returns:
             None
         """
-        # Wrap text in all cells
-        cell_format = writer.book.add_format({'text_wrap': True})
-        red_format = writer.book.add_format(
-            {'bg_color': 'red', 'font_color': 'white'})
-
-        for sheet_name in writer.sheets:
-            worksheet = writer.sheets[sheet_name]
-            # Set column widths
-            for i in range(10):  # Set width for first 10 columns
-                worksheet.set_column(i, i, 50, cell_format)
-
-            # Apply red background to blank cells
-            for row_num in range(1, len(df) + 1):  # Skip header row
-                for col_num, cell_value in enumerate(df.iloc[row_num - 1]):
-                    # Remove new lines if present
-                    if isinstance(cell_value, str):
-                        cell_value = cell_value.replace('\n', ' ')
-                    # Check for empty cells
-                    if cell_value == '' or pd.isna(cell_value):
-                        worksheet.write(
-                            row_num, col_num, 'Unable to extract text. The document is unclear or blurred.', red_format)
-                    else:
-                        worksheet.write(row_num, col_num,
-                                        cell_value, cell_format)
+        formats = standard_formats(writer.book)
+        for sheet_name, df in frames.items():
+            format_sheet(writer.sheets[sheet_name], formats,
+                         len(df), len(df.columns))
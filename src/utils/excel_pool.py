@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_worker() -> None:
+    """
+    Import the workbook libraries in a pool worker so the first real job does not pay for it.
+    """
+    import xlsxwriter  # noqa: F401
+    from . import excel_generator, csv_generator, workbook_writer  # noqa: F401
+
+
+def _ping() -> bool:
+    return True
+
+
+def collect_chunks(fn: Callable[..., Iterable[bytes]], *args: Any) -> List[bytes]:
+    """
+    Run a chunk generator to completion so its output can leave a pool worker.
+
+    Args:
+        fn (Callable[..., Iterable[bytes]]): Picklable callable returning chunks, e.g.
+            CSVGenerator().iter_cv_csv
+        *args (Any): Picklable arguments
+
+    Returns:
+        List[bytes]: Every chunk fn produced, in order
+    """
+    return list(fn(*args))
+
+
+class ExcelPool:
+    """
+    Bounded process pool for CPU-bound workbook and CSV generation.
+
+    Jobs are picklable callables (e.g. bound ExcelGenerator methods) taking
+    plain dicts and returning plain results, so the event loop only awaits
+    the result while the work uses other cores. At most `max_pending` jobs
+    are handed to the pool at once; further callers wait their turn instead
+    of piling up pickled payloads. When the pool has not been started, jobs
+    run inline in the calling process. If a worker dies (e.g. OOM-killed),
+    the broken pool is replaced and the job is retried once in the new one.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: Optional[int] = None):
+        """
+        Initialize the ExcelPool.
+
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to 2.
+            max_pending (Optional[int], optional): Jobs submitted to the pool at once.
+                Defaults to twice the number of workers.
+        """
+        self.workers = workers
+        self.max_pending = max_pending or workers * 2
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._counters = {"pooled": 0, "inline": 0, "failed": 0, "waiting": 0, "running": 0,
+                          "restarts": 0}
+        self._busy_seconds = 0.0
+
+    def start(self) -> None:
+        """
+        Start the worker processes and warm them up.
+
+        Workers are spawned rather than forked so they do not inherit the
+        event loop and threads of the server process.
+        """
+        self._executor = self._create_executor()
+        for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        logger.info(f"Excel process pool started with {self.workers} workers")
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """
+        Create the executor running the worker processes.
+
+        Returns:
+            ProcessPoolExecutor: Executor with spawned, warmed-up workers
+        """
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker
+        )
+
+    def _replace_broken(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Replace an executor whose worker died, unless a concurrent job already did.
+
+        Args:
+            executor (ProcessPoolExecutor): The executor that raised BrokenProcessPool
+        """
+        if self._executor is not executor:
+            return
+        logger.error("Excel process pool broke (a worker died); starting a new one")
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._create_executor()
+        self._counters["restarts"] += 1
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a generation job in the pool and await its result.
+
+        Args:
+            fn (Callable[..., Any]): Picklable callable, e.g. ExcelGenerator().generate_cv_excel
+            *args (Any): Picklable arguments, typically the extracted data dict
+
+        Returns:
+            Any: The callable's return value
+        """
+        if self._executor is None:
+            self._counters["inline"] += 1
+            return fn(*args)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        self._counters["waiting"] += 1
+        async with self._slots:
+            self._counters["waiting"] -= 1
+            self._counters["running"] += 1
+            started = time.monotonic()
+            loop = asyncio.get_running_loop()
+            executor = self._executor
+            try:
+                try:
+                    return await loop.run_in_executor(executor, fn, *args)
+                except BrokenProcessPool:
+                    self._replace_broken(executor)
+                    return await loop.run_in_executor(self._executor, fn, *args)
+            except Exception:
+                self._counters["failed"] += 1
+                raise
+            finally:
+                self._counters["running"] -= 1
+                self._counters["pooled"] += 1
+                self._busy_seconds += time.monotonic() - started
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return pool counters.
+
+        Returns:
+            Dict[str, Any]: Worker count, job counters and total seconds spent in the pool
+        """
+        return {
+            "workers": self.workers if self._executor is not None else 0,
+            **self._counters,
+            "busy_seconds": round(self._busy_seconds, 3),
+        }
+
+
+_pool = ExcelPool()
+
+
+def get_excel_pool() -> ExcelPool:
+    """
+    Return the process-wide ExcelPool.
+
+    Returns:
+        ExcelPool: The shared pool
+    """
+    return _pool
+
+
+def configure_excel_pool(**kwargs) -> ExcelPool:
+    """
+    Replace the process-wide ExcelPool with a newly configured one.
+
+    Args:
+        **kwargs: Keyword arguments forwarded to ExcelPool
+
+    Returns:
+        ExcelPool: The new shared pool
+    """
+    global _pool
+    _pool = ExcelPool(**kwargs)
+    return _pool
@@ -1,14 +1,17 @@
 from io import BytesIO
 from fastapi import UploadFile, HTTPException
-from fastapi.responses import Response, JSONResponse
+from fastapi.responses import Response, JSONResponse, StreamingResponse
 import logging
 import inspect
+import asyncio
+from .preflight import get_preflight
+from .output_formats import DEFAULT_FORMAT, FORMAT_MEDIA_TYPES, iter_ndjson
 
 logger = logging.getLogger(__name__)
 
 
 class ExtractionProcess:
-    def __init__(self, extractor_class, file, headers):
+    def __init__(self, extractor_class, file, headers, output_format=DEFAULT_FORMAT):
         """
         Initialize the extraction process with either an uploaded file or a downloaded file (bytes).
 
@@ -16,9 +19,13 @@ class ExtractionProcess:
             extractor_class: The class responsible for document extraction.
             file: Either an `UploadFile` (for uploaded files) or `bytes` (for downloaded files).
             headers: Headers required for the extraction request.
+            output_format: Response format: "xlsx" (default), "csv", "json" or "ndjson".
         """
         self.extractor_class = extractor_class
         self.headers = headers
+        self.output_format = output_format
+        # Structured data of the last successful extraction
+        self.extracted_data = None
 
         # Log file type for debugging
         logger.info(
@@ -53,8 +60,8 @@ class ExtractionProcess:
 
         This method:
         1. Validates the uploaded/downloaded file.
-        2. Reads the file content.
-        3. Passes the file to the appropriate extractor.
+        2. Runs the pre-flight checks (size, type, PDF pages and encryption).
+        3. Passes the file object to the appropriate extractor, which streams it to the API.
         4. Handles any errors during extraction.
         5. Returns the extracted results or an appropriate error response.
 
@@ -68,22 +75,24 @@ class ExtractionProcess:
 
             logger.info(f"Received file: {self.filename}")
 
-            # ✅ Read file content based on type
+            # ✅ Stream the file content instead of reading it into memory
             if self.is_upload_file:
-                file_content = await self.file.read()  # Read from UploadFile
+                file_content = self.file.file  # Spooled file behind UploadFile
             else:
-                file_content = self.file.getvalue()  # Read from BytesIO
+                file_content = self.file  # BytesIO
 
-            if not file_content:
-                raise HTTPException(status_code=400, detail="Empty file")
+            # ✅ Reject unusable documents before they reach the OCR API
+            content_size = await asyncio.to_thread(
+                get_preflight().check, self.filename, file_content, self.is_upload_file)
 
-            logger.info(f"File size: {len(file_content)} bytes")
+            logger.info(f"File size: {content_size} bytes")
             files = {'file': (self.filename, file_content)}
 
             # ✅ Process the file using the appropriate extractor
             logger.info(f"Extracting data from file: {self.filename}")
             extractor = self.extractor_class(files, self.headers)
-            result = extractor.extract()
+            extractor.output_format = self.output_format
+            result = await extractor.extract()
 
             # ✅ Handle extraction errors
             if not result:
@@ -96,34 +105,56 @@ class ExtractionProcess:
                 logger.error(f"Error in extraction: {error_msg}")
                 if "timed out" in error_msg.lower():
                     return JSONResponse(content={"detail": error_msg}, status_code=504)
+                if "circuit open" in error_msg.lower():
+                    return JSONResponse(content={"detail": error_msg}, status_code=503)
                 return JSONResponse(content={"detail": error_msg}, status_code=500)
 
-            # ✅ Return extracted Excel data
-            if "excel_data" in result:
-                logger.info("Using in-memory Excel data")
-                filename = result.get("filename", "extracted_birth_cert.xlsx")
-                content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-
-                logger.info(
-                    f"Returning excel data with content type: {content_type}")
-                logger.info(
-                    f"Excel data length: {len(result['excel_data'])} bytes")
-                logger.info(f"Excel filename: {filename}")
-
-                return Response(
-                    content=result['excel_data'],
-                    media_type=content_type,
-                    headers={
-                        "Content-Disposition": f"attachment; filename=\"{filename}\"",
-                        "Content-Type": content_type
-                    }
-                )
-            else:
-                return JSONResponse(content=result)
+            self.extracted_data = result.get("data")
+
+            # ✅ Return the extracted data in the negotiated format
+            return self._build_response(result)
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error in extraction process: {str(e)}")
             import traceback
             logger.error(traceback.format_exc())
             raise HTTPException(
                 status_code=500, detail=f"An error occurred: {str(e)}")
+
+    def _build_response(self, result):
+        """
+        Build the HTTP response for a successful extraction in the negotiated format.
+
+        Args:
+            result: Dictionary returned by the extractor.
+
+        Returns:
+            FastAPI Response carrying the workbook, CSV file, JSON or NDJSON.
+        """
+        filename = result.get("filename", "extracted_data")
+        disposition = {"Content-Disposition": f"attachment; filename=\"{filename}\""}
+
+        if "excel_data" in result:
+            logger.info(
+                f"Returning Excel data ({len(result['excel_data'])} bytes) as {filename}")
+            return Response(
+                content=result['excel_data'],
+                media_type=FORMAT_MEDIA_TYPES["xlsx"],
+                headers=disposition
+            )
+
+        if "csv_stream" in result:
+            logger.info(f"Streaming CSV data as {filename}")
+            return StreamingResponse(
+                result["csv_stream"],
+                media_type=FORMAT_MEDIA_TYPES["csv"],
+                headers=disposition
+            )
+
+        if self.output_format == "ndjson":
+            return StreamingResponse(
+                iter_ndjson(result["data"]), media_type=FORMAT_MEDIA_TYPES["ndjson"])
+
+        return JSONResponse(content=result.get("data", result))
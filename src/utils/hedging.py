@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Sliding window of recent successful request latencies for one endpoint"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Initialize the LatencyTracker.
+
+        Args:
+            window (int, optional): Number of recent latencies kept. Defaults to 200.
+            min_samples (int, optional): Samples required before percentiles are reported. Defaults to 20.
+        """
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float) -> None:
+        """
+        Add a latency sample.
+
+        Args:
+            latency (float): Request latency in seconds
+        """
+        self._samples.append(latency)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Return the p-th percentile of the recent latencies.
+
+        Args:
+            p (float): Percentile between 0 and 1, e.g. 0.95
+
+        Returns:
+            Optional[float]: The latency in seconds, or None until enough samples exist
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+class HedgeBudget:
+    """
+    Token budget keeping hedged requests to a fraction of all requests.
+
+    Every request deposits `ratio` tokens and every hedge spends one, so
+    hedges can never exceed `ratio` of the traffic over time.
+    """
+
+    def __init__(self, ratio: float = 0.05, max_tokens: float = 10):
+        """
+        Initialize the HedgeBudget.
+
+        Args:
+            ratio (float, optional): Maximum share of requests that may be hedged. Defaults to 0.05.
+            max_tokens (float, optional): Cap on saved-up tokens to limit hedge bursts. Defaults to 10.
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = 0.0
+
+    def deposit(self) -> None:
+        """
+        Credit the budget for one request.
+        """
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Spend one token for a hedge if the budget allows it.
+
+        Returns:
+            bool: True if the hedge may be sent
+        """
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class Hedger:
+    """
+    Sends a second identical request when the first is slower than usual.
+
+    If a request has not completed after the configured percentile of the
+    endpoint's recent latency, an identical hedge request is started. The
+    first successful response wins and the other request is cancelled; a
+    response the caller does not accept (e.g. a 5xx) neither wins nor
+    counts as a latency sample.
+    """
+
+    def __init__(self, percentile: float = 0.95, budget_ratio: float = 0.05,
+                 window: int = 200, min_samples: int = 20, min_delay: float = 0.5):
+        """
+        Initialize the Hedger.
+
+        Args:
+            percentile (float, optional): Latency percentile after which a hedge is sent. Defaults to 0.95.
+            budget_ratio (float, optional): Global share of requests that may be hedged. Defaults to 0.05.
+            window (int, optional): Latency samples kept per endpoint. Defaults to 200.
+            min_samples (int, optional): Samples required before hedging an endpoint. Defaults to 20.
+            min_delay (float, optional): Never hedge earlier than this many seconds. Defaults to 0.5.
+        """
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.budget = HedgeBudget(ratio=budget_ratio)
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._counters = {"requests": 0, "hedges": 0,
+                          "hedge_wins": 0, "budget_denied": 0}
+
+    def _tracker(self, name: str) -> LatencyTracker:
+        """
+        Return the latency tracker of an endpoint, creating it on first use.
+
+        Args:
+            name (str): Endpoint identifier
+
+        Returns:
+            LatencyTracker: The endpoint's tracker
+        """
+        tracker = self._trackers.get(name)
+        if tracker is None:
+            tracker = LatencyTracker(self.window, self.min_samples)
+            self._trackers[name] = tracker
+        return tracker
+
+    async def run(self, name: str, fn: Callable[[], Awaitable[Any]],
+                  accept: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Run fn, hedging it with a second call if it is slower than usual.
+
+        Args:
+            name (str): Endpoint identifier used for latency tracking
+            fn (Callable[[], Awaitable[Any]]): Factory creating one request coroutine
+            accept (Optional[Callable[[Any], bool]], optional): Tells whether a result is a
+                success. Defaults to None, accepting every result.
+
+        Returns:
+            Any: Result of the first call to succeed, or the last unaccepted result
+                if no call succeeded
+
+        Raises:
+            Exception: The last error if every call failed without a result
+        """
+        tracker = self._tracker(name)
+        self._counters["requests"] += 1
+        self.budget.deposit()
+        threshold = tracker.percentile(self.percentile)
+
+        started = {}
+        tasks = set()
+
+        def launch(label: str) -> None:
+            task = asyncio.ensure_future(fn())
+            started[task] = (label, time.monotonic())
+            tasks.add(task)
+
+        launch("primary")
+        try:
+            if threshold is not None:
+                done, _ = await asyncio.wait(tasks, timeout=max(self.min_delay, threshold))
+                if not done:
+                    if self.budget.withdraw():
+                        self._counters["hedges"] += 1
+                        logger.info(
+                            f"Hedging request to {name} after {threshold:.2f}s")
+                        launch("hedge")
+                    else:
+                        self._counters["budget_denied"] += 1
+
+            error: Optional[BaseException] = None
+            rejected = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if accept is not None and not accept(task.result()):
+                        # Keep waiting for the other call, which may still succeed
+                        rejected = (task.result(),)
+                        continue
+                    label, start = started[task]
+                    tracker.record(time.monotonic() - start)
+                    if label == "hedge":
+                        self._counters["hedge_wins"] += 1
+                    return task.result()
+            if rejected is not None:
+                return rejected[0]
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hedging counters and the current hedge threshold per endpoint.
+
+        Returns:
+            Dict[str, Any]: Counters, remaining budget tokens and thresholds in seconds
+        """
+        return {
+            **self._counters,
+            "budget_tokens": round(self.budget.tokens, 3),
+            "thresholds": {name: tracker.percentile(self.percentile)
+                           for name, tracker in self._trackers.items()},
+        }
+
+
+_hedger = Hedger()
+
+
+def get_hedger() -> Hedger:
+    """
+    Return the process-wide Hedger.
+
+    Returns:
+        Hedger: The shared hedger
+    """
+    return _hedger
+
+
+def configure_hedging(**kwargs) -> Hedger:
+    """
+    Replace the process-wide Hedger with a newly configured one.
+
+    Args:
+        **kwargs: Keyword arguments forwarded to Hedger
+
+    Returns:
+        Hedger: The new shared hedger
+    """
+    global _hedger
+    _hedger = Hedger(**kwargs)
+    return _hedger
@@ -0,0 +1,306 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import weakref
+from typing import IO, Any, Dict, Optional
+
+import aiohttp
+from aiohttp import payload
+
+logger = logging.getLogger(__name__)
+
+# Size of the chunks read from an upload while streaming it to an API
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Per-file locks serializing seek+read pairs so several readers can share one file handle
+_READ_LOCKS: "weakref.WeakKeyDictionary[IO[bytes], threading.Lock]" = weakref.WeakKeyDictionary()
+_READ_LOCKS_GUARD = threading.Lock()
+
+
+def _read_lock(file: IO[bytes]) -> threading.Lock:
+    """
+    Return the lock serializing positioned reads of a file object.
+
+    Args:
+        file (IO[bytes]): Seekable binary file
+
+    Returns:
+        threading.Lock: Lock shared by every reader of this file object only
+    """
+    with _READ_LOCKS_GUARD:
+        lock = _READ_LOCKS.get(file)
+        if lock is None:
+            lock = _READ_LOCKS[file] = threading.Lock()
+        return lock
+
+
+def _positional_fd(file: IO[bytes]) -> Optional[int]:
+    """
+    Return the descriptor of a file that can be read with os.pread.
+
+    Only files opened read-only qualify, as they have no pending writes
+    buffered in Python that a positional read would miss. In-memory and
+    spooled files are read under their lock instead.
+
+    Args:
+        file (IO[bytes]): Seekable binary file
+
+    Returns:
+        Optional[int]: File descriptor, or None if the file has to be seeked
+    """
+    if not hasattr(os, "pread") or getattr(file, "mode", None) != "rb":
+        return None
+    try:
+        return file.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def read_at(file: IO[bytes], offset: int, size: int) -> bytes:
+    """
+    Read up to size bytes starting at offset without disturbing other readers.
+
+    Args:
+        file (IO[bytes]): Seekable binary file
+        offset (int): Position of the first byte to read
+        size (int): Maximum number of bytes to read
+
+    Returns:
+        bytes: The bytes read, empty at end of file
+    """
+    fd = _positional_fd(file)
+    if fd is not None:
+        return os.pread(fd, size, offset)
+    with _read_lock(file):
+        file.seek(offset)
+        return file.read(size)
+
+
+def file_size(file: IO[bytes]) -> int:
+    """
+    Return the size of a seekable binary file.
+
+    Args:
+        file (IO[bytes]): Seekable binary file
+
+    Returns:
+        int: Size of the file in bytes
+    """
+    fd = _positional_fd(file)
+    if fd is not None:
+        return os.fstat(fd).st_size
+    with _read_lock(file):
+        position = file.tell()
+        size = file.seek(0, 2)
+        file.seek(position)
+        return size
+
+
+class FileChunkPayload(payload.Payload):
+    """
+    Multipart part that streams a seekable file in fixed-size chunks.
+
+    Unlike aiohttp's file payloads it reads by absolute offset and never
+    closes the file, so the same upload can be sent again (retries) or by
+    several requests at once without being buffered in memory.
+    """
+
+    def __init__(self, value: IO[bytes], chunk_size: int = UPLOAD_CHUNK_SIZE, **kwargs):
+        """
+        Initialize the FileChunkPayload.
+
+        Args:
+            value (IO[bytes]): Seekable binary file to stream
+            chunk_size (int, optional): Bytes read per chunk. Defaults to UPLOAD_CHUNK_SIZE.
+            **kwargs: Keyword arguments forwarded to aiohttp's Payload (filename, content_type, ...)
+        """
+        super().__init__(value, **kwargs)
+        self.chunk_size = chunk_size
+        self._size = file_size(value)
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return read_at(self._value, 0, self._size).decode(encoding, errors)
+
+    async def write(self, writer) -> None:
+        await self.write_with_length(writer, None)
+
+    async def write_with_length(self, writer, content_length: Optional[int]) -> None:
+        offset = 0
+        end = self._size if content_length is None else min(
+            self._size, content_length)
+        while offset < end:
+            chunk = await asyncio.to_thread(
+                read_at, self._value, offset, min(self.chunk_size, end - offset))
+            if not chunk:
+                break
+            await writer.write(chunk)
+            offset += len(chunk)
+
+
+class HTTPResponse:
+    """Fully read HTTP response returned by HTTPTransport"""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes):
+        """
+        Initialize the HTTPResponse with the data read from the wire.
+
+        Args:
+            status_code (int): HTTP status code of the response
+            headers (Dict[str, str]): Response headers
+            content (bytes): Raw response body
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        """
+        Decode the response body as UTF-8 text.
+
+        Returns:
+            str: The decoded response body
+        """
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        """
+        Parse the response body as JSON.
+
+        Returns:
+            Any: The decoded JSON document
+        """
+        return json.loads(self.content)
+
+
+class HTTPTransport:
+    """
+    Shared asynchronous HTTP transport backed by a keep-alive connection pool.
+
+    One instance is meant to live for the whole application lifespan so that
+    every extractor and Airtable call reuses the same pooled connections
+    instead of opening a new socket (and TLS handshake) per request.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 20,
+                 keepalive_timeout: float = 30, timeout: float = 30):
+        """
+        Initialize the HTTPTransport with its pool configuration.
+
+        Args:
+            limit (int, optional): Maximum number of open connections in total. Defaults to 100.
+            limit_per_host (int, optional): Maximum number of open connections per host. Defaults to 20.
+            keepalive_timeout (float, optional): Seconds an idle connection is kept alive. Defaults to 30.
+            timeout (float, optional): Default total timeout per request in seconds. Defaults to 30.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        """
+        Open the connection pool.
+
+        Calling this is optional; the pool is opened lazily on first use. The
+        application calls it during startup so the pool exists before the
+        first request arrives.
+        """
+        await self._get_session()
+        logger.info(
+            f"HTTP transport started (limit={self.limit}, limit_per_host={self.limit_per_host})")
+
+    async def close(self) -> None:
+        """
+        Close the connection pool and release every pooled connection.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+        logger.info("HTTP transport closed")
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the pooled session, creating it for the running event loop if needed.
+
+        Returns:
+            aiohttp.ClientSession: The shared client session
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._loop = loop
+        return self._session
+
+    async def request(self, method: str, url: str, headers: Optional[Dict] = None,
+                      data: Any = None, json: Any = None,
+                      timeout: Optional[float] = None) -> HTTPResponse:
+        """
+        Send an HTTP request through the shared pool and read the full response.
+
+        Args:
+            method (str): HTTP method, e.g. "GET", "POST" or "PATCH"
+            url (str): Target URL
+            headers (Optional[Dict], optional): Request headers. Defaults to None.
+            data (Any, optional): Request body, e.g. an aiohttp.FormData. Defaults to None.
+            json (Any, optional): JSON-serializable request body. Defaults to None.
+            timeout (Optional[float], optional): Total timeout override in seconds. Defaults to None.
+
+        Returns:
+            HTTPResponse: The response with its body already read
+
+        Raises:
+            asyncio.TimeoutError: If the request does not complete within the timeout
+            aiohttp.ClientError: For connection-level failures
+        """
+        session = await self._get_session()
+        request_timeout = aiohttp.ClientTimeout(
+            total=timeout) if timeout is not None else None
+        async with session.request(method, url, headers=headers, data=data,
+                                   json=json, timeout=request_timeout) as resp:
+            content = await resp.read()
+            return HTTPResponse(resp.status, dict(resp.headers), content)
+
+
+_transport: Optional[HTTPTransport] = None
+
+
+def get_transport() -> HTTPTransport:
+    """
+    Return the process-wide HTTPTransport, creating a default one if needed.
+
+    Returns:
+        HTTPTransport: The shared transport
+    """
+    global _transport
+    if _transport is None:
+        _transport = HTTPTransport()
+    return _transport
+
+
+def configure_transport(**kwargs) -> HTTPTransport:
+    """
+    Replace the process-wide HTTPTransport with a newly configured one.
+
+    Args:
+        **kwargs: Keyword arguments forwarded to HTTPTransport
+
+    Returns:
+        HTTPTransport: The new shared transport
+    """
+    global _transport
+    _transport = HTTPTransport(**kwargs)
+    return _transport
@@ -0,0 +1,440 @@
+import asyncio
+import logging
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, UploadFile
+
+from .extraction_process import ExtractionProcess
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueue:
+    """
+    Durable extraction job queue backed by SQLite and a local file store.
+
+    Uploaded documents and finished workbooks are kept as files next to the
+    database, so queued jobs and results survive restarts. A claimed job
+    holds a lease that its worker renews while the job runs; if the worker
+    dies, the lease expires and another worker picks the job up again. The
+    attempt number of a claim fences its outcome, so a worker whose lease
+    was taken over cannot overwrite the new attempt's result.
+    """
+
+    def __init__(self, db_path: str, storage_dir: str, lease_timeout: float = 300,
+                 max_attempts: int = 3):
+        """
+        Initialize the JobQueue.
+
+        Args:
+            db_path (str): Path of the SQLite database holding job metadata
+            storage_dir (str): Directory storing job inputs and results
+            lease_timeout (float, optional): Seconds a claimed job stays reserved without
+                being renewed. Defaults to 300.
+            max_attempts (int, optional): Attempts before a job is marked failed. Defaults to 3.
+        """
+        self.db_path = db_path
+        self.storage_dir = storage_dir
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.job_available = asyncio.Event()
+        os.makedirs(self.storage_dir, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the job database.
+
+        Returns:
+            sqlite3.Connection: A new connection in autocommit mode
+        """
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        """
+        Create the jobs table if it does not exist yet.
+        """
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, doc_type TEXT NOT NULL, filename TEXT, "
+                "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+                "input_path TEXT, result_path TEXT, result_filename TEXT, "
+                "error TEXT, created REAL NOT NULL, updated REAL NOT NULL, lease_until REAL)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+
+    async def enqueue(self, doc_type: str, upload: UploadFile) -> str:
+        """
+        Persist an uploaded document and queue it for extraction.
+
+        Args:
+            doc_type (str): Key of EXTRACTOR_MAP selecting the extractor
+            upload (UploadFile): The uploaded document
+
+        Returns:
+            str: The new job id
+        """
+        job_id = uuid.uuid4().hex
+        input_path = os.path.join(self.storage_dir, f"{job_id}.input")
+        await asyncio.to_thread(self._store_upload, upload.file, input_path)
+        now = time.time()
+        await asyncio.to_thread(self._execute,
+                                "INSERT INTO jobs (id, doc_type, filename, status, input_path, created, updated) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (job_id, doc_type, upload.filename, QUEUED, input_path, now, now))
+        self.job_available.set()
+        logger.info(f"Queued job {job_id} ({doc_type})")
+        return job_id
+
+    @staticmethod
+    def _store_upload(source, input_path: str) -> None:
+        """
+        Copy an upload to the file store in chunks.
+
+        Args:
+            source: Binary file object of the upload
+            input_path (str): Destination path
+        """
+        source.seek(0)
+        with open(input_path, "wb") as destination:
+            shutil.copyfileobj(source, destination)
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        """
+        Run a single write statement.
+
+        Args:
+            sql (str): SQL statement
+            params (tuple, optional): Statement parameters. Defaults to ().
+
+        Returns:
+            int: Number of rows changed
+        """
+        with self._connect() as conn:
+            return conn.execute(sql, params).rowcount
+
+    @staticmethod
+    def _fence(job_id: str, attempt: Optional[int]) -> tuple:
+        """
+        Build the WHERE clause limiting an update to the claim holding the job.
+
+        Args:
+            job_id (str): Job id
+            attempt (Optional[int]): Attempt number of the claim, None to update the job whoever holds it
+
+        Returns:
+            tuple: SQL condition and its parameters
+        """
+        if attempt is None:
+            return "id = ?", (job_id,)
+        return "id = ? AND status = ? AND attempts = ?", (job_id, RUNNING, attempt)
+
+    async def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Reserve the oldest runnable job.
+
+        A job is runnable when it is queued or when its lease expired
+        because the worker running it crashed.
+
+        Returns:
+            Optional[Dict[str, Any]]: The claimed job, or None if nothing is runnable
+        """
+        return await asyncio.to_thread(self._claim)
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? OR (status = ? AND lease_until < ?) "
+                "ORDER BY created LIMIT 1", (QUEUED, RUNNING, now)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            if row["attempts"] >= self.max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE id = ?",
+                    (FAILED, row["error"] or "Worker crashed too many times", now, row["id"]))
+                conn.execute("COMMIT")
+                return self._claim()
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_until = ?, updated = ? "
+                "WHERE id = ?", (RUNNING, now + self.lease_timeout, now, row["id"]))
+            conn.execute("COMMIT")
+            return {**dict(row), "status": RUNNING, "attempts": row["attempts"] + 1}
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    async def renew(self, job_id: str, attempt: int) -> bool:
+        """
+        Extend the lease of a running job.
+
+        Args:
+            job_id (str): Job id
+            attempt (int): Attempt number of the claim holding the lease
+
+        Returns:
+            bool: False if the job is no longer held by that claim
+        """
+        return await asyncio.to_thread(self._execute,
+                                       "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND attempts = ?",
+                                       (time.time() + self.lease_timeout, job_id, RUNNING, attempt)) > 0
+
+    async def complete(self, job_id: str, content: bytes, filename: str,
+                       attempt: Optional[int] = None) -> bool:
+        """
+        Store a job's workbook and mark the job succeeded.
+
+        Args:
+            job_id (str): Job id
+            content (bytes): The generated workbook
+            filename (str): Download filename of the workbook
+            attempt (Optional[int], optional): Attempt number of the claim that ran the job.
+                Defaults to None, completing the job whoever holds it.
+
+        Returns:
+            bool: False if the claim lost the job to another worker and the result was dropped
+        """
+        suffix = "result" if attempt is None else f"{attempt}.result"
+        result_path = os.path.join(self.storage_dir, f"{job_id}.{suffix}")
+        await asyncio.to_thread(self._write_file, result_path, content)
+        where, params = self._fence(job_id, attempt)
+        updated = await asyncio.to_thread(self._execute,
+                                          "UPDATE jobs SET status = ?, result_path = ?, result_filename = ?, "
+                                          f"error = NULL, lease_until = NULL, updated = ? WHERE {where}",
+                                          (SUCCEEDED, result_path, filename, time.time(), *params))
+        if not updated:
+            logger.warning(f"Job {job_id} attempt {attempt} lost its lease; dropping its result")
+            await asyncio.to_thread(os.remove, result_path)
+            return False
+        await asyncio.to_thread(self._remove_input, job_id)
+        return True
+
+    @staticmethod
+    def _write_file(path: str, content: bytes) -> None:
+        with open(path, "wb") as destination:
+            destination.write(content)
+
+    async def fail(self, job_id: str, error: str, retry: bool, attempt: Optional[int] = None) -> None:
+        """
+        Record a failed attempt, re-queueing the job if attempts remain.
+
+        Args:
+            job_id (str): Job id
+            error (str): Error message of the attempt
+            retry (bool): Whether the failure is transient and worth another attempt
+            attempt (Optional[int], optional): Attempt number of the claim that ran the job.
+                Defaults to None, failing the job whoever holds it.
+        """
+        job = await self.get(job_id)
+        final = not retry or job["attempts"] >= self.max_attempts
+        where, params = self._fence(job_id, attempt)
+        updated = await asyncio.to_thread(self._execute,
+                                          "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, updated = ? "
+                                          f"WHERE {where}", (FAILED if final else QUEUED, error, time.time(), *params))
+        if not updated:
+            logger.warning(f"Job {job_id} attempt {attempt} lost its lease; ignoring its failure")
+            return
+        if final:
+            await asyncio.to_thread(self._remove_input, job_id)
+        else:
+            self.job_available.set()
+
+    async def release(self, job_id: str, attempt: Optional[int] = None) -> None:
+        """
+        Put a running job back in the queue without counting the attempt.
+
+        Used when a worker is stopped during shutdown.
+
+        Args:
+            job_id (str): Job id
+            attempt (Optional[int], optional): Attempt number of the claim that ran the job.
+                Defaults to None, releasing the job whoever holds it.
+        """
+        where, params = self._fence(job_id, attempt)
+        await asyncio.to_thread(self._execute,
+                                "UPDATE jobs SET status = ?, attempts = attempts - 1, lease_until = NULL, "
+                                f"updated = ? WHERE {where} AND status = ?",
+                                (QUEUED, time.time(), *params, RUNNING))
+
+    def _remove_input(self, job_id: str) -> None:
+        path = os.path.join(self.storage_dir, f"{job_id}.input")
+        if os.path.exists(path):
+            os.remove(path)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a job's metadata.
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            Optional[Dict[str, Any]]: The job row, or None if it does not exist
+        """
+        def _get():
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return dict(row) if row else None
+        return await asyncio.to_thread(_get)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of jobs in each status.
+
+        Returns:
+            Dict[str, int]: Job counts keyed by status
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+class JobWorkerPool:
+    """Pool of asyncio workers processing jobs from a JobQueue"""
+
+    def __init__(self, queue: JobQueue, extractor_map: Dict[str, Any], headers: Dict,
+                 workers: int = 2, poll_interval: float = 2):
+        """
+        Initialize the JobWorkerPool.
+
+        Args:
+            queue (JobQueue): Queue to take jobs from
+            extractor_map (Dict[str, Any]): Mapping of document types to extractor classes
+            headers (Dict): Headers required for the extraction requests
+            workers (int, optional): Number of concurrent workers. Defaults to 2.
+            poll_interval (float, optional): Seconds between polls when the queue is empty. Defaults to 2.
+        """
+        self.queue = queue
+        self.extractor_map = extractor_map
+        self.headers = headers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._tasks = []
+
+    def start(self) -> None:
+        """
+        Start the workers on the running event loop.
+        """
+        self._tasks = [asyncio.create_task(self._run())
+                       for _ in range(self.workers)]
+        logger.info(f"Started {self.workers} job workers")
+
+    async def stop(self) -> None:
+        """
+        Stop the workers, returning in-progress jobs to the queue.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self) -> None:
+        """
+        Claim and process jobs until cancelled.
+        """
+        while True:
+            try:
+                job = await self.queue.claim()
+            except Exception as e:
+                logger.error(f"Error claiming job: {str(e)}")
+                job = None
+            if job is None:
+                self.queue.job_available.clear()
+                try:
+                    await asyncio.wait_for(self.queue.job_available.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self.process(job)
+            except asyncio.CancelledError:
+                await asyncio.shield(self.queue.release(job["id"], job["attempts"]))
+                raise
+
+    async def _keep_lease(self, job: Dict[str, Any]) -> None:
+        """
+        Renew a job's lease until cancelled or until another worker took the job over.
+
+        Args:
+            job (Dict[str, Any]): The claimed job
+        """
+        while True:
+            await asyncio.sleep(self.queue.lease_timeout / 3)
+            try:
+                held = await self.queue.renew(job["id"], job["attempts"])
+            except Exception as e:
+                logger.error(f"Error renewing lease of job {job['id']}: {str(e)}")
+                continue
+            if not held:
+                logger.warning(f"Job {job['id']} attempt {job['attempts']} lost its lease")
+                return
+
+    async def process(self, job: Dict[str, Any]) -> None:
+        """
+        Run the extraction of one claimed job and record its outcome.
+
+        The job's lease is renewed while the extraction runs, so a job taking
+        longer than the lease timeout is not handed to a second worker.
+
+        Args:
+            job (Dict[str, Any]): The claimed job
+        """
+        heartbeat = asyncio.create_task(self._keep_lease(job))
+        try:
+            await self._process(job)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        """
+        Run the extraction of a job and record the outcome under its claim's attempt number.
+
+        Args:
+            job (Dict[str, Any]): The claimed job
+        """
+        attempt = job["attempts"]
+        logger.info(f"Processing job {job['id']} (attempt {attempt})")
+        try:
+            with open(job["input_path"], "rb") as source:
+                upload = UploadFile(file=source, filename=job["filename"])
+                extractor = ExtractionProcess(
+                    self.extractor_map[job["doc_type"]], upload, self.headers)
+                response = await extractor.proccess_extraction()
+        except HTTPException as e:
+            await self.queue.fail(job["id"], str(e.detail), retry=e.status_code >= 500, attempt=attempt)
+            return
+        except Exception as e:
+            logger.error(f"Job {job['id']} crashed: {str(e)}")
+            await self.queue.fail(job["id"], str(e), retry=True, attempt=attempt)
+            return
+
+        if response.status_code != 200:
+            await self.queue.fail(job["id"], response.body.decode("utf-8", errors="replace"),
+                                  retry=response.status_code >= 500, attempt=attempt)
+            return
+
+        stem = (job["filename"] or "document").rsplit(".", 1)[0]
+        if await self.queue.complete(job["id"], response.body, f"{stem}_{job['doc_type']}.xlsx", attempt):
+            logger.info(f"Job {job['id']} succeeded")
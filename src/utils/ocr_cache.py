@@ -0,0 +1,247 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class OCRCache:
+    """
+    Two-tier cache of raw Finhero responses keyed by document content.
+
+    The memory tier is a bounded LRU with a TTL that serves repeat uploads
+    within one worker. The disk tier is a SQLite database that survives
+    restarts and is shared by every worker process on the host.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600,
+                 db_path: Optional[str] = None, disk_ttl: float = 7 * 24 * 3600,
+                 max_disk_entries: int = 50000):
+        """
+        Initialize the OCRCache.
+
+        Args:
+            max_entries (int, optional): Maximum number of entries kept in memory. Defaults to 512.
+            ttl (float, optional): Seconds an entry stays valid in memory. Defaults to 3600.
+            db_path (Optional[str], optional): Path of the SQLite file backing the disk tier.
+                The disk tier is disabled when None. Defaults to None.
+            disk_ttl (float, optional): Seconds an entry stays valid on disk. Defaults to 7 days.
+            max_disk_entries (int, optional): Maximum number of entries kept on disk. Defaults to 50000.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.disk_ttl = disk_ttl
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._writes_since_prune = 0
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "memory_expirations": 0,
+            "disk_evictions": 0,
+            "writes": 0,
+        }
+        if self.db_path:
+            self._init_db()
+
+    @staticmethod
+    def make_key(content_hash: str, extractor_name: str) -> str:
+        """
+        Build the cache key for a document and the extractor that reads it.
+
+        Args:
+            content_hash (str): SHA-256 hex digest of the document bytes
+            extractor_name (str): Name of the extractor class
+
+        Returns:
+            str: The cache key
+        """
+        return f"{extractor_name}:{content_hash}"
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the disk tier.
+
+        Returns:
+            sqlite3.Connection: A new connection to the cache database
+        """
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_db(self) -> None:
+        """
+        Create the disk tier table if it does not exist yet.
+        """
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ocr_cache_created ON ocr_cache (created)")
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response, checking memory first and then disk.
+
+        Args:
+            key (str): Cache key built with make_key
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached Finhero JSON, or None on a miss
+        """
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return json.loads(value)
+            del self._memory[key]
+            self._counters["memory_expirations"] += 1
+
+        if self.db_path:
+            value = await asyncio.to_thread(self._disk_get, key, now)
+            if value is not None:
+                self._counters["disk_hits"] += 1
+                self._memory_set(key, value, now)
+                return json.loads(value)
+
+        self._counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, data: Dict[str, Any]) -> None:
+        """
+        Store a Finhero response in both tiers.
+
+        Args:
+            key (str): Cache key built with make_key
+            data (Dict[str, Any]): The raw Finhero JSON to cache
+        """
+        now = time.time()
+        value = json.dumps(data)
+        self._memory_set(key, value, now)
+        self._counters["writes"] += 1
+        if self.db_path:
+            await asyncio.to_thread(self._disk_set, key, value, now)
+
+    def _memory_set(self, key: str, value: str, now: float) -> None:
+        """
+        Insert a serialized value in the memory tier, evicting the LRU entry when full.
+
+        Args:
+            key (str): Cache key
+            value (str): Serialized JSON value
+            now (float): Current timestamp
+        """
+        self._memory[key] = (now + self.ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["memory_evictions"] += 1
+
+    def _disk_get(self, key: str, now: float) -> Optional[str]:
+        """
+        Read a value from the disk tier if it has not expired.
+
+        Args:
+            key (str): Cache key
+            now (float): Current timestamp
+
+        Returns:
+            Optional[str]: The serialized JSON value, or None
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM ocr_cache WHERE key = ? AND created > ?",
+                (key, now - self.disk_ttl)).fetchone()
+        return row[0] if row else None
+
+    def _disk_set(self, key: str, value: str, now: float) -> None:
+        """
+        Write a value to the disk tier and prune it periodically.
+
+        Args:
+            key (str): Cache key
+            value (str): Serialized JSON value
+            now (float): Current timestamp
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ocr_cache (key, value, created) VALUES (?, ?, ?)",
+                (key, value, now))
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= 100:
+                self._writes_since_prune = 0
+                self._counters["disk_evictions"] += self._prune(conn, now)
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> int:
+        """
+        Drop expired rows and trim the disk tier to max_disk_entries.
+
+        Args:
+            conn (sqlite3.Connection): Open connection to the cache database
+            now (float): Current timestamp
+
+        Returns:
+            int: Number of rows removed
+        """
+        removed = conn.execute(
+            "DELETE FROM ocr_cache WHERE created <= ?", (now - self.disk_ttl,)).rowcount
+        removed += conn.execute(
+            "DELETE FROM ocr_cache WHERE key IN (SELECT key FROM ocr_cache "
+            "ORDER BY created DESC LIMIT -1 OFFSET ?)", (self.max_disk_entries,)).rowcount
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit, miss and eviction counters for sizing the cache.
+
+        Returns:
+            Dict[str, Any]: Counters plus the current memory tier size and hit ratio
+        """
+        hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+        lookups = hits + self._counters["misses"]
+        return {
+            **self._counters,
+            "hits": hits,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "disk_enabled": bool(self.db_path),
+        }
+
+
+_cache: Optional[OCRCache] = None
+
+
+def get_ocr_cache() -> Optional[OCRCache]:
+    """
+    Return the process-wide OCRCache, or None when caching is not configured.
+
+    Returns:
+        Optional[OCRCache]: The shared cache
+    """
+    return _cache
+
+
+def configure_ocr_cache(**kwargs) -> OCRCache:
+    """
+    Replace the process-wide OCRCache with a newly configured one.
+
+    Args:
+        **kwargs: Keyword arguments forwarded to OCRCache
+
+    Returns:
+        OCRCache: The new shared cache
+    """
+    global _cache
+    _cache = OCRCache(**kwargs)
+    return _cache
@@ -0,0 +1,101 @@
+import json
+import logging
+from typing import Any, Dict, Iterator, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Output format produced for each accepted media type
+MEDIA_TYPES = {
+    XLSX_MEDIA_TYPE: "xlsx",
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+# Media type returned for each output format
+FORMAT_MEDIA_TYPES = {
+    "xlsx": XLSX_MEDIA_TYPE,
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+DEFAULT_FORMAT = "xlsx"
+
+
+def negotiate_format(accept: Optional[str], requested: Optional[str] = None) -> str:
+    """
+    Choose the output format of an extraction response.
+
+    An explicit format parameter wins over the Accept header. Without
+    either, or when the client accepts anything, the workbook is returned
+    as before.
+
+    Args:
+        accept (Optional[str]): Value of the Accept header
+        requested (Optional[str], optional): Value of the format query parameter. Defaults to None.
+
+    Returns:
+        str: One of "xlsx", "json", "ndjson" or "csv"
+
+    Raises:
+        HTTPException: 400 for an unknown format parameter, 406 when the
+            Accept header allows none of the supported media types
+    """
+    if requested:
+        requested = requested.lower()
+        if requested not in FORMAT_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown format '{requested}'; expected one of {', '.join(FORMAT_MEDIA_TYPES)}")
+        return requested
+
+    if not accept:
+        return DEFAULT_FORMAT
+
+    best, best_quality = None, 0.0
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        candidate = DEFAULT_FORMAT if media_type == "*/*" else MEDIA_TYPES.get(media_type)
+        # The first listed type wins between equal qualities
+        if candidate and quality > best_quality:
+            best, best_quality = candidate, quality
+
+    if best is None:
+        raise HTTPException(
+            status_code=406,
+            detail=f"None of the accepted media types is supported; use one of {', '.join(MEDIA_TYPES)}")
+    return best
+
+
+def iter_ndjson(data: Dict[str, Any]) -> Iterator[str]:
+    """
+    Yield extracted data as newline-delimited JSON.
+
+    Each section of the extractor dict becomes one line, except list
+    sections (e.g. work experience), which become one line per entry.
+
+    Args:
+        data (Dict[str, Any]): Structured data returned by an extractor
+
+    Returns:
+        Iterator[str]: JSON lines, each ending with a newline
+    """
+    for section, value in data.items():
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            yield json.dumps({"section": section, "value": item}, default=str) + "\n"
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """
+    Runs a polling sweep repeatedly with an interval adapted to the work found.
+
+    After a sweep that found work the next one starts min_interval seconds
+    later, so a busy table is picked up quickly. Every sweep that finds
+    nothing multiplies the interval by backoff, up to max_interval, so an
+    idle table is polled less and less often. A sweep only starts once the
+    previous one has returned, so sweeps never overlap however long they take.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float, backoff: float = 2.0):
+        """
+        Initialize the PollScheduler.
+
+        Args:
+            min_interval (float): Seconds between sweeps while there is work
+            max_interval (float): Longest wait between sweeps while idle
+            backoff (float, optional): Factor the interval grows by after each idle sweep.
+                Defaults to 2.0.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self.interval = min_interval
+        self._counters = {"sweeps": 0, "busy_sweeps": 0, "idle_sweeps": 0,
+                          "failed_sweeps": 0, "idle_streak": 0}
+        self._last_duration: Optional[float] = None
+        self._last_work: Optional[int] = None
+
+    def record(self, work: int, duration: float) -> float:
+        """
+        Account for a finished sweep and compute the wait before the next one.
+
+        Args:
+            work (int): Work items the sweep found; 0 for an idle or failed sweep
+            duration (float): Seconds the sweep took
+
+        Returns:
+            float: Seconds to wait before the next sweep
+        """
+        self._counters["sweeps"] += 1
+        self._last_duration = duration
+        self._last_work = work
+        if work > 0:
+            self._counters["busy_sweeps"] += 1
+            self._counters["idle_streak"] = 0
+            self.interval = self.min_interval
+        else:
+            self._counters["idle_sweeps"] += 1
+            self._counters["idle_streak"] += 1
+            self.interval = min(self.max_interval,
+                                self.interval * self.backoff)
+        return self.interval
+
+    async def run(self, sweep: Callable[[], Awaitable[int]], shutdown: asyncio.Event) -> None:
+        """
+        Run sweeps until shutdown is set.
+
+        Args:
+            sweep (Callable[[], Awaitable[int]]): Runs one sweep and returns the number of
+                work items it found
+            shutdown (asyncio.Event): Set to stop; the wait in progress is cut short
+        """
+        while not shutdown.is_set():
+            started = time.monotonic()
+            try:
+                work = await sweep()
+            except Exception as e:
+                self._counters["failed_sweeps"] += 1
+                logger.error(f"Scheduled sweep failed: {e}")
+                work = 0
+            interval = self.record(work, time.monotonic() - started)
+            logger.info(
+                f"Scheduled sweep found {work} work item(s); next in {interval:.1f}s")
+            try:
+                await asyncio.wait_for(shutdown.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the scheduler's interval and counters.
+
+        Returns:
+            Dict[str, Any]: Current interval, last sweep duration and work found, sweeps
+                run per outcome and consecutive idle sweeps
+        """
+        return {
+            "interval": round(self.interval, 3),
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "last_duration": round(self._last_duration, 3) if self._last_duration is not None else None,
+            "last_work": self._last_work,
+            **self._counters,
+        }
@@ -0,0 +1,258 @@
+import logging
+import os
+import re
+import zipfile
+from typing import IO, Dict, Optional
+
+from fastapi import HTTPException
+
+from .http_client import UPLOAD_CHUNK_SIZE, file_size, read_at
+
+logger = logging.getLogger(__name__)
+
+# Leading bytes identifying the document formats the OCR API accepts
+MAGIC_BYTES = (
+    (b"%PDF-", "pdf"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+    (b"BM", "bmp"),
+    # OOXML documents are ZIP archives; is_docx tells Word files from other archives
+    (b"PK\x03\x04", "docx"),
+)
+
+# File extensions and the format they declare
+EXTENSION_TYPES = {
+    ".pdf": "pdf",
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+    ".png": "png",
+    ".tif": "tiff",
+    ".tiff": "tiff",
+    ".bmp": "bmp",
+    ".webp": "webp",
+    ".docx": "docx",
+}
+
+_PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+_ENCRYPT_PATTERN = re.compile(rb"/Encrypt(?![A-Za-z])")
+_EOF_MARKER = b"%%EOF"
+# Bytes kept between scanned chunks so tokens split across chunks are still found
+_SCAN_OVERLAP = 32
+
+
+def sniff_type(header: bytes) -> Optional[str]:
+    """
+    Identify a document format from its leading bytes.
+
+    Args:
+        header (bytes): First bytes of the file
+
+    Returns:
+        Optional[str]: Format name such as "pdf" or "jpeg", "html" for saved web pages,
+            or None if the format is not recognized
+    """
+    for magic, kind in MAGIC_BYTES:
+        if header.startswith(magic):
+            return kind
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header.lstrip()[:1] == b"<":
+        return "html"
+    return None
+
+
+def is_docx(file: IO[bytes]) -> bool:
+    """
+    Check that a ZIP archive is a Word document.
+
+    Only the archive's central directory is read, not its contents.
+
+    Args:
+        file (IO[bytes]): Seekable binary file starting with a ZIP header
+
+    Returns:
+        bool: Whether the archive holds word/document.xml
+    """
+    position = file.tell()
+    try:
+        with zipfile.ZipFile(file) as archive:
+            return "word/document.xml" in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+    finally:
+        file.seek(position)
+
+
+def scan_pdf(file: IO[bytes], size: int, chunk_size: int = UPLOAD_CHUNK_SIZE) -> Dict[str, object]:
+    """
+    Scan a PDF in chunks for its page objects, encryption dictionary and end marker.
+
+    Page objects stored inside compressed object streams are not visible to
+    this scan, so a page count of zero means "unknown" rather than "empty".
+
+    Args:
+        file (IO[bytes]): Seekable PDF file
+        size (int): Size of the file in bytes
+        chunk_size (int, optional): Bytes scanned per read. Defaults to UPLOAD_CHUNK_SIZE.
+
+    Returns:
+        Dict[str, object]: "pages" (int), "encrypted" (bool) and "complete" (bool)
+    """
+    pages = 0
+    encrypted = False
+    complete = False
+    tail = b""
+    offset = 0
+    while offset < size:
+        chunk = read_at(file, offset, chunk_size)
+        if not chunk:
+            break
+        window = tail + chunk
+        # Only count matches ending in the new bytes so overlapping ones are not counted twice
+        pages += sum(1 for match in _PAGE_PATTERN.finditer(window)
+                     if match.end() > len(tail))
+        encrypted = encrypted or _ENCRYPT_PATTERN.search(window) is not None
+        complete = complete or _EOF_MARKER in window
+        tail = window[-_SCAN_OVERLAP:]
+        offset += len(chunk)
+    return {"pages": pages, "encrypted": encrypted, "complete": complete}
+
+
+class Preflight:
+    """
+    Cheap checks run on a document before it is sent to the OCR API.
+
+    Rejects empty and oversized files, files whose content is not a
+    supported document (e.g. HTML error pages saved as .pdf), files whose
+    extension does not match their content, and encrypted, truncated or
+    overly long PDFs. Every rejection is counted by reason.
+    """
+
+    def __init__(self, max_size: int = 20 * 1024 * 1024, max_pdf_pages: int = 50):
+        """
+        Initialize the Preflight.
+
+        Args:
+            max_size (int, optional): Largest accepted document in bytes. Defaults to 20 MB.
+            max_pdf_pages (int, optional): Largest accepted PDF page count. Defaults to 50.
+        """
+        self.max_size = max_size
+        self.max_pdf_pages = max_pdf_pages
+        self.passed = 0
+        self.rejections: Dict[str, int] = {}
+
+    def reject(self, reason: str, status_code: int, detail: str) -> HTTPException:
+        """
+        Count a rejection and build the error returned to the client.
+
+        Args:
+            reason (str): Rejection counter name
+            status_code (int): HTTP status of the error
+            detail (str): Error message for the client
+
+        Returns:
+            HTTPException: The exception to raise
+        """
+        self.rejections[reason] = self.rejections.get(reason, 0) + 1
+        logger.warning(f"Pre-flight rejected document ({reason}): {detail}")
+        return HTTPException(status_code=status_code, detail=detail)
+
+    def check(self, filename: Optional[str], file: IO[bytes], declared: bool = True) -> int:
+        """
+        Validate a document, raising an HTTPException describing the first problem found.
+
+        Args:
+            filename (Optional[str]): Name of the document; its extension is the declared type
+            file (IO[bytes]): Seekable binary file of the document
+            declared (bool, optional): Whether the filename came from the client and should
+                match the content. Defaults to True.
+
+        Returns:
+            int: Size of the document in bytes
+
+        Raises:
+            HTTPException: 400 for empty files, 413 for oversized files, 415 for
+                unsupported or mismatched types, 422 for unusable PDFs
+        """
+        size = file_size(file)
+        if not size:
+            raise self.reject("empty", 400, "Empty file")
+        if size > self.max_size:
+            raise self.reject(
+                "too_large", 413,
+                f"File is {size} bytes; the limit is {self.max_size} bytes")
+
+        kind = sniff_type(read_at(file, 0, 16))
+        if kind == "html":
+            raise self.reject(
+                "html", 415, "File is an HTML page, not a document")
+        if kind is None:
+            raise self.reject(
+                "unsupported_type", 415,
+                f"Unsupported file type; expected one of {', '.join(sorted(set(EXTENSION_TYPES.values())))}")
+
+        extension = os.path.splitext(filename or "")[1].lower()
+        declared_kind = EXTENSION_TYPES.get(extension)
+        if declared and declared_kind and declared_kind != kind:
+            raise self.reject(
+                "type_mismatch", 415,
+                f"File is named {extension} but its content is {kind}")
+
+        if kind == "docx" and not is_docx(file):
+            raise self.reject(
+                "unsupported_type", 415, "ZIP archive is not a Word document")
+
+        if kind == "pdf":
+            pdf = scan_pdf(file, size)
+            if not pdf["complete"]:
+                raise self.reject(
+                    "truncated_pdf", 422, "PDF is truncated (no %EOF marker)")
+            if pdf["encrypted"]:
+                raise self.reject(
+                    "encrypted_pdf", 422, "PDF is password-protected or encrypted")
+            if pdf["pages"] > self.max_pdf_pages:
+                raise self.reject(
+                    "too_many_pages", 422,
+                    f"PDF has {pdf['pages']} pages; the limit is {self.max_pdf_pages}")
+
+        self.passed += 1
+        return size
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return pre-flight counters.
+
+        Returns:
+            Dict[str, object]: Number of documents passed and rejections by reason
+        """
+        return {"passed": self.passed, "rejected": dict(self.rejections)}
+
+
+_preflight = Preflight()
+
+
+def get_preflight() -> Preflight:
+    """
+    Return the process-wide Preflight.
+
+    Returns:
+        Preflight: The shared pre-flight checker
+    """
+    return _preflight
+
+
+def configure_preflight(**kwargs) -> Preflight:
+    """
+    Replace the process-wide Preflight with a newly configured one.
+
+    Args:
+        **kwargs: Keyword arguments forwarded to Preflight
+
+    Returns:
+        Preflight: The new shared pre-flight checker
+    """
+    global _preflight
+    _preflight = Preflight(**kwargs)
+    return _preflight
@@ -1,13 +1,36 @@
+import asyncio
+import hashlib
 import logging
+import time
 from src.utils import ExtractionProcess
+from .result_store import flatten_result, get_result_store
+from .work_ledger import get_work_ledger
 logger = logging.getLogger(__name__)
 
-FIELD_ARGS = 'No Attachment'
+# Pipeline stages, in order, and the workers each runs by default
+STAGES = ("download", "extract", "drive", "update")
+DEFAULT_CONCURRENCY = {"download": 4, "extract": 4, "drive": 2, "update": 2}
+
+# Marks the end of a stage's input queue
+_DONE = object()
+
+_last_sweep = {}
+
+
+def get_sweep_stats():
+    """
+    Return the counters of the last finished Airtable sweep.
+
+    Returns:
+        dict: Records read, documents processed, skipped, resumed and failed, duration, throughput and per-stage counters
+    """
+    return dict(_last_sweep)
 
 
 class ProcessAirtable:
 
-    def __init__(self,  constant_column, document_requirements, extractor_map, constant_column_extracted, header, airtableClass, detail):
+    def __init__(self,  constant_column, document_requirements, extractor_map, constant_column_extracted, header, airtableClass, detail,
+                 concurrency=None, queue_size=8):
         """
         Initialize the ProcessAirtable class with required parameters.
 
@@ -18,7 +41,11 @@ class ProcessAirtable:
             constant_column_extracted (dict): Dictionary mapping document types to their extracted column names
             header (dict): Headers for API requests
             airtableClass (UpdateAirtable): Instance of the UpdateAirtable class for interacting with Airtable
-            detail (list): List of records to process from Airtable
+            detail (list | AsyncIterable): Records to process from Airtable, either a list or an
+                async iterable such as AirtableExtractor.iter_records() consumed lazily
+            concurrency (dict, optional): Workers per stage ("download", "extract", "drive",
+                "update"), merged over DEFAULT_CONCURRENCY. Defaults to None.
+            queue_size (int, optional): Work items buffered between two stages. Defaults to 8.
         """
         self.header = header
         self.airtableClass = airtableClass
@@ -27,65 +54,279 @@ class ProcessAirtable:
         self.document_requirements = document_requirements
         self.extractor_map = extractor_map
         self.constant_column_extracted = constant_column_extracted
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.queue_size = queue_size
+        self.ledger = get_work_ledger()
+        # Counters of the last sweep this instance ran
+        self.sweep_stats = {}
+        # Work items whose Airtable update is queued, confirmed after the flush
+        self._queued_updates = []
+        # Imported here because the mapper imports the extractors, which import this package
+        from ..mapper.work_planner import WorkPlanner, build_work_index
+        self.planner = WorkPlanner(build_work_index(
+            constant_column, constant_column_extracted, document_requirements, extractor_map))
+
+    async def _iter_detail(self):
+        """
+        Yield the records to process, whether detail is a list or an async iterable.
+
+        Returns:
+            AsyncIterator[dict]: Airtable records
+        """
+        if hasattr(self.detail, "__aiter__"):
+            async for items in self.detail:
+                yield items
+        else:
+            for items in self.detail:
+                yield items
+
+    @staticmethod
+    def _attachment_id(work):
+        """Airtable attachment id of a work item, its URL if Airtable sent none"""
+        return work.attachment.get("id") or work.attachment.get("url", "")
+
+    async def _record_stage(self, task, stage, **values):
+        """Record in the ledger that a work item completed a stage"""
+        if self.ledger is None:
+            return
+        work = task["work"]
+        await asyncio.to_thread(
+            self.ledger.record, work.record_id, self._attachment_id(work), task["hash"],
+            work.doc_method, stage, **values)
+
+    async def _resume(self, work):
+        """
+        Find the stage a work item starts at from the ledger.
+
+        Args:
+            work (WorkItem): Planned work item
+
+        Returns:
+            tuple | None: (stage index, task) to enqueue, or None if the item is already done
+        """
+        task = {"work": work}
+        if self.ledger is None:
+            return 0, task
+        entry = await asyncio.to_thread(
+            self.ledger.latest, work.record_id, self._attachment_id(work), work.doc_method)
+        # Downloaded bytes are not kept, so an item that only got that far starts over
+        if entry is None or entry["stage"] == "download" or (
+                entry["stage"] == "extract" and entry["output"] is None):
+            return 0, task
+        if entry["stage"] == STAGES[-1]:
+            return None
+        task.update(hash=entry["attachment_hash"], file_bytes=entry["output"],
+                    extracted_data=entry["extracted"], file_id=entry["file_id"])
+        return STAGES.index(entry["stage"]) + 1, task
+
+    async def _download(self, task):
+        """Download the attachment of a work item from Airtable"""
+        file_data = await self.airtableClass.download_file(task["work"].attachment.get("url", ""))
+        if file_data is None:
+            raise ValueError("Attachment download failed")
+        task["file_data"] = file_data
+        task["hash"] = hashlib.sha256(file_data).hexdigest()
+        await self._record_stage(task, "download")
+
+    async def _extract(self, task):
+        """Run the work item's extractor on the downloaded attachment"""
+        extractor = ExtractionProcess(
+            task["work"].extractor_class, task.pop("file_data"), self.header)
+        result_excel = await extractor.proccess_extraction()
+        if result_excel.status_code != 200:
+            raise ValueError(
+                f"Extraction failed: {result_excel.body.decode('utf-8', 'replace')}")
+        task["file_bytes"] = result_excel.body
+        task["extracted_data"] = extractor.extracted_data
+        await self._record_stage(task, "extract", output=task["file_bytes"],
+                                 extracted=task["extracted_data"])
+
+    async def _upload(self, task):
+        """Send the generated workbook to Google Drive"""
+        work = task["work"]
+        google_response = await self.airtableClass.send_to_google_drive(
+            task.pop("file_bytes"), f"{work.candidate}_{work.attachment.get('filename', '')}")
+        task["file_id"] = google_response.get("file_id")
+        await self._record_stage(task, "drive", file_id=task["file_id"])
+
+    async def _update(self, task):
+        """Queue the Airtable update and keep the structured result for exports"""
+        work = task["work"]
+        task["air_update"] = await self.airtableClass.update(
+            task["file_id"], work.record_id, work.target_column)
+        self._queued_updates.append(task)
+        store = get_result_store()
+        if store and task["extracted_data"] is not None:
+            await asyncio.to_thread(
+                store.save, work.record_id, work.upload_column, work.candidate,
+                flatten_result(task["extracted_data"]))
+
+    async def _run_stage(self, name, handler, inbox, outbox, response_list, counters):
+        """
+        Run one worker of a stage until its input queue is closed.
+
+        A failing work item is reported in response_list and dropped; the
+        worker moves on to the next one.
+
+        Args:
+            name (str): Stage name
+            handler: Coroutine function processing one work item
+            inbox (asyncio.Queue): Work items coming from the previous stage
+            outbox (asyncio.Queue | None): Queue of the next stage, None for the last stage
+            response_list (list): Status of every finished or failed work item
+            counters (dict): Per-stage counters updated in place
+        """
+        while True:
+            task = await inbox.get()
+            if task is _DONE:
+                return
+            work = task["work"]
+            started = time.perf_counter()
+            try:
+                await handler(task)
+            except Exception as e:
+                counters[name]["failed"] += 1
+                logger.error(
+                    f"Sweep {name} failed for {work.record_id} ({work.upload_column}): {str(e)}")
+                response_list.append({
+                    "status": "failed",
+                    "name": work.candidate,
+                    "id": work.record_id,
+                    "stage": name,
+                    "error": str(e)
+                })
+                continue
+            finally:
+                counters[name]["busy_seconds"] += time.perf_counter() - started
+            counters[name]["processed"] += 1
+            # Items leaving the last stage are reported once their update is flushed
+            if outbox is not None:
+                await outbox.put(task)
+
+    async def _run_workers(self, name, handler, inbox, outbox, response_list, counters):
+        """
+        Run the workers of a stage, then close the next stage's queue.
+
+        Args:
+            name (str): Stage name
+            handler: Coroutine function processing one work item
+            inbox (asyncio.Queue): Work items coming from the previous stage
+            outbox (asyncio.Queue | None): Queue of the next stage, None for the last stage
+            response_list (list): Status of every finished or failed work item
+            counters (dict): Per-stage counters updated in place
+        """
+        await asyncio.gather(*(
+            self._run_stage(name, handler, inbox, outbox, response_list, counters)
+            for _ in range(self.concurrency[name])))
+        if outbox is not None:
+            for _ in range(self.concurrency[STAGES[STAGES.index(name) + 1]]):
+                await outbox.put(_DONE)
 
     async def process_airtable(self):
         """
         Process Airtable records, download attachments, extract data, and update Airtable with Google Drive links.
 
-        This method iterates through records in the detail list, finds attachments that need processing,
-        applies the appropriate extractor, saves the results to Google Drive, and updates the Airtable record.
+        The records in detail are planned into work items with the mapper's WorkPlanner.
+        Each item then flows through four stages: download, extract, Drive upload and
+        Airtable update. Bounded queues sit between the stages, and every stage runs its
+        own number of workers, so downloads, OCR, uploads and updates overlap. A failure
+        only drops the work item it happened to; an error while reading the records stops
+        the sweep after the items already planned are finished.
+
+        With a WorkLedger configured, every completed stage is recorded. An item
+        whose Airtable update was confirmed by an earlier sweep is skipped, and one
+        that stopped after extraction or upload resumes at the next stage, so the
+        OCR API and Google Drive are not called twice for the same attachment.
+
+        The sweep's counters are kept in sweep_stats; get_sweep_stats returns those
+        of whichever sweep finished last.
 
         Returns:
             list: List of dictionaries containing the status and update information for each processed record
         """
         response_list = []
-        # object inside []
-        for items in self.detail:
-            # check inside of field {}
-            field = items.get("fields", {})
-            # check key and value inside of field {}
-            for fieldkey, fieldvalue in field.items():
-                # check if key is in CONSTANT_COLUMN dictionary
-                for constcolumnkey, constcolumnvalue in self.constant_column.items():
-                    # check value inside of CONSTANT_COLUMN dictionary
-                    if constcolumnkey == fieldkey:
-                        # check if key is equal to fieldkey
-                        if fieldvalue == FIELD_ARGS and constcolumnvalue in field:
-                            # url is inside of field attachemt fielditem.get("url", "")
-                            for fielditem in field.get(constcolumnvalue, []):
-                                # check if key is in DOCUMENT_REQUIREMENTS dictionary
-                                for doc_method, doc_type in self.document_requirements.items():
-                                    # check if constcolumnvalue in doc_type sample: "Birth Certificate" in ["Birth Certificate"]
-                                    if constcolumnvalue in doc_type:
-                                        # check if key is in DOCUMENT_REQUIREMENTS dictionary
-                                        extractor_class = self.extractor_map.get(
-                                            doc_method)
-                                        # if class is existing in EXTRACTOR_MAP
-                                        if extractor_class:
-                                            # download file from airtable
-                                            file_data = await self.airtableClass.download_file(fielditem.get("url", ""))
-                                            # process the file
-                                            extractor = ExtractionProcess(
-                                                extractor_class, file_data, self.header)
-                                            # get the result
-                                            result_excel = await extractor.proccess_extraction()
-                                            # get the file bytes
-                                            file_bytes = result_excel.body
-                                            # send the file to google drive
-                                            google_response = await self.airtableClass.send_to_google_drive(
-                                                file_bytes, f"{field.get("Name")}_{fielditem.get('filename', '')}")
-                                            file_id = google_response.get(
-                                                "file_id")
-                                            # update airtable
-                                            column_change = self.constant_column_extracted.get(
-                                                constcolumnvalue)
-                                            # update airtable
-                                            air_update = self.airtableClass.update(
-                                                file_id, items.get("id"), column_change)
-                                            # append the status
-                                            response_list.append({
-                                                "status": "success",
-                                                "name": field.get("Name"),
-                                                "airtable_update": air_update
-                                            })
+        self._queued_updates = []
+        handlers = {"download": self._download, "extract": self._extract,
+                    "drive": self._upload, "update": self._update}
+        counters = {name: {"processed": 0, "failed": 0, "busy_seconds": 0.0}
+                    for name in STAGES}
+        queues = [asyncio.Queue(self.queue_size) for _ in STAGES]
+        stage_tasks = [
+            asyncio.create_task(self._run_workers(
+                name, handlers[name], queues[index],
+                queues[index + 1] if index + 1 < len(STAGES) else None,
+                response_list, counters))
+            for index, name in enumerate(STAGES)]
+        started = time.perf_counter()
+        records = 0
+        planned = 0
+        skipped = 0
+        resumed = 0
+
+        try:
+            try:
+                # object inside []
+                async for items in self._iter_detail():
+                    records += 1
+                    # attachments still to extract, with their extractor and target column
+                    for work in self.planner.plan(items):
+                        planned += 1
+                        start = await self._resume(work)
+                        if start is None:
+                            skipped += 1
+                            continue
+                        stage_index, task = start
+                        resumed += stage_index > 0
+                        await queues[stage_index].put(task)
+            except Exception as e:
+                logger.error(f"Reading Airtable records failed: {str(e)}")
+                response_list.append(
+                    {"status": "failed", "stage": "fetch", "error": str(e)})
+            for _ in range(self.concurrency[STAGES[0]]):
+                await queues[0].put(_DONE)
+            await asyncio.gather(*stage_tasks)
+        finally:
+            for task in stage_tasks:
+                task.cancel()
+
+        # send the updates still queued, then report each one as confirmed or rejected
+        rejected = await self.airtableClass.flush()
+        rejected_errors = {failed["id"]: failed["error"] for failed in rejected}
+        for task in self._queued_updates:
+            work = task["work"]
+            if work.record_id in rejected_errors:
+                response_list.append({
+                    "status": "failed",
+                    "name": work.candidate,
+                    "id": work.record_id,
+                    "stage": "update",
+                    "error": rejected_errors[work.record_id]
+                })
+                continue
+            await self._record_stage(task, "update")
+            response_list.append({
+                "status": "success",
+                "name": work.candidate,
+                "airtable_update": task["air_update"]
+            })
+
+        elapsed = time.perf_counter() - started
+        succeeded = counters[STAGES[-1]]["processed"] - len(
+            [task for task in self._queued_updates if task["work"].record_id in rejected_errors])
+        self.sweep_stats = {
+            "records": records,
+            "planned": planned,
+            "skipped": skipped,
+            "resumed": resumed,
+            "succeeded": succeeded,
+            "failed": planned - skipped - succeeded,
+            "seconds": round(elapsed, 3),
+            "documents_per_minute": round(succeeded * 60 / elapsed, 1) if elapsed and succeeded else 0.0,
+            "stages": {name: {**counter, "busy_seconds": round(counter["busy_seconds"], 3)}
+                       for name, counter in counters.items()},
+        }
+        _last_sweep.clear()
+        _last_sweep.update(self.sweep_stats)
+        logger.info(
+            f"Sweep finished: {succeeded}/{planned} documents in {elapsed:.1f}s")
         return response_list
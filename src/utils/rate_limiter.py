@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Requests per second and burst size allowed by each provider, per scope
+DEFAULT_LIMITS: Dict[str, Dict[str, float]] = {
+    # Airtable allows 5 requests per second per base
+    "airtable": {"rate": 5, "burst": 5},
+    # Attachment downloads from Airtable's content servers
+    "airtable_content": {"rate": 10, "burst": 10},
+    # Google Drive uploads of one service account
+    "drive": {"rate": 10, "burst": 10},
+}
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the request rate of one provider scope.
+
+    Callers reserve a token before each request and sleep until it is
+    available, so bursts are spread out instead of being rejected. When the
+    provider answers 429 the rate is halved and the bucket pauses for the
+    Retry-After delay; every successful response then restores a tenth of
+    the configured rate until it is reached again.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, min_rate: Optional[float] = None):
+        """
+        Initialize the TokenBucket with a full bucket.
+
+        Args:
+            name (str): Scope name, used in logs and metrics
+            rate (float): Requests per second
+            burst (float): Requests allowed back to back
+            min_rate (Optional[float], optional): Lowest rate adaptive slowdown may reach.
+                Defaults to a tenth of rate.
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.current_rate = rate
+        self._tokens = burst
+        # Time up to which tokens were accounted; in the future while paused
+        self._updated = time.monotonic()
+        self._counters = {"acquired": 0, "waited": 0,
+                          "wait_seconds": 0.0, "throttled": 0}
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens +
+                               (now - self._updated) * self.current_rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt when none is left.
+
+        Returns:
+            float: Seconds the caller must wait before sending its request
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens -= 1
+        self._counters["acquired"] += 1
+        wait = max(0.0, self._updated - now)
+        if self._tokens < 0:
+            wait += -self._tokens / self.current_rate
+        return wait
+
+    async def acquire(self) -> float:
+        """
+        Wait until a request may be sent.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        wait = self.reserve()
+        if wait > 0:
+            self._counters["waited"] += 1
+            self._counters["wait_seconds"] += wait
+            await asyncio.sleep(wait)
+        return wait
+
+    def observe(self, status_code: int, retry_after: Optional[float] = None) -> None:
+        """
+        Adapt the rate to the provider's response.
+
+        Args:
+            status_code (int): HTTP status of the response
+            retry_after (Optional[float], optional): Seconds from the Retry-After header. Defaults to None.
+        """
+        if status_code == 429:
+            self.throttle(retry_after)
+        elif status_code < 500 and self.current_rate < self.rate:
+            self.current_rate = min(
+                self.rate, self.current_rate + self.rate / 10)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Slow down after the provider rejected a request for exceeding its limit.
+
+        Args:
+            retry_after (Optional[float], optional): Seconds the provider asked to wait.
+                Defaults to one token interval at the reduced rate.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self._counters["throttled"] += 1
+        self.current_rate = max(self.min_rate, self.current_rate / 2)
+        pause = retry_after if retry_after is not None else 1 / self.current_rate
+        self._tokens = min(self._tokens, 0)
+        self._updated = max(self._updated, now + pause)
+        logger.warning(
+            f"Rate limited by {self.name}; slowing to {self.current_rate:.2f} req/s for {pause:.2f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the bucket's configuration and counters.
+
+        Returns:
+            Dict[str, Any]: Configured and current rate, requests acquired, requests that
+                waited, total seconds waited and 429 responses seen
+        """
+        return {
+            "rate": self.rate,
+            "current_rate": round(self.current_rate, 3),
+            **{key: round(value, 3) if isinstance(value, float) else value
+               for key, value in self._counters.items()},
+        }
+
+
+class RateLimiterRegistry:
+    """
+    Token buckets shared by every call site in the process, one per scope.
+
+    A scope is "<provider>" or "<provider>:<quota>" (e.g. "airtable:appXYZ"
+    for one Airtable base); every scope of a provider gets its own bucket
+    with the provider's limits.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Initialize the RateLimiterRegistry.
+
+        Args:
+            limits (Optional[Dict[str, Dict[str, float]]], optional): TokenBucket keyword
+                arguments per provider, merged over DEFAULT_LIMITS. Defaults to None.
+        """
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def get(self, scope: str) -> Optional[TokenBucket]:
+        """
+        Return the bucket of a scope, creating it on first use.
+
+        Args:
+            scope (str): Scope name
+
+        Returns:
+            Optional[TokenBucket]: The bucket, or None if the provider is not rate limited
+        """
+        bucket = self._buckets.get(scope)
+        if bucket is None:
+            limits = self.limits.get(scope.split(":", 1)[0])
+            if limits is None:
+                return None
+            bucket = self._buckets[scope] = TokenBucket(scope, **limits)
+        return bucket
+
+    async def acquire(self, scope: str) -> float:
+        """
+        Wait until a request of the scope may be sent.
+
+        Args:
+            scope (str): Scope name
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        bucket = self.get(scope)
+        return await bucket.acquire() if bucket else 0.0
+
+    def observe(self, scope: str, status_code: int, retry_after: Optional[float] = None) -> None:
+        """
+        Report the response of a request of the scope.
+
+        Args:
+            scope (str): Scope name
+            status_code (int): HTTP status of the response
+            retry_after (Optional[float], optional): Seconds from the Retry-After header. Defaults to None.
+        """
+        bucket = self.get(scope)
+        if bucket:
+            bucket.observe(status_code, retry_after)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the counters of every bucket.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Bucket stats keyed by scope
+        """
+        return {scope: bucket.stats() for scope, bucket in self._buckets.items()}
+
+
+_rate_limiters = RateLimiterRegistry()
+
+
+def get_rate_limiters() -> RateLimiterRegistry:
+    """
+    Return the process-wide RateLimiterRegistry.
+
+    Returns:
+        RateLimiterRegistry: The shared rate limiters
+    """
+    return _rate_limiters
+
+
+def configure_rate_limits(limits: Optional[Dict[str, Dict[str, float]]] = None) -> RateLimiterRegistry:
+    """
+    Replace the process-wide RateLimiterRegistry.
+
+    Args:
+        limits (Optional[Dict[str, Dict[str, float]]], optional): TokenBucket keyword
+            arguments per provider, merged over DEFAULT_LIMITS. Defaults to None.
+
+    Returns:
+        RateLimiterRegistry: The new shared rate limiters
+    """
+    global _rate_limiters
+    _rate_limiters = RateLimiterRegistry(limits)
+    return _rate_limiters
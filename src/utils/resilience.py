@@ -0,0 +1,287 @@
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+
+    Args:
+        value (Optional[str]): Raw header value
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for transient API failures"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 10,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504)):
+        """
+        Initialize the RetryPolicy.
+
+        Args:
+            max_attempts (int, optional): Total attempts including the first one. Defaults to 3.
+            base_delay (float, optional): Backoff ceiling of the first retry in seconds. Defaults to 0.5.
+            max_delay (float, optional): Longest wait between attempts in seconds; a
+                Retry-After beyond this stops retrying. Defaults to 10.
+            retry_statuses (Iterable[int], optional): HTTP statuses treated as transient.
+                Defaults to (429, 500, 502, 503, 504).
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retries = 0
+        self.gave_up = 0
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """
+        Tell whether an HTTP status is worth retrying.
+
+        Args:
+            status_code (int): HTTP status code of the response
+
+        Returns:
+            bool: True for transient statuses such as 429 and 5xx
+        """
+        return status_code in self.retry_statuses
+
+    def next_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Compute how long to wait before the next attempt.
+
+        Uses "full jitter" backoff: a random delay between zero and the
+        exponential ceiling, which spreads retries from concurrent callers.
+        A Retry-After value from the server is honored as a lower bound.
+
+        Args:
+            attempt (int): Zero-based index of the attempt that just failed
+            retry_after (Optional[float], optional): Seconds requested by the server. Defaults to None.
+
+        Returns:
+            Optional[float]: Seconds to wait, or None when no further attempt should be made
+        """
+        if attempt + 1 >= self.max_attempts or (retry_after is not None and retry_after > self.max_delay):
+            self.gave_up += 1
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.retries += 1
+        return delay
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return retry counters.
+
+        Returns:
+            Dict[str, int]: Number of retries scheduled and of requests that exhausted their retries
+        """
+        return {"retries": self.retries, "gave_up": self.gave_up}
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    Closed: requests flow and consecutive failures are counted.
+    Open: requests fail fast until recovery_timeout has elapsed.
+    Half-open: a limited number of probe requests decide whether to close
+    the circuit again or re-open it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30,
+                 half_open_max_calls: int = 1):
+        """
+        Initialize the CircuitBreaker in the closed state.
+
+        Args:
+            name (str): Endpoint the breaker protects
+            failure_threshold (int, optional): Consecutive failures that open the circuit. Defaults to 5.
+            recovery_timeout (float, optional): Seconds to stay open before probing. Defaults to 30.
+            half_open_max_calls (int, optional): Concurrent probes allowed while half-open. Defaults to 1.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._half_open_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def allow_request(self) -> bool:
+        """
+        Decide whether a request may be sent now.
+
+        Returns:
+            bool: False while the circuit is open or the half-open probe slots are taken
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"Circuit for {self.name} half-open, probing")
+
+        if self.state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                self.rejected += 1
+                return False
+            self._half_open_calls += 1
+        return True
+
+    def record_success(self) -> None:
+        """
+        Record a successful call, closing the circuit if it was probing.
+        """
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._half_open_calls = 0
+
+    def release(self) -> None:
+        """
+        Give back the probe slot of a call that ended without an outcome.
+
+        A probe that is cancelled, or fails before the API answered, says
+        nothing about the API's health; without this the half-open circuit
+        would keep its slot taken and reject every later request.
+        """
+        if self.state == self.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_failure(self) -> None:
+        """
+        Record a failed call, opening the circuit when the threshold is reached.
+        """
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+                logger.warning(
+                    f"Circuit for {self.name} opened after {self.consecutive_failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the breaker state for monitoring.
+
+        Returns:
+            Dict[str, Any]: State, failure count, rejections and seconds until the next probe
+        """
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = round(max(0.0, self.recovery_timeout -
+                                 (time.monotonic() - self.opened_at)), 2)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in": retry_in,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Holds one CircuitBreaker per endpoint"""
+
+    def __init__(self, **breaker_kwargs):
+        """
+        Initialize the CircuitBreakerRegistry.
+
+        Args:
+            **breaker_kwargs: Keyword arguments used for every CircuitBreaker created
+        """
+        self.breaker_kwargs = breaker_kwargs
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        """
+        Return the breaker for an endpoint, creating it on first use.
+
+        Args:
+            name (str): Endpoint identifier
+
+        Returns:
+            CircuitBreaker: The endpoint's breaker
+        """
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **self.breaker_kwargs)
+            self._breakers[name] = breaker
+        return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the state of every breaker.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Breaker snapshots keyed by endpoint
+        """
+        return {name: breaker.snapshot() for name, breaker in self._breakers.items()}
+
+
+_retry_policy = RetryPolicy()
+_breakers = CircuitBreakerRegistry()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    Return the process-wide RetryPolicy.
+
+    Returns:
+        RetryPolicy: The shared retry policy
+    """
+    return _retry_policy
+
+
+def get_breaker_registry() -> CircuitBreakerRegistry:
+    """
+    Return the process-wide CircuitBreakerRegistry.
+
+    Returns:
+        CircuitBreakerRegistry: The shared breaker registry
+    """
+    return _breakers
+
+
+def configure_resilience(retry: Optional[Dict[str, Any]] = None,
+                         breaker: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Replace the process-wide retry policy and breaker registry.
+
+    Args:
+        retry (Optional[Dict[str, Any]], optional): Keyword arguments for RetryPolicy. Defaults to None.
+        breaker (Optional[Dict[str, Any]], optional): Keyword arguments for CircuitBreaker. Defaults to None.
+    """
+    global _retry_policy, _breakers
+    _retry_policy = RetryPolicy(**(retry or {}))
+    _breakers = CircuitBreakerRegistry(**(breaker or {}))
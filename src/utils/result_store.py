@@ -0,0 +1,193 @@
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def flatten_result(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten an extractor's structured data into a single row.
+
+    Dict sections contribute their keys as columns, plain values become a
+    column named after their section, and lists are joined with "; " (one
+    column per key for lists of records, e.g. work experience or IDs).
+
+    Args:
+        data (Dict[str, Any]): Structured data returned by an extractor
+
+    Returns:
+        Dict[str, Any]: Column name to cell value
+    """
+    row: Dict[str, Any] = {}
+    for section, value in (data or {}).items():
+        if isinstance(value, dict):
+            row.update(value)
+        elif isinstance(value, list):
+            if any(isinstance(item, dict) for item in value):
+                columns: Dict[str, List[str]] = {}
+                for item in value:
+                    if isinstance(item, dict):
+                        for key, item_value in item.items():
+                            columns.setdefault(key, []).append(str(item_value))
+                row.update({key: "; ".join(values)
+                           for key, values in columns.items()})
+            else:
+                row[section] = "; ".join(str(item) for item in value)
+        else:
+            row[section] = value
+    return row
+
+
+class ResultStore:
+    """
+    SQLite store of the latest extraction result of every Airtable document.
+
+    One flattened row is kept per (record, document column), along with the
+    ordered set of columns seen for each document, so exports can write
+    their header before reading any row.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the ResultStore.
+
+        Args:
+            db_path (str): Path of the SQLite database
+        """
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the result database.
+
+        Returns:
+            sqlite3.Connection: A new connection in autocommit mode
+        """
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def _init_db(self) -> None:
+        """
+        Create the result tables if they do not exist yet.
+        """
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "record_id TEXT NOT NULL, document TEXT NOT NULL, candidate TEXT, "
+                "data TEXT NOT NULL, updated REAL NOT NULL, "
+                "PRIMARY KEY (record_id, document))")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS result_columns ("
+                "document TEXT NOT NULL, name TEXT NOT NULL, position INTEGER NOT NULL, "
+                "PRIMARY KEY (document, name))")
+
+    def save(self, record_id: str, document: str, candidate: Optional[str],
+             row: Dict[str, Any]) -> None:
+        """
+        Store the result of one document, replacing any earlier one.
+
+        Args:
+            record_id (str): Airtable record id
+            document (str): Airtable attachment column the document came from
+            candidate (Optional[str]): Candidate name
+            row (Dict[str, Any]): Flattened result, see flatten_result
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO results (record_id, document, candidate, data, updated) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (record_id, document, candidate, json.dumps(row, default=str), time.time()))
+            position = conn.execute(
+                "SELECT COUNT(*) FROM result_columns WHERE document = ?", (document,)).fetchone()[0]
+            for name in row:
+                position += conn.execute(
+                    "INSERT OR IGNORE INTO result_columns (document, name, position) VALUES (?, ?, ?)",
+                    (document, name, position)).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def columns(self, document: str) -> List[str]:
+        """
+        Return every column seen for a document, in first-seen order.
+
+        Args:
+            document (str): Airtable attachment column
+
+        Returns:
+            List[str]: Column names
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT name FROM result_columns WHERE document = ? ORDER BY position",
+                (document,)).fetchall()
+        return [name for (name,) in rows]
+
+    def fetch(self, record_ids: Iterable[str]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Load the results of a batch of records.
+
+        Args:
+            record_ids (Iterable[str]): Airtable record ids, e.g. one page of the table
+
+        Returns:
+            Dict[Tuple[str, str], Dict[str, Any]]: Flattened rows keyed by (record id, document)
+        """
+        record_ids = list(record_ids)
+        if not record_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in record_ids)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT record_id, document, data FROM results WHERE record_id IN ({placeholders})",
+                record_ids).fetchall()
+        return {(record_id, document): json.loads(data) for record_id, document, data in rows}
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of stored results per document.
+
+        Returns:
+            Dict[str, int]: Result count keyed by document column
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT document, COUNT(*) FROM results GROUP BY document").fetchall()
+        return dict(rows)
+
+
+_store: Optional[ResultStore] = None
+
+
+def get_result_store() -> Optional[ResultStore]:
+    """
+    Return the process-wide ResultStore.
+
+    Returns:
+        Optional[ResultStore]: The shared store, or None if results are not recorded
+    """
+    return _store
+
+
+def configure_result_store(db_path: str) -> ResultStore:
+    """
+    Replace the process-wide ResultStore.
+
+    Args:
+        db_path (str): Path of the SQLite database
+
+    Returns:
+        ResultStore: The new shared store
+    """
+    global _store
+    _store = ResultStore(db_path)
+    return _store
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight call.
+
+    The first caller for a key (the leader) starts the call as its own task;
+    every caller that arrives while it is running attaches to the same task.
+    Waiters are shielded from the shared task, so a cancelled waiter stops
+    waiting without cancelling the call the others depend on. A failure is
+    raised to every waiter.
+    """
+
+    def __init__(self):
+        """
+        Initialize the SingleFlight with no calls in flight.
+        """
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._counters = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn for key, or join the call already in flight for key.
+
+        Args:
+            key (str): Identity of the call, e.g. an OCR cache key
+            fn (Callable[[], Awaitable[Any]]): Coroutine factory executed by the leader
+
+        Returns:
+            Any: The result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(
+                lambda finished: self._on_done(key, finished))
+            self._counters["leaders"] += 1
+        else:
+            self._counters["coalesced"] += 1
+            logger.info(f"Joining in-flight call for {key}")
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        """
+        Forget a finished call so the next caller starts a fresh one.
+
+        Args:
+            key (str): Identity of the call
+            task (asyncio.Task): The finished shared task
+        """
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return counters describing how many calls were coalesced.
+
+        Returns:
+            Dict[str, int]: Leader and coalesced call counts plus calls in flight
+        """
+        return {**self._counters, "in_flight": len(self._calls)}
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Return the process-wide SingleFlight.
+
+    Returns:
+        SingleFlight: The shared coalescer
+    """
+    return _single_flight
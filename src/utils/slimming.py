@@ -0,0 +1,263 @@
+import io
+import logging
+import math
+import os
+from typing import IO, Dict, Optional, Sequence, Tuple, Union
+
+from .http_client import file_size, read_at
+from .preflight import sniff_type
+
+logger = logging.getLogger(__name__)
+
+# Slimming is optional: without Pillow or pypdf, documents of that kind are sent as-is
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    PdfReader = PdfWriter = None
+
+
+class SlimmingProfile:
+    """
+    How an extractor's documents are slimmed before upload.
+
+    Images are downscaled to the target DPI or pixel budget, whichever is
+    smaller, and re-encoded as JPEG without metadata. PDFs are reduced to
+    the configured pages.
+    """
+
+    def __init__(self, max_pixels: Optional[int] = 2_000_000, target_dpi: Optional[int] = 200,
+                 jpeg_quality: int = 85, pages: Optional[Sequence[int]] = None):
+        """
+        Initialize the SlimmingProfile.
+
+        Args:
+            max_pixels (Optional[int], optional): Largest pixel count kept. Defaults to 2,000,000.
+            target_dpi (Optional[int], optional): Resolution kept for images declaring their DPI.
+                Defaults to 200.
+            jpeg_quality (int, optional): JPEG quality of re-encoded images. Defaults to 85.
+            pages (Optional[Sequence[int]], optional): Zero-based PDF pages kept; None keeps
+                every page. Defaults to None.
+        """
+        self.max_pixels = max_pixels
+        self.target_dpi = target_dpi
+        self.jpeg_quality = jpeg_quality
+        self.pages = tuple(pages) if pages is not None else None
+
+    def scale_for(self, size: Tuple[int, int], dpi: Optional[Tuple[float, float]] = None) -> float:
+        """
+        Return the factor an image of the given size should be scaled by.
+
+        Args:
+            size (Tuple[int, int]): Width and height in pixels
+            dpi (Optional[Tuple[float, float]], optional): Resolution declared by the image. Defaults to None.
+
+        Returns:
+            float: Scale factor, never above 1
+        """
+        scale = 1.0
+        if self.max_pixels and size[0] * size[1] > self.max_pixels:
+            scale = math.sqrt(self.max_pixels / (size[0] * size[1]))
+        if self.target_dpi and dpi and dpi[0] and dpi[0] > self.target_dpi:
+            scale = min(scale, self.target_dpi / float(dpi[0]))
+        return scale
+
+
+def _slim_image(source: IO[bytes], profile: SlimmingProfile) -> bytes:
+    """
+    Downscale an image and re-encode it as a metadata-free JPEG.
+
+    Args:
+        source (IO[bytes]): Original image, read from its start
+        profile (SlimmingProfile): Slimming settings
+
+    Returns:
+        bytes: The re-encoded JPEG
+    """
+    with Image.open(source) as original:
+        dpi = original.info.get("dpi")
+        # Apply the EXIF orientation before the EXIF block is dropped
+        image = ImageOps.exif_transpose(original)
+        scale = profile.scale_for(image.size, dpi)
+        if scale < 1:
+            image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))),
+                                 Image.LANCZOS)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        output = io.BytesIO()
+        image.save(output, "JPEG", quality=profile.jpeg_quality, optimize=True)
+        return output.getvalue()
+
+
+def _slim_pdf(source: IO[bytes], profile: SlimmingProfile) -> Optional[bytes]:
+    """
+    Keep only the configured pages of a PDF, dropping its document metadata.
+
+    Args:
+        source (IO[bytes]): Original PDF
+        profile (SlimmingProfile): Slimming settings
+
+    Returns:
+        Optional[bytes]: The reduced PDF, or None if every page is kept anyway
+    """
+    if profile.pages is None:
+        return None
+    reader = PdfReader(source)
+    if reader.is_encrypted:
+        return None
+    pages = [index for index in profile.pages if index < len(reader.pages)]
+    if not pages or len(pages) == len(reader.pages):
+        return None
+
+    writer = PdfWriter()
+    for index in pages:
+        writer.add_page(reader.pages[index])
+    writer.compress_identical_objects()
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def slim_document(filename: str, content: Union[bytes, IO[bytes]],
+                  profile: SlimmingProfile) -> Optional[Tuple[str, bytes, str]]:
+    """
+    Produce a smaller version of a document for upload.
+
+    A file is read in place by Pillow or pypdf rather than copied into
+    memory first, so only the slimmed output is held as bytes.
+
+    Args:
+        filename (str): Name of the document
+        content (Union[bytes, IO[bytes]]): The document as bytes or a seekable file
+        profile (SlimmingProfile): Slimming settings
+
+    Returns:
+        Optional[Tuple[str, bytes, str]]: Filename, content and content type of the slimmed
+            document, or None when it cannot be made smaller or the library
+            slimming its kind is not installed
+    """
+    if isinstance(content, (bytes, bytearray)):
+        size = len(content)
+        kind = sniff_type(bytes(content[:16]))
+        source = io.BytesIO(content)
+    else:
+        size = file_size(content)
+        kind = sniff_type(read_at(content, 0, 16))
+        source = content
+        source.seek(0)
+    try:
+        if kind == "pdf":
+            if PdfReader is None:
+                return None
+            slimmed = _slim_pdf(source, profile)
+            content_type = "application/pdf"
+        elif kind in ("jpeg", "png", "tiff", "bmp", "webp"):
+            if Image is None:
+                return None
+            slimmed = _slim_image(source, profile)
+            content_type = "image/jpeg"
+            filename = f"{os.path.splitext(filename)[0]}.jpg"
+        else:
+            return None
+    except Exception as e:
+        logger.warning(f"Could not slim {filename}: {str(e)}")
+        return None
+
+    if slimmed is None or len(slimmed) >= size:
+        return None
+    return filename, slimmed, content_type
+
+
+class SlimmingStats:
+    """
+    Per document type counters of bytes and time saved by slimming.
+
+    Bytes and slimming time count every document slimming was tried on.
+    Document counts and API latency only count documents the API answered,
+    so the latency averages divide by the requests they were measured on.
+    """
+
+    def __init__(self):
+        """
+        Initialize empty SlimmingStats.
+        """
+        self._types: Dict[str, Dict[str, float]] = {}
+
+    def _entry(self, doc_type: str) -> Dict[str, float]:
+        entry = self._types.get(doc_type)
+        if entry is None:
+            entry = {"documents": 0, "slimmed": 0, "bytes_in": 0, "bytes_sent": 0,
+                     "slim_seconds": 0.0, "api_seconds_slimmed": 0.0, "api_seconds_original": 0.0}
+            self._types[doc_type] = entry
+        return entry
+
+    def record_slimming(self, doc_type: str, bytes_in: int, bytes_sent: int, seconds: float) -> None:
+        """
+        Record the outcome of slimming one document.
+
+        Args:
+            doc_type (str): Extractor name
+            bytes_in (int): Size of the original document
+            bytes_sent (int): Size of the document sent to the API
+            seconds (float): Time spent slimming
+        """
+        entry = self._entry(doc_type)
+        entry["bytes_in"] += bytes_in
+        entry["bytes_sent"] += bytes_sent
+        entry["slim_seconds"] += seconds
+
+    def record_request(self, doc_type: str, slimmed: bool, seconds: float) -> None:
+        """
+        Record the API latency of one document.
+
+        Args:
+            doc_type (str): Extractor name
+            slimmed (bool): Whether a slimmed document was sent
+            seconds (float): API call duration including retries
+        """
+        entry = self._entry(doc_type)
+        entry["documents"] += 1
+        entry["slimmed"] += slimmed
+        entry["api_seconds_slimmed" if slimmed else "api_seconds_original"] += seconds
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return the counters of every document type with derived savings.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Counters, bytes saved and average API latency
+                of slimmed and original uploads, keyed by extractor name
+        """
+        result = {}
+        for doc_type, entry in self._types.items():
+            slimmed, original = entry["slimmed"], entry["documents"] - entry["slimmed"]
+            result[doc_type] = {
+                **{key: round(value, 3) if isinstance(value, float) else value
+                   for key, value in entry.items()},
+                "bytes_saved": entry["bytes_in"] - entry["bytes_sent"],
+                "avg_api_seconds_slimmed": round(entry["api_seconds_slimmed"] / slimmed, 3) if slimmed else None,
+                "avg_api_seconds_original": round(entry["api_seconds_original"] / original, 3) if original else None,
+            }
+        return result
+
+
+_stats = SlimmingStats()
+
+
+def get_slimming_stats() -> SlimmingStats:
+    """
+    Return the process-wide SlimmingStats.
+
+    Returns:
+        SlimmingStats: The shared counters
+    """
+    return _stats
@@ -1,17 +1,22 @@
+import asyncio
 import io
 import logging
-import requests
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-import aiohttp
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseUpload
 import urllib
+from .http_client import get_transport
+from .airtable_batcher import AirtableUpdateBatcher
+from .rate_limiter import get_rate_limiters
+from .resilience import parse_retry_after
 
 logger = logging.getLogger(__name__)
 
 
 class UpdateAirtable:
-    def __init__(self, airtable_api_key, airtable_base_id, airtable_table_name, parent_folder_id):
+    def __init__(self, airtable_api_key, airtable_base_id, airtable_table_name, parent_folder_id,
+                 batch_size=10, flush_interval=1.0):
         """
         Initialize the UpdateAirtable class with Airtable and Google Drive credentials.
 
@@ -20,15 +25,33 @@ class UpdateAirtable:
             airtable_base_id (str): ID of the Airtable base
             airtable_table_name (str): Name of the Airtable table
             parent_folder_id (str): ID of the parent folder in Google Drive where files will be uploaded
+            batch_size (int, optional): Records updated per Airtable request, at most 10. Defaults to 10.
+            flush_interval (float, optional): Seconds an update may wait for its batch to fill.
+                Defaults to 1.0.
         """
         self.airtable_api_key = airtable_api_key
         self.airtable_base_id = airtable_base_id
         self.airtable_table_name = airtable_table_name
         self.parent_folder_id = parent_folder_id
+        table_encoded = urllib.parse.quote(self.airtable_table_name)
+        self.batcher = AirtableUpdateBatcher(
+            f"https://api.airtable.com/v0/{self.airtable_base_id}/{table_encoded}",
+            {
+                "Authorization": f"Bearer {self.airtable_api_key}",
+                "Content-Type": "application/json"
+            },
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            # Airtable's request limit applies per base
+            rate_limit_scope=f"airtable:{self.airtable_base_id}"
+        )
 
-    def update(self, file_id, candidate_id, column_name):
+    async def update(self, file_id, candidate_id, column_name):
         """
-        Update an Airtable record with a Google Drive file link.
+        Queue an update of an Airtable record with a Google Drive file link.
+
+        Updates are sent in batches by the batcher; call flush() once every
+        update of a sweep is queued.
 
         Args:
             file_id (str): ID of the file in Google Drive
@@ -40,40 +63,34 @@ class UpdateAirtable:
         """
         # The Google Drive direct link
         file_link = f"https://drive.google.com/file/d/{file_id}/view?usp=sharing"
-        table_encoded = urllib.parse.quote(self.airtable_table_name)
-        logger.info(
-            f"Updating Airtable with file link: {file_link} {column_name} {candidate_id}")
-        # Set up the Airtable API request
-        update_url = f"https://api.airtable.com/v0/{self.airtable_base_id}/{table_encoded}/{candidate_id}"
         logger.info(
-            f"UPDATE URL: {update_url}")
-        # Set up the Airtable API request
-        headers = {
-            "Authorization": f"Bearer {self.airtable_api_key}",
-            "Content-Type": "application/json"
-        }
+            f"Queueing Airtable update with file link: {file_link} {column_name} {candidate_id}")
 
-        data = {
-            "fields": {
-                column_name: file_link
-            }
-        }
-
-        # Send the update request
-        requests.patch(
-            update_url, headers=headers, json=data)
+        await self.batcher.add(candidate_id, {column_name: file_link})
 
         # Return the response
         return {
-            "status": "link updated",
+            "status": "link queued",
             "id": candidate_id,
             "update column": column_name
         }
 
+    async def flush(self):
+        """
+        Send every queued update, retrying failed records.
+
+        Returns:
+            list: Updates that could not be applied, each with the record id, fields and error
+        """
+        return await self.batcher.close()
+
     async def send_to_google_drive(self, file_byte, excelname):
         """
         Upload a file to Google Drive.
 
+        The Google client is blocking, so the upload runs in a worker thread
+        and several uploads can be in flight without stalling the event loop.
+
         Args:
             file_byte (bytes): Binary data of the file to upload
             excelname (str): Name to give the uploaded file
@@ -81,6 +98,37 @@ class UpdateAirtable:
         Returns:
             dict: Dictionary containing the status, file ID, and file link of the uploaded file
         """
+        limiters = get_rate_limiters()
+        await limiters.acquire("drive")
+        try:
+            uploaded_file = await asyncio.to_thread(self._upload_to_drive, file_byte, excelname)
+        except HttpError as e:
+            # Drive reports exceeded quotas as 429 or as 403 rateLimitExceeded
+            if e.resp.status == 429 or (e.resp.status == 403 and "ratelimitexceeded" in str(e).lower()):
+                limiters.observe("drive", 429, parse_retry_after(
+                    e.resp.get("retry-after")))
+            raise
+
+        file_id = uploaded_file.get("id")
+        file_link = uploaded_file.get("webViewLink")
+
+        return {
+            "status": "success",
+            "file_id": file_id,
+            "file_link": file_link,
+        }
+
+    def _upload_to_drive(self, file_byte, excelname):
+        """
+        Upload a file to Google Drive, blocking until it is stored.
+
+        Args:
+            file_byte (bytes): Binary data of the file to upload
+            excelname (str): Name to give the uploaded file
+
+        Returns:
+            dict: The created file's "id" and "webViewLink"
+        """
         SERVICE_ACCOUNT_FILE = "./config-google-service.json"
         SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
@@ -98,18 +146,9 @@ class UpdateAirtable:
 
         media = MediaIoBaseUpload(
             EXCEL_FILE, mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-        uploaded_file = drive_service.files().create(
+        return drive_service.files().create(
             body=file_metadata, media_body=media, fields="id, webViewLink").execute()
 
-        file_id = uploaded_file.get("id")
-        file_link = uploaded_file.get("webViewLink")
-
-        return {
-            "status": "success",
-            "file_id": file_id,
-            "file_link": file_link,
-        }
-
     async def download_file(self, url):
         """
         Download a file from a URL asynchronously.
@@ -120,9 +159,12 @@ class UpdateAirtable:
         Returns:
             bytes: Binary content of the downloaded file, or None if download fails
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    return await resp.read()
+        limiters = get_rate_limiters()
+        await limiters.acquire("airtable_content")
+        response = await get_transport().request("GET", url)
+        limiters.observe("airtable_content", response.status_code,
+                         parse_retry_after(response.headers.get("Retry-After")))
+        if response.status_code == 200:
+            return response.content
 
         return None
@@ -0,0 +1,157 @@
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WorkLedger:
+    """
+    SQLite ledger of the Airtable sweep stages each attachment completed.
+
+    Entries are keyed by (record id, attachment id, attachment content hash,
+    extraction method) and hold the last completed stage with what the next
+    stage needs: the generated output after "extract" and the Drive file id
+    after "drive". A later sweep reading the same attachment resumes after
+    the last completed stage instead of calling the OCR API or Drive again,
+    and skips it once its Airtable update is confirmed.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the WorkLedger.
+
+        Args:
+            db_path (str): Path of the SQLite database
+        """
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the ledger database.
+
+        Returns:
+            sqlite3.Connection: A new connection in autocommit mode
+        """
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def _init_db(self) -> None:
+        """
+        Create the ledger table if it does not exist yet.
+        """
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS work_ledger ("
+                "record_id TEXT NOT NULL, attachment_id TEXT NOT NULL, "
+                "attachment_hash TEXT NOT NULL, doc_method TEXT NOT NULL, "
+                "stage TEXT NOT NULL, output BLOB, extracted TEXT, file_id TEXT, "
+                "updated REAL NOT NULL, "
+                "PRIMARY KEY (record_id, attachment_id, attachment_hash, doc_method))")
+
+    def latest(self, record_id: str, attachment_id: str, doc_method: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the most recent entry of an attachment, whatever its content hash.
+
+        Airtable gives a replaced file a new attachment id, so this is the
+        progress of the file currently attached.
+
+        Args:
+            record_id (str): Airtable record id
+            attachment_id (str): Airtable attachment id
+            doc_method (str): Extraction method, e.g. "extract_id"
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry's attachment_hash, stage, output,
+                extracted data and file_id, or None if the attachment was never seen
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT attachment_hash, stage, output, extracted, file_id FROM work_ledger "
+                "WHERE record_id = ? AND attachment_id = ? AND doc_method = ? "
+                "ORDER BY updated DESC LIMIT 1",
+                (record_id, attachment_id, doc_method)).fetchone()
+        if row is None:
+            return None
+        attachment_hash, stage, output, extracted, file_id = row
+        return {"attachment_hash": attachment_hash, "stage": stage, "output": output,
+                "extracted": json.loads(extracted) if extracted else None, "file_id": file_id}
+
+    def record(self, record_id: str, attachment_id: str, attachment_hash: str, doc_method: str,
+               stage: str, output: Optional[bytes] = None, extracted: Optional[Dict[str, Any]] = None,
+               file_id: Optional[str] = None) -> None:
+        """
+        Record that an attachment completed a stage.
+
+        Values not given are kept from the earlier stages. The generated output
+        is dropped once the Airtable update is confirmed, as nothing needs it
+        any more.
+
+        Args:
+            record_id (str): Airtable record id
+            attachment_id (str): Airtable attachment id
+            attachment_hash (str): SHA-256 of the attachment's content
+            doc_method (str): Extraction method, e.g. "extract_id"
+            stage (str): Completed stage: "download", "extract", "drive" or "update"
+            output (Optional[bytes], optional): Generated workbook or CSV. Defaults to None.
+            extracted (Optional[Dict[str, Any]], optional): Structured extraction result.
+                Defaults to None.
+            file_id (Optional[str], optional): Google Drive file id. Defaults to None.
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO work_ledger (record_id, attachment_id, attachment_hash, doc_method, "
+                "stage, output, extracted, file_id, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(record_id, attachment_id, attachment_hash, doc_method) DO UPDATE SET "
+                "stage = excluded.stage, "
+                "output = CASE WHEN excluded.stage = 'update' THEN NULL "
+                "ELSE COALESCE(excluded.output, output) END, "
+                "extracted = COALESCE(excluded.extracted, extracted), "
+                "file_id = COALESCE(excluded.file_id, file_id), "
+                "updated = excluded.updated",
+                (record_id, attachment_id, attachment_hash, doc_method, stage, output,
+                 json.dumps(extracted, default=str) if extracted is not None else None,
+                 file_id, time.time()))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of ledger entries per last completed stage.
+
+        Returns:
+            Dict[str, int]: Entry count keyed by stage
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT stage, COUNT(*) FROM work_ledger GROUP BY stage").fetchall()
+        return dict(rows)
+
+
+_ledger: Optional[WorkLedger] = None
+
+
+def get_work_ledger() -> Optional[WorkLedger]:
+    """
+    Return the process-wide WorkLedger.
+
+    Returns:
+        Optional[WorkLedger]: The shared ledger, or None if sweeps always start from scratch
+    """
+    return _ledger
+
+
+def configure_work_ledger(db_path: str) -> WorkLedger:
+    """
+    Replace the process-wide WorkLedger.
+
+    Args:
+        db_path (str): Path of the SQLite database
+
+    Returns:
+        WorkLedger: The new shared ledger
+    """
+    global _ledger
+    _ledger = WorkLedger(db_path)
+    return _ledger
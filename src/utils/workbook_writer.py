@@ -0,0 +1,216 @@
+import math
+from io import BytesIO
+from typing import Any, Dict, Iterable, List, Optional
+
+import xlsxwriter
+
+# Text written into cells the OCR API returned no value for
+BLANK_CELL_TEXT = 'Unable to extract text. The document is unclear or blurred.'
+
+# Number of leading columns given the fixed width and wrap format
+FORMATTED_COLUMNS = 10
+COLUMN_WIDTH = 50
+
+
+def is_blank(value: Any) -> bool:
+    """
+    Tell whether a cell value counts as not extracted.
+
+    Args:
+        value (Any): Cell value
+
+    Returns:
+        bool: True for None, NaN and empty strings
+    """
+    if value is None or value == '':
+        return True
+    return isinstance(value, float) and math.isnan(value)
+
+
+def standard_formats(workbook) -> Dict[str, Any]:
+    """
+    Create the formats shared by every sheet of a workbook.
+
+    Called once per workbook so each format is added to the styles table
+    only once, however many sheets or cells use it.
+
+    Args:
+        workbook: xlsxwriter Workbook
+
+    Returns:
+        Dict[str, Any]: "header", "cell" and "blank" formats
+    """
+    return {
+        "header": workbook.add_format(
+            {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}),
+        "cell": workbook.add_format({'text_wrap': True}),
+        "blank": workbook.add_format({'bg_color': 'red', 'font_color': 'white'}),
+    }
+
+
+def set_column_layout(worksheet, formats: Dict[str, Any]) -> None:
+    """
+    Give the leading columns of a sheet their fixed width and wrap format.
+
+    Args:
+        worksheet: xlsxwriter Worksheet
+        formats (Dict[str, Any]): Formats from standard_formats
+    """
+    worksheet.set_column(0, FORMATTED_COLUMNS - 1,
+                         COLUMN_WIDTH, formats["cell"])
+
+
+def highlight_blank_cells(worksheet, formats: Dict[str, Any], rows: int, columns: int) -> None:
+    """
+    Add the rule painting blank cells red.
+
+    Blank cells hold BLANK_CELL_TEXT; a single conditional format over the
+    sheet's data range paints them red, so the cost does not depend on the
+    number of cells.
+
+    Args:
+        worksheet: xlsxwriter Worksheet
+        formats (Dict[str, Any]): Formats from standard_formats
+        rows (int): Number of data rows below the header
+        columns (int): Number of data columns
+    """
+    if rows and columns:
+        worksheet.conditional_format(1, 0, rows, columns - 1, {
+            'type': 'cell',
+            'criteria': '==',
+            'value': f'"{BLANK_CELL_TEXT}"',
+            'format': formats["blank"],
+        })
+
+
+def format_sheet(worksheet, formats: Dict[str, Any], rows: int, columns: int) -> None:
+    """
+    Apply the column layout and blank-cell highlighting rule to a finished sheet.
+
+    Args:
+        worksheet: xlsxwriter Worksheet
+        formats (Dict[str, Any]): Formats from standard_formats
+        rows (int): Number of data rows below the header
+        columns (int): Number of data columns
+    """
+    set_column_layout(worksheet, formats)
+    highlight_blank_cells(worksheet, formats, rows, columns)
+
+
+class SheetWriter:
+    """
+    Appends rows to one sheet of a WorkbookWriter.
+
+    Rows are written as they arrive, so several sheets of one workbook can
+    be filled side by side without buffering any of them.
+    """
+
+    def __init__(self, worksheet, formats: Dict[str, Any], columns: List[str]):
+        """
+        Initialize the SheetWriter and write the header row.
+
+        Args:
+            worksheet: xlsxwriter Worksheet
+            formats (Dict[str, Any]): Formats from standard_formats
+            columns (List[str]): Column headers, in order
+        """
+        self.worksheet = worksheet
+        self.formats = formats
+        self.columns = columns
+        self.rows = 0
+        # Column formats must be set before rows are flushed in constant_memory mode
+        set_column_layout(worksheet, formats)
+        for col_num, column in enumerate(columns):
+            worksheet.write_string(0, col_num, column, formats["header"])
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        """
+        Write one record below the previous one.
+
+        Args:
+            row (Dict[str, Any]): Record keyed by column header
+        """
+        self.rows += 1
+        worksheet, cell_format = self.worksheet, self.formats["cell"]
+        for col_num, column in enumerate(self.columns):
+            value = row.get(column)
+            if is_blank(value):
+                worksheet.write_string(
+                    self.rows, col_num, BLANK_CELL_TEXT, cell_format)
+            elif isinstance(value, bool):
+                worksheet.write_boolean(
+                    self.rows, col_num, value, cell_format)
+            elif isinstance(value, (int, float)):
+                worksheet.write_number(
+                    self.rows, col_num, value, cell_format)
+            else:
+                # Extracted text is always written as text, never as a formula or URL
+                worksheet.write_string(self.rows, col_num, str(
+                    value).replace('\n', ' '), cell_format)
+
+    def finish(self) -> None:
+        """
+        Add the blank-cell highlighting once all rows are written.
+        """
+        highlight_blank_cells(self.worksheet, self.formats, self.rows, len(self.columns))
+
+
+class WorkbookWriter:
+    """
+    Writes extraction results straight to an xlsx workbook with xlsxwriter.
+
+    Rows are written from plain dicts in constant_memory mode, so each cell
+    is serialized once and only the current row of each sheet is held in
+    memory. Sheets get a bold bordered header row, wide wrapped columns and
+    highlighted blank cells.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the WorkbookWriter with an empty workbook.
+
+        Args:
+            path (Optional[str], optional): File the workbook is written to; kept
+                in memory when None. Defaults to None.
+        """
+        self._buffer = None if path else BytesIO()
+        self.workbook = xlsxwriter.Workbook(
+            path or self._buffer, {'constant_memory': True})
+        self.formats = standard_formats(self.workbook)
+
+    def open_sheet(self, name: str, columns: List[str]) -> SheetWriter:
+        """
+        Add a sheet whose rows are written later, one at a time.
+
+        Args:
+            name (str): Sheet name
+            columns (List[str]): Column headers, in order
+
+        Returns:
+            SheetWriter: Writer appending rows to the sheet; call finish() when done
+        """
+        return SheetWriter(self.workbook.add_worksheet(name), self.formats, columns)
+
+    def add_sheet(self, name: str, columns: List[str], rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Write a sheet with a header row followed by one row per record.
+
+        Args:
+            name (str): Sheet name
+            columns (List[str]): Column headers, in order
+            rows (Iterable[Dict[str, Any]]): Records keyed by column header
+        """
+        sheet = self.open_sheet(name, columns)
+        for row in rows:
+            sheet.write_row(row)
+        sheet.finish()
+
+    def close(self) -> Optional[bytes]:
+        """
+        Finish the workbook.
+
+        Returns:
+            Optional[bytes]: The xlsx file, or None when it was written to a path
+        """
+        self.workbook.close()
+        return self._buffer.getvalue() if self._buffer else None
@@ -25,3 +25,15 @@ def mock_files():
 def mock_headers():
     """Fixture to provide mock request headers"""
     return {"Authorization": "Bearer test_token"}
+
+
+@pytest.fixture(autouse=True)
+def single_attempt_api_calls():
+    """Fixture to disable retries and start every test with closed circuit breakers and full rate limiters"""
+    from src.utils.resilience import configure_resilience
+    from src.utils.rate_limiter import configure_rate_limits
+    configure_resilience(retry={"max_attempts": 1})
+    configure_rate_limits()
+    yield
+    configure_resilience()
+    configure_rate_limits()
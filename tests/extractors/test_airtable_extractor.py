@@ -0,0 +1,92 @@
+import asyncio
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.extractors.airtable_extractor import AirtableExtractor
+from src.utils.process_airtable import ProcessAirtable
+
+PAGES = {
+    None: {"records": [{"id": "rec1"}, {"id": "rec2"}], "offset": "itr/2"},
+    "itr/2": {"records": [{"id": "rec3"}], "offset": "itr/3"},
+    "itr/3": {"records": [{"id": "rec4"}]},
+}
+
+
+def _response(url):
+    offset = url.split("&offset=")[1] if "&offset=" in url else None
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = PAGES[offset]
+    return response
+
+
+def _extractor():
+    return AirtableExtractor(files={}, headers="key", table_name="Candidates",
+                             dynamic_url="LEN({Extracted Resume})>0")
+
+
+class TestAirtableExtractor:
+
+    def test_modified_after_narrows_the_formula(self):
+        extractor = AirtableExtractor(files={}, headers="key", table_name="Candidates",
+                                      dynamic_url="LEN({Extracted Resume})>0",
+                                      modified_after="2024-05-01T08:30:00.000Z")
+
+        assert extractor.api_url.endswith(
+            "filterByFormula=AND(OR(LEN({Extracted Resume})>0),"
+            "IS_AFTER(LAST_MODIFIED_TIME(),DATETIME_PARSE('2024-05-01T08:30:00.000Z')))")
+
+    def test_record_ids_narrow_the_formula(self):
+        extractor = AirtableExtractor(files={}, headers="key", table_name="Candidates",
+                                      dynamic_url="LEN({Extracted Resume})>0",
+                                      record_ids=["recA", "recB"])
+
+        assert extractor.api_url.endswith(
+            "filterByFormula=AND(OR(LEN({Extracted Resume})>0),"
+            "OR(RECORD_ID()='recA',RECORD_ID()='recB'))")
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_follows_offset_across_pages(self, mock_request):
+        mock_request.side_effect = lambda method, url, **kwargs: _response(url)
+
+        async def collect():
+            return [record["id"] async for record in _extractor().iter_records()]
+
+        assert asyncio.run(collect()) == ["rec1", "rec2", "rec3", "rec4"]
+        assert mock_request.call_count == 3
+        assert mock_request.call_args_list[1].args[1].endswith(
+            "filterByFormula=OR(LEN({Extracted Resume})>0)&offset=itr/2")
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_next_page_is_fetched_while_the_current_one_is_processed(self, mock_request):
+        mock_request.side_effect = lambda method, url, **kwargs: _response(url)
+
+        async def first_page_then_stop():
+            pages = _extractor().iter_pages()
+            first = await pages.__anext__()
+            await asyncio.sleep(0)
+            requested = mock_request.call_count
+            await pages.aclose()
+            return first, requested
+
+        first, requested = asyncio.run(first_page_then_stop())
+
+        assert [record["id"] for record in first] == ["rec1", "rec2"]
+        assert requested == 2
+        assert mock_request.call_count == 2
+
+
+class TestProcessAirtable:
+
+    def test_consumes_records_lazily(self):
+        consumed = []
+
+        async def records():
+            for record_id in ("rec1", "rec2"):
+                consumed.append(record_id)
+                yield {"id": record_id, "fields": {"Name": record_id}}
+
+        async def run():
+            process = ProcessAirtable({}, {}, {}, {}, {}, AsyncMock(flush=AsyncMock(return_value=[])), records())
+            return await process.process_airtable()
+
+        assert asyncio.run(run()) == []
+        assert consumed == ["rec1", "rec2"]
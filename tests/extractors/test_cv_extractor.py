@@ -1,5 +1,6 @@
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from src.extractors.cv_extractor import CVExtractor
 
 
@@ -48,13 +49,13 @@ def mock_api_response():
 
 class TestCVExtractor:
 
-    @patch('src.extractors.base_extractor.requests.post')
-    def test_extract_success(self, mock_post, mock_files, mock_headers, mock_api_response):
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_extract_success(self, mock_request, mock_files, mock_headers, mock_api_response):
         # Setup mock response
         mock_response = MagicMock()
         mock_response.json.return_value = mock_api_response
         mock_response.status_code = 200
-        mock_post.return_value = mock_response
+        mock_request.return_value = mock_response
 
         # Create instance of CVExtractor
         extractor = CVExtractor(files=mock_files, headers=mock_headers)
@@ -69,7 +70,7 @@ class TestCVExtractor:
                 "excel_data": mock_excel_data}
 
             # Call extract method
-            result = extractor.extract()
+            result = asyncio.run(extractor.extract())
 
             # Verify results
             assert result["excel_data"] == mock_excel_data
@@ -77,26 +78,26 @@ class TestCVExtractor:
             assert result["content_type"] == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
             # Verify the API was called correctly
-            mock_post.assert_called_once_with
+            mock_request.assert_called_once()
 
             # Verify Excel generator was called with the correct data
             extracted_data = extractor._extract_cv_data(mock_api_response)
             mock_excel_instance.generate_cv_excel.assert_called_once_with(
                 extracted_data)
 
-    @patch('src.extractors.base_extractor.requests.post')
-    def test_extract_api_error(self, mock_post, mock_files, mock_headers):
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_extract_api_error(self, mock_request, mock_files, mock_headers):
         # Setup mock response for API error
         mock_response = MagicMock()
         mock_response.json.side_effect = Exception("API Error")
         mock_response.status_code = 500
-        mock_post.return_value = mock_response
+        mock_request.return_value = mock_response
 
         # Create instance of CVExtractor
         extractor = CVExtractor(files=mock_files, headers=mock_headers)
 
         # Call extract method
-        result = extractor.extract()
+        result = asyncio.run(extractor.extract())
 
         # Verify error handling
         assert "error" in result
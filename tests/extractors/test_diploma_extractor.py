@@ -1,5 +1,6 @@
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from src.extractors.diploma_extractor import DiplomaExtractor
 
 
@@ -24,13 +25,13 @@ def mock_api_response():
 
 class TestDiplomaExtractor:
 
-    @patch('src.extractors.base_extractor.requests.post')
-    def test_extract_success(self, mock_post, mock_files, mock_headers, mock_api_response):
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_extract_success(self, mock_request, mock_files, mock_headers, mock_api_response):
         # Setup mock response
         mock_response = MagicMock()
         mock_response.json.return_value = mock_api_response
         mock_response.status_code = 200
-        mock_post.return_value = mock_response
+        mock_request.return_value = mock_response
 
         # Create instance of DiplomaExtractor
         extractor = DiplomaExtractor(files=mock_files, headers=mock_headers)
@@ -45,7 +46,7 @@ class TestDiplomaExtractor:
                 "excel_data": mock_excel_data}
 
             # Call extract method
-            result = extractor.extract()
+            result = asyncio.run(extractor.extract())
 
             # Verify results
             assert result["excel_data"] == mock_excel_data
@@ -57,19 +58,19 @@ class TestDiplomaExtractor:
             mock_excel_instance.generate_diploma_excel.assert_called_once_with(
                 extracted_data)
 
-    @patch('src.extractors.base_extractor.requests.post')
-    def test_extract_api_error(self, mock_post, mock_files, mock_headers):
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_extract_api_error(self, mock_request, mock_files, mock_headers):
         # Setup mock response for API error
         mock_response = MagicMock()
         mock_response.json.side_effect = Exception("API Error")
         mock_response.status_code = 500
-        mock_post.return_value = mock_response
+        mock_request.return_value = mock_response
 
         # Create instance of DiplomaExtractor
         extractor = DiplomaExtractor(files=mock_files, headers=mock_headers)
 
         # Call extract method
-        result = extractor.extract()
+        result = asyncio.run(extractor.extract())
 
         # Verify error handling
         assert "error" in result
@@ -0,0 +1,35 @@
+from src.extractors import IDExtractor, CVExtractor
+from src.mapper import WORK_INDEX, WorkPlanner, build_work_index
+
+
+class TestWorkPlanner:
+
+    def test_index_routes_confirmation_columns_to_extractors(self):
+        route = WORK_INDEX["Extracted SSS ID Upload Confirmation"]
+
+        assert route.upload_column == "SSS ID Upload"
+        assert route.target_column == "Extracted SSS ID Upload"
+        assert route.extractors == (("extract_id", IDExtractor),)
+
+    def test_plans_one_item_per_pending_attachment(self):
+        record = {"id": "rec1", "fields": {
+            "Name": "Jane",
+            "Extracted Upload Resume Confirmation": "No Attachment",
+            "Upload Resume": [{"url": "u1", "filename": "cv.pdf"}, {"url": "u2", "filename": "cv2.pdf"}],
+            "Extracted SSS ID Upload Confirmation": "Extracted",
+            "SSS ID Upload": [{"url": "u3"}],
+            "Extracted School Records Confirmation": "No Attachment",
+        }}
+
+        items = WorkPlanner().plan(record)
+
+        assert [(item.attachment["url"], item.extractor_class, item.target_column) for item in items] == [
+            ("u1", CVExtractor, "Extracted Upload Resume"),
+            ("u2", CVExtractor, "Extracted Upload Resume")]
+        assert items[0].record_id == "rec1" and items[0].candidate == "Jane"
+
+    def test_columns_without_an_extractor_are_left_out(self):
+        index = build_work_index({"Confirm": "Upload"}, {"Upload": "Extracted"},
+                                 {"extract_unknown": ["Upload"]}, {})
+
+        assert index == {}
@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.utils.airtable_batcher import AirtableUpdateBatcher
+
+
+def _airtable(reject=(), drop=()):
+    """Fake multi-record PATCH endpoint rejecting or silently dropping some records"""
+    def respond(method, url, headers=None, json=None, **kwargs):
+        ids = [record["id"] for record in json["records"]]
+        response = MagicMock()
+        if any(record_id in reject for record_id in ids):
+            response.status_code = 422
+            return response
+        response.status_code = 200
+        response.json.return_value = {"records": [
+            {"id": record_id} for record_id in ids if record_id not in drop]}
+        return response
+    return respond
+
+
+def _batcher():
+    return AirtableUpdateBatcher("https://api.airtable.com/v0/app/Table", {},
+                                 flush_interval=0.01, max_attempts=2)
+
+
+class TestAirtableUpdateBatcher:
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_merges_columns_and_sends_ten_records_per_request(self, mock_request):
+        mock_request.side_effect = _airtable()
+
+        async def run():
+            batcher = _batcher()
+            for index in range(25):
+                await batcher.add(f"rec{index}", {"Extracted Resume": "link"})
+            await batcher.add("rec24", {"Extracted Birth Certificate": "link"})
+            return await batcher.close()
+
+        assert asyncio.run(run()) == []
+        payloads = [call.kwargs["json"]["records"] for call in mock_request.call_args_list]
+        assert [len(records) for records in payloads] == [10, 10, 5]
+        assert payloads[2][-1] == {"id": "rec24", "fields": {
+            "Extracted Resume": "link", "Extracted Birth Certificate": "link"}}
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_records_missing_from_the_response_are_requeued(self, mock_request):
+        mock_request.side_effect = _airtable(drop={"rec1"})
+
+        async def run():
+            batcher = _batcher()
+            await batcher.add("rec0", {"A": 1})
+            await batcher.add("rec1", {"A": 1})
+            await batcher.flush()
+            mock_request.side_effect = _airtable()
+            return await batcher.close()
+
+        assert asyncio.run(run()) == []
+        assert mock_request.call_args_list[-1].kwargs["json"]["records"] == [
+            {"id": "rec1", "fields": {"A": 1}}]
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_rejected_batch_is_retried_record_by_record(self, mock_request):
+        mock_request.side_effect = _airtable(reject={"bad"})
+
+        async def run():
+            batcher = _batcher()
+            for record_id in ("rec0", "bad", "rec2"):
+                await batcher.add(record_id, {"A": 1})
+            return await batcher.close()
+
+        failed = asyncio.run(run())
+
+        assert [update["id"] for update in failed] == ["bad"]
+        assert "422" in failed[0]["error"]
+        sent_alone = [call.kwargs["json"]["records"][0]["id"] for call in mock_request.call_args_list[1:]]
+        assert sorted(sent_alone) == ["bad", "rec0", "rec2"]
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_isolated_rejected_record_fails_without_more_attempts(self, mock_request):
+        mock_request.side_effect = _airtable(reject={"bad"})
+
+        async def run():
+            batcher = AirtableUpdateBatcher("https://api.airtable.com/v0/app/Table", {},
+                                            flush_interval=0.01, max_attempts=5)
+            for record_id in ("rec0", "bad"):
+                await batcher.add(record_id, {"A": 1})
+            return await batcher.close()
+
+        failed = asyncio.run(run())
+
+        assert [update["id"] for update in failed] == ["bad"]
+        # Once in the batch, once on its own
+        sent = [record["id"] for call in mock_request.call_args_list
+                for record in call.kwargs["json"]["records"]]
+        assert sent.count("bad") == 2
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_partial_batch_is_flushed_after_the_interval(self, mock_request):
+        mock_request.side_effect = _airtable()
+
+        async def run():
+            batcher = _batcher()
+            await batcher.add("rec0", {"A": 1})
+            await asyncio.sleep(0.05)
+            return mock_request.call_count
+
+        assert asyncio.run(run()) == 1
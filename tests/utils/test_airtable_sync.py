@@ -0,0 +1,54 @@
+from src.utils.airtable_sync import AirtableSync, format_airtable_time
+
+# 2024-05-01T08:30:00Z
+START = 1714552200.0
+
+
+def _sync(tmp_path, **kwargs):
+    return AirtableSync(str(tmp_path / "sync.sqlite3"), **kwargs)
+
+
+class TestAirtableSync:
+
+    def test_first_poll_is_full(self, tmp_path):
+        sync_pass = _sync(tmp_path).begin("Candidates", now=START)
+
+        assert sync_pass.full
+        assert sync_pass.modified_after is None
+
+    def test_completed_poll_starts_the_next_window(self, tmp_path):
+        sync = _sync(tmp_path, overlap=60)
+        sync.complete(sync.begin("Candidates", now=START))
+
+        # A new instance reads the persisted watermark
+        sync_pass = _sync(tmp_path, overlap=60).begin("Candidates", now=START + 5)
+
+        assert not sync_pass.full
+        assert sync_pass.modified_after == "2024-05-01T08:29:00.000Z"
+
+    def test_unfinished_poll_keeps_the_watermark(self, tmp_path):
+        sync = _sync(tmp_path, overlap=0)
+        sync.complete(sync.begin("Candidates", now=START))
+        sync.begin("Candidates", now=START + 5)
+
+        assert sync.begin("Candidates", now=START + 10).modified_after == format_airtable_time(START)
+
+    def test_full_reconciliation_after_interval(self, tmp_path):
+        sync = _sync(tmp_path, full_sync_interval=3600)
+        sync.complete(sync.begin("Candidates", now=START))
+        sync.complete(sync.begin("Candidates", now=START + 1800))
+
+        assert not sync.begin("Candidates", now=START + 3000).full
+        assert sync.begin("Candidates", now=START + 3600).full
+        assert sync.begin("Candidates", now=START + 5, force_full=True).full
+
+    def test_watermark_never_moves_backwards(self, tmp_path):
+        sync = _sync(tmp_path, overlap=0)
+        older = sync.begin("Candidates", now=START)
+        sync.complete(sync.begin("Candidates", now=START + 60))
+        sync.complete(older)
+
+        stats = sync.stats()
+        assert stats["tables"]["Candidates"] == {
+            "watermark": "2024-05-01T08:31:00.000Z", "last_full_sync": "2024-05-01T08:31:00.000Z"}
+        assert (stats["full"], stats["completed"]) == (2, 2)
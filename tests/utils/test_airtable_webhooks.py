@@ -0,0 +1,86 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+from pathlib import Path
+from src.utils.airtable_sync import AirtableSync
+from src.utils.airtable_webhooks import (ReplayPayloadSource, WebhookIngestor, changed_record_ids,
+                                         verify_notification)
+
+PAYLOADS = str(Path(__file__).parent.parent / "fixtures" / "airtable_webhook_payloads.json")
+
+
+def _notification(timestamp):
+    return {"base": {"id": "appBase"}, "webhook": {"id": "achHook"}, "timestamp": timestamp}
+
+
+class RecordingSweep:
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, record_ids):
+        self.calls.append(record_ids)
+        if self.fail:
+            raise RuntimeError("Reading the changed Airtable records failed")
+        return []
+
+
+class TestAirtableWebhooks:
+
+    def test_changed_record_ids_skip_deleted_and_other_tables(self):
+        payloads = json.loads(Path(PAYLOADS).read_text())["payloads"]
+
+        assert changed_record_ids(payloads[1]) == {"recAlpha", "recBravo"}
+        assert changed_record_ids(payloads[2], ["tblCandidates"]) == set()
+
+    def test_verify_notification(self):
+        secret = base64.b64encode(b"secret").decode()
+        body = b'{"timestamp": "2024-05-01T08:30:00.000Z"}'
+        mac = "hmac-sha256=" + hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+
+        assert verify_notification(body, mac, secret)
+        assert not verify_notification(body + b" ", mac, secret)
+        assert not verify_notification(body, None, secret)
+
+    def test_burst_of_notifications_sweeps_each_record_once(self, tmp_path):
+        sweep = RecordingSweep()
+        sync = AirtableSync(str(tmp_path / "sync.sqlite3"))
+
+        async def scenario():
+            ingestor = WebhookIngestor(ReplayPayloadSource(PAYLOADS, page_size=2), sweep,
+                                       sync=sync, table_ids=["tblCandidates"], debounce=0.01)
+            accepted = [ingestor.notify(_notification(f"2024-05-01T08:30:0{n}.000Z"))
+                        for n in (0, 4, 4, 9)]
+            await ingestor._task
+            return accepted, ingestor.stats()
+
+        accepted, stats = asyncio.run(scenario())
+
+        assert accepted == [True, True, False, True]
+        assert sweep.calls == [["recAlpha", "recBravo"]]
+        assert (stats["pulls"], stats["payloads"], stats["duplicates"]) == (1, 3, 1)
+        assert sync.cursor("webhook") == 4
+
+    def test_cursor_survives_restart_and_failed_sweeps(self, tmp_path):
+        sync = AirtableSync(str(tmp_path / "sync.sqlite3"))
+        failing = RecordingSweep(fail=True)
+        sweep = RecordingSweep()
+
+        async def scenario():
+            first = WebhookIngestor(ReplayPayloadSource(PAYLOADS), failing, sync=sync, debounce=0)
+            first.notify(_notification("2024-05-01T08:30:00.000Z"))
+            await first._task
+            # A new process starts from the stored cursor
+            second = WebhookIngestor(ReplayPayloadSource(PAYLOADS), sweep, sync=sync, debounce=0)
+            await second.pull()
+            await second.pull()
+            return first.stats()
+
+        stats = asyncio.run(scenario())
+
+        assert stats["failed_pulls"] == 1
+        assert sweep.calls == [["recAlpha", "recBravo", "recInterview1"]]
+        assert sync.cursor("webhook") == 4
@@ -0,0 +1,55 @@
+import asyncio
+import io
+import json
+import zipfile
+from unittest.mock import patch, MagicMock, AsyncMock
+from fastapi import UploadFile
+from src.extractors.birth_cert_extractor import BirthCertExtractor
+from src.utils.batch_extraction import BatchExtraction
+
+
+SAMPLE_PDF = b"%PDF-1.4\n1 0 obj << /Type /Page >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+
+def _upload(name, content):
+    return UploadFile(file=io.BytesIO(content), filename=name)
+
+
+async def _collect(batch):
+    return b"".join([chunk async for chunk in batch.stream()])
+
+
+class TestBatchExtraction:
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_stream_zip_with_manifest(self, mock_request):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "data": {"fields": {"Candidate_Name": {"value": "Jane"}}}}
+        mock_request.return_value = mock_response
+
+        items = [
+            ("extract_birth_cert", _upload("a.pdf", SAMPLE_PDF + b"first")),
+            ("extract_birth_cert", _upload("empty.pdf", b"")),
+            ("extract_birth_cert", _upload("b.pdf", SAMPLE_PDF + b"second")),
+        ]
+        batch = BatchExtraction(
+            {"extract_birth_cert": BirthCertExtractor}, items, {}, concurrency=2)
+
+        archive = zipfile.ZipFile(io.BytesIO(asyncio.run(_collect(batch))))
+
+        manifest = json.loads(archive.read("manifest.json"))["files"]
+        assert [entry["status"] for entry in manifest] == [
+            "success", "error", "success"]
+        assert sorted(archive.namelist()) == [
+            "001_a_extract_birth_cert.xlsx", "003_b_extract_birth_cert.xlsx", "manifest.json"]
+        assert archive.read("001_a_extract_birth_cert.xlsx")[:2] == b"PK"
+
+    def test_detached_upload_survives_original_close(self):
+        upload = _upload("a.pdf", b"content")
+        batch = BatchExtraction({}, [("extract_cv", upload)], {})
+
+        asyncio.run(upload.close())
+
+        assert asyncio.run(batch.items[0][1].read()) == b"content"
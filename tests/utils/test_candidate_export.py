@@ -0,0 +1,86 @@
+import asyncio
+import csv
+import io
+import re
+import zipfile
+from src.utils.candidate_export import CandidateExport
+from src.utils.result_store import ResultStore, flatten_result
+
+
+def _pages(*pages):
+    async def iterate():
+        for page in pages:
+            yield page
+    return iterate()
+
+
+def _record(record_id, name):
+    return {"id": record_id, "fields": {"Name": name}}
+
+
+def _store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    store.save("rec1", "Birth Certificate", "Jane", {"Date of Birth": "1990-01-01"})
+    store.save("rec2", "Birth Certificate", "John", {"Place of Birth": "Manila"})
+    store.save("rec2", "Upload Resume", "John", {"Email": "john@example.com"})
+    return store
+
+
+class TestResultStore:
+
+    def test_flatten_result_makes_one_row(self):
+        row = flatten_result({
+            "personal_info": {"Name": "Jane"},
+            "introduction": "Engineer",
+            "work_experience": [{"Company": "Acme"}, {"Company": "Globex"}],
+            "technical_skills": ["Python", "SQL"],
+        })
+
+        assert row == {"Name": "Jane", "introduction": "Engineer",
+                       "Company": "Acme; Globex", "technical_skills": "Python; SQL"}
+
+    def test_columns_keep_first_seen_order_and_results_are_replaced(self, tmp_path):
+        store = _store(tmp_path)
+        store.save("rec1", "Birth Certificate", "Jane", {"Date of Birth": "1991-02-02"})
+
+        assert store.columns("Birth Certificate") == ["Date of Birth", "Place of Birth"]
+        assert store.fetch(["rec1"]) == {
+            ("rec1", "Birth Certificate"): {"Date of Birth": "1991-02-02"}}
+        assert store.stats() == {"Birth Certificate": 2, "Upload Resume": 1}
+
+
+class TestCandidateExport:
+
+    def test_workbook_has_one_sheet_per_document_and_one_row_per_candidate(self, tmp_path):
+        export = CandidateExport(
+            _pages([_record("rec1", "Jane")], [_record("rec2", "John"), _record("rec3", "Ann")]),
+            _store(tmp_path), ["Birth Certificate", "Upload Resume"])
+        path = tmp_path / "export.xlsx"
+
+        asyncio.run(export.write_xlsx(str(path)))
+
+        workbook = zipfile.ZipFile(path)
+        names = re.findall(r'<sheet name="([^"]+)"', workbook.read("xl/workbook.xml").decode())
+        assert names == ["Birth Certificate", "Upload Resume"]
+        assert export.candidates == 3
+        assert export.rows == {"Birth Certificate": 2, "Upload Resume": 1}
+        birth_certs, resumes = (re.findall(r"<t[^>]*>([^<]*)</t>", workbook.read(
+            f"xl/worksheets/sheet{number}.xml").decode()) for number in (1, 2))
+        assert birth_certs[4:6] == ["rec1", "Jane"] and "Manila" in birth_certs
+        assert resumes[3:] == ["rec2", "John", "john@example.com"]
+
+    def test_csv_streams_one_chunk_per_page(self, tmp_path):
+        export = CandidateExport(
+            _pages([_record("rec1", "Jane")], [_record("rec2", "John")]),
+            _store(tmp_path), ["Birth Certificate"])
+
+        async def collect():
+            return [chunk async for chunk in export.iter_csv()]
+
+        chunks = asyncio.run(collect())
+
+        assert len(chunks) == 2
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+        assert rows == [["Record ID", "Candidate", "Date of Birth", "Place of Birth"],
+                        ["rec1", "Jane", "1990-01-01", ""],
+                        ["rec2", "John", "", "Manila"]]
@@ -0,0 +1,42 @@
+from src.utils.csv_generator import CSVGenerator, iter_csv_chunks
+
+CV_DATA = {
+    "personal_info": {"Name": "Jane Doe", "Email": "jane@example.com"},
+    "introduction": "Engineer, café lover",
+    "work_experience": [
+        {"Company": "Acme", "Role": "Dev"},
+        {"Company": "Globex", "Start": "2020"},
+    ],
+    "technical_skills": ["Python"],
+    "education": ["BSc"],
+    "awards": [],
+}
+
+
+class TestCSVStreaming:
+
+    def test_stream_matches_generated_csv(self):
+        generator = CSVGenerator()
+
+        streamed = b"".join(generator.iter_cv_csv(CV_DATA)).decode("utf-8")
+
+        assert streamed == generator.generate_cv_csv(CV_DATA)["csv_data"]
+        assert "Globex,,2020" in streamed
+
+    def test_first_section_is_flushed_on_its_own(self):
+        chunks = CSVGenerator().iter_cv_csv(CV_DATA)
+
+        first = next(chunks).decode("utf-8")
+
+        assert first.startswith("--- PERSONAL INFORMATION ---")
+        assert "INTRODUCTION" not in first
+
+    def test_chunks_stay_bounded_for_large_sections(self):
+        rows = ([str(index), "x" * 50] for index in range(20_000))
+
+        chunks = list(iter_csv_chunks([rows], chunk_size=4096))
+
+        assert len(chunks) > 100
+        # A chunk never exceeds the limit by more than one row
+        assert max(len(chunk) for chunk in chunks) < 4096 + 64
+        assert "".join(chunks).count("\n") == 20_000
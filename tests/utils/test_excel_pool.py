@@ -0,0 +1,72 @@
+import asyncio
+import os
+from unittest.mock import MagicMock
+from src.utils.csv_generator import CSVGenerator
+from src.utils.excel_generator import ExcelGenerator
+from src.utils.excel_pool import ExcelPool, collect_chunks
+
+
+def _crash_once(marker):
+    """Kill the worker process the first time it is called, as an OOM kill would"""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "recovered"
+
+
+class TestExcelPool:
+
+    def test_runs_inline_when_not_started(self):
+        generate = MagicMock(return_value={"excel_data": b"xlsx"})
+
+        result = asyncio.run(ExcelPool().run(generate, {"personal_info": {}}))
+
+        assert result == {"excel_data": b"xlsx"}
+        generate.assert_called_once_with({"personal_info": {}})
+
+    def test_generates_workbook_in_worker_process(self):
+        pool = ExcelPool(workers=1)
+        pool.start()
+        try:
+            result = asyncio.run(pool.run(
+                ExcelGenerator().generate_birth_cert_excel,
+                {"personal_info": {"Name": "Jane", "Date Of Birth": ""}}))
+        finally:
+            pool.shutdown()
+
+        assert result["excel_data"][:2] == b"PK"
+
+    def test_stats_count_pooled_jobs(self):
+        pool = ExcelPool(workers=1)
+        pool.start()
+        try:
+            asyncio.run(pool.run(max, 1, 2))
+        finally:
+            pool.shutdown()
+
+        assert pool.stats()["pooled"] == 1
+        assert pool.stats()["running"] == 0
+
+    def test_collects_csv_chunks_in_worker_process(self):
+        pool = ExcelPool(workers=1)
+        pool.start()
+        try:
+            chunks = asyncio.run(pool.run(
+                collect_chunks, CSVGenerator().iter_birth_cert_csv,
+                {"personal_info": {"Name": "Jane"}}))
+        finally:
+            pool.shutdown()
+
+        assert b"Jane" in b"".join(chunks)
+
+    def test_replaces_pool_after_worker_dies(self, tmp_path):
+        pool = ExcelPool(workers=1)
+        pool.start()
+        try:
+            result = asyncio.run(pool.run(_crash_once, str(tmp_path / "crashed")))
+            after = asyncio.run(pool.run(max, 1, 2))
+        finally:
+            pool.shutdown()
+
+        assert (result, after) == ("recovered", 2)
+        assert pool.stats()["restarts"] == 1
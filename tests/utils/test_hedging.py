@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from src.utils.hedging import HedgeBudget, Hedger, LatencyTracker
+
+
+def _warmed_hedger(latency=0.01, **kwargs):
+    hedger = Hedger(min_samples=5, min_delay=0, **kwargs)
+    hedger.budget.tokens = hedger.budget.max_tokens
+    for _ in range(5):
+        hedger._tracker("finhero").record(latency)
+    return hedger
+
+
+class TestHedging:
+
+    def test_percentile_needs_min_samples(self):
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record(1)
+        assert tracker.percentile(0.9) is None
+        tracker.record(2)
+        tracker.record(3)
+        assert tracker.percentile(0.9) == 3
+
+    def test_budget_limits_hedge_ratio(self):
+        budget = HedgeBudget(ratio=0.25)
+        allowed = 0
+        for _ in range(100):
+            budget.deposit()
+            allowed += budget.withdraw()
+        assert allowed == 25
+
+    def test_slow_primary_is_hedged_and_cancelled(self):
+        calls = []
+
+        async def fn():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    calls.append("cancelled")
+                    raise
+            return "fast"
+
+        async def scenario():
+            hedger = _warmed_hedger()
+            result = await hedger.run("finhero", fn)
+            await asyncio.sleep(0)
+            return hedger, result
+
+        hedger, result = asyncio.run(scenario())
+
+        assert result == "fast"
+        assert "cancelled" in calls
+        assert hedger.stats()["hedges"] == 1
+        assert hedger.stats()["hedge_wins"] == 1
+
+    def test_no_hedge_without_budget(self):
+        async def fn():
+            await asyncio.sleep(0.05)
+            return "slow"
+
+        async def scenario():
+            hedger = _warmed_hedger(budget_ratio=0)
+            hedger.budget.tokens = 0
+            return hedger, await hedger.run("finhero", fn)
+
+        hedger, result = asyncio.run(scenario())
+
+        assert result == "slow"
+        assert hedger.stats()["hedges"] == 0
+        assert hedger.stats()["budget_denied"] == 1
+
+    def test_failure_of_both_calls_is_raised(self):
+        async def fn():
+            await asyncio.sleep(0.03)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(_warmed_hedger().run("finhero", fn))
+
+    def test_fast_server_error_does_not_win(self):
+        calls = []
+
+        async def fn():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                await asyncio.sleep(0.05)
+                return 200
+            return 503
+
+        async def scenario():
+            hedger = _warmed_hedger(latency=0.001)
+            return hedger, await hedger.run("finhero", fn, accept=lambda status: status < 500)
+
+        hedger, result = asyncio.run(scenario())
+
+        assert result == 200
+        assert hedger.stats()["hedge_wins"] == 0
+        # Only the successful primary was sampled
+        assert len(hedger._tracker("finhero")._samples) == 6
+
+    def test_unaccepted_result_is_returned_when_nothing_succeeds(self):
+        async def fn():
+            await asyncio.sleep(0.01)
+            return 503
+
+        assert asyncio.run(_warmed_hedger().run("finhero", fn, accept=lambda status: status < 500)) == 503
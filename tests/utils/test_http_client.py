@@ -0,0 +1,123 @@
+import asyncio
+import io
+import time
+import aiohttp
+import pytest
+from aiohttp import web
+from src.utils import http_client
+from src.utils.http_client import FileChunkPayload, HTTPTransport, file_size, read_at
+
+
+async def _slow_handler(request):
+    await asyncio.sleep(0.2)
+    return web.json_response({"path": request.path})
+
+
+async def _upload_handler(request):
+    form = await request.post()
+    upload = form["file"]
+    return web.json_response({"filename": upload.filename, "size": len(upload.file.read()),
+                              "content_length": request.content_length})
+
+
+async def _run_with_server(scenario):
+    app = web.Application(client_max_size=10 * 1024 * 1024)
+    app.router.add_get("/slow", _slow_handler)
+    app.router.add_post("/upload", _upload_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await scenario(f"http://127.0.0.1:{port}")
+    finally:
+        await runner.cleanup()
+
+
+class TestHTTPTransport:
+
+    def test_request_returns_parsed_response(self):
+        async def scenario(base_url):
+            transport = HTTPTransport()
+            try:
+                return await transport.request("GET", f"{base_url}/slow")
+            finally:
+                await transport.close()
+
+        response = asyncio.run(_run_with_server(scenario))
+
+        assert response.status_code == 200
+        assert response.json() == {"path": "/slow"}
+
+    def test_concurrent_requests_overlap(self):
+        async def scenario(base_url):
+            transport = HTTPTransport(limit_per_host=10)
+            try:
+                start = time.monotonic()
+                await asyncio.gather(*[
+                    transport.request("GET", f"{base_url}/slow") for _ in range(5)
+                ])
+                return time.monotonic() - start
+            finally:
+                await transport.close()
+
+        elapsed = asyncio.run(_run_with_server(scenario))
+
+        # Five 0.2s calls run concurrently instead of taking 1s back to back
+        assert elapsed < 0.8
+
+    def test_timeout_raises(self):
+        async def scenario(base_url):
+            transport = HTTPTransport()
+            try:
+                with pytest.raises(asyncio.TimeoutError):
+                    await transport.request("GET", f"{base_url}/slow", timeout=0.05)
+            finally:
+                await transport.close()
+
+        asyncio.run(_run_with_server(scenario))
+
+    def test_file_chunk_payload_streams_and_can_be_resent(self):
+        source = io.BytesIO(b"x" * (300 * 1024))
+
+        async def scenario(base_url):
+            transport = HTTPTransport()
+            try:
+                responses = []
+                for _ in range(2):
+                    form = aiohttp.FormData()
+                    form.add_field("file", FileChunkPayload(source, chunk_size=1024, filename="scan.pdf"),
+                                   filename="scan.pdf")
+                    responses.append(await transport.request("POST", f"{base_url}/upload", data=form))
+                return responses
+            finally:
+                await transport.close()
+
+        responses = asyncio.run(_run_with_server(scenario))
+
+        for response in responses:
+            body = response.json()
+            assert body["filename"] == "scan.pdf"
+            assert body["size"] == 300 * 1024
+            assert body["content_length"] is not None
+        assert not source.closed
+
+    def test_read_at_reads_read_only_files_by_position(self, tmp_path):
+        path = tmp_path / "scan.pdf"
+        path.write_bytes(b"0123456789")
+
+        with open(path, "rb") as source:
+            source.seek(3)
+            assert read_at(source, 5, 3) == b"567"
+            assert file_size(source) == 10
+            # Positional reads leave the handle where its owner put it
+            assert source.tell() == 3
+
+    def test_read_locks_are_per_file(self):
+        first, second = io.BytesIO(b"first"), io.BytesIO(b"second")
+
+        with http_client._read_lock(first):
+            # A lock held on one upload does not block reads of another
+            assert read_at(second, 0, 6) == b"second"
+        assert http_client._read_lock(first) is http_client._read_lock(first)
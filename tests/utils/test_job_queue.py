@@ -0,0 +1,112 @@
+import asyncio
+import io
+import time
+from unittest.mock import patch, MagicMock, AsyncMock
+from fastapi import UploadFile
+from src.extractors.diploma_extractor import DiplomaExtractor
+from src.utils.job_queue import JobQueue, JobWorkerPool
+
+
+SAMPLE_PDF = b"%PDF-1.4\n1 0 obj << /Type /Page >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+
+def _queue(tmp_path, **kwargs):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), str(tmp_path / "files"), **kwargs)
+
+
+def _upload(content=SAMPLE_PDF):
+    return UploadFile(file=io.BytesIO(content), filename="diploma.pdf")
+
+
+class TestJobQueue:
+
+    def test_jobs_survive_restart(self, tmp_path):
+        job_id = asyncio.run(_queue(tmp_path).enqueue("extract_diploma", _upload()))
+
+        restarted = _queue(tmp_path)
+        job = asyncio.run(restarted.claim())
+
+        assert job["id"] == job_id
+        assert job["attempts"] == 1
+        assert open(job["input_path"], "rb").read() == SAMPLE_PDF
+
+    def test_expired_lease_is_reclaimed(self, tmp_path):
+        queue = _queue(tmp_path, lease_timeout=0.2)
+        job_id = asyncio.run(queue.enqueue("extract_diploma", _upload()))
+        asyncio.run(queue.claim())  # worker "crashes" without finishing
+
+        assert asyncio.run(queue.claim()) is None
+        time.sleep(0.25)
+        job = asyncio.run(queue.claim())
+
+        assert job["id"] == job_id
+        assert job["attempts"] == 2
+
+    def test_stale_claim_cannot_record_outcome(self, tmp_path):
+        queue = _queue(tmp_path, lease_timeout=0.2)
+        job_id = asyncio.run(queue.enqueue("extract_diploma", _upload()))
+        stale = asyncio.run(queue.claim())
+        time.sleep(0.25)
+        current = asyncio.run(queue.claim())
+
+        assert asyncio.run(queue.complete(job_id, b"stale", "a.xlsx", stale["attempts"])) is False
+        asyncio.run(queue.fail(job_id, "stale", retry=True, attempt=stale["attempts"]))
+        assert asyncio.run(queue.renew(job_id, stale["attempts"])) is False
+        assert asyncio.run(queue.get(job_id))["status"] == "running"
+
+        assert asyncio.run(queue.complete(job_id, b"fresh", "a.xlsx", current["attempts"])) is True
+        assert open(asyncio.run(queue.get(job_id))["result_path"], "rb").read() == b"fresh"
+
+    @patch('src.utils.job_queue.ExtractionProcess')
+    def test_lease_is_renewed_while_job_runs(self, mock_process, tmp_path):
+        queue = _queue(tmp_path, lease_timeout=0.3)
+        workers = JobWorkerPool(queue, {"extract_diploma": DiplomaExtractor}, {})
+
+        async def slow_extraction():
+            await asyncio.sleep(1)
+            return MagicMock(status_code=200, body=b"PK workbook")
+        mock_process.return_value.proccess_extraction = slow_extraction
+
+        async def scenario():
+            job_id = await queue.enqueue("extract_diploma", _upload())
+            running = asyncio.create_task(workers.process(await queue.claim()))
+            await asyncio.sleep(0.7)
+            reclaimed = await queue.claim()
+            await running
+            return reclaimed, await queue.get(job_id)
+
+        reclaimed, job = asyncio.run(scenario())
+
+        assert reclaimed is None
+        assert (job["status"], job["attempts"]) == ("succeeded", 1)
+
+    def test_gives_up_after_max_attempts(self, tmp_path):
+        queue = _queue(tmp_path, max_attempts=1)
+        job_id = asyncio.run(queue.enqueue("extract_diploma", _upload()))
+        asyncio.run(queue.claim())
+
+        asyncio.run(queue.fail(job_id, "Finhero down", retry=True))
+
+        assert asyncio.run(queue.get(job_id))["status"] == "failed"
+        assert asyncio.run(queue.claim()) is None
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_worker_processes_job(self, mock_request, tmp_path):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "data": {"fields": {"Candidate_Name": {"value": "Jane"}}}}
+        mock_request.return_value = mock_response
+        queue = _queue(tmp_path)
+        workers = JobWorkerPool(queue, {"extract_diploma": DiplomaExtractor}, {})
+
+        async def scenario():
+            job_id = await queue.enqueue("extract_diploma", _upload())
+            await workers.process(await queue.claim())
+            return await queue.get(job_id)
+
+        job = asyncio.run(scenario())
+
+        assert job["status"] == "succeeded"
+        assert job["result_filename"] == "diploma_extract_diploma.xlsx"
+        assert open(job["result_path"], "rb").read()[:2] == b"PK"
@@ -0,0 +1,77 @@
+import asyncio
+import io
+import pytest
+from unittest.mock import patch, AsyncMock
+from src.utils import ocr_cache
+from src.utils.ocr_cache import OCRCache
+from src.extractors.birth_cert_extractor import BirthCertExtractor
+
+
+@pytest.fixture
+def api_response():
+    """Fixture to provide a raw Finhero response"""
+    return {"file": "birth.pdf", "data": {"fields": {"Candidate_Name": {"value": "Jane"}}}}
+
+
+class TestOCRCache:
+
+    def test_memory_hit_and_miss(self, api_response):
+        cache = OCRCache(max_entries=2)
+
+        assert asyncio.run(cache.get("k")) is None
+        asyncio.run(cache.set("k", api_response))
+
+        assert asyncio.run(cache.get("k")) == api_response
+        stats = cache.stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_lru_eviction(self, api_response):
+        cache = OCRCache(max_entries=2)
+
+        for key in ("a", "b"):
+            asyncio.run(cache.set(key, api_response))
+        asyncio.run(cache.get("a"))  # "b" becomes least recently used
+        asyncio.run(cache.set("c", api_response))
+
+        assert asyncio.run(cache.get("b")) is None
+        assert asyncio.run(cache.get("a")) == api_response
+        assert cache.stats()["memory_evictions"] == 1
+
+    def test_ttl_expiry(self, api_response):
+        cache = OCRCache(ttl=0)
+
+        asyncio.run(cache.set("k", api_response))
+
+        assert asyncio.run(cache.get("k")) is None
+        assert cache.stats()["memory_expirations"] == 1
+
+    def test_disk_tier_survives_new_instance(self, tmp_path, api_response):
+        db_path = str(tmp_path / "cache.sqlite3")
+        asyncio.run(OCRCache(db_path=db_path).set("k", api_response))
+
+        restarted = OCRCache(db_path=db_path)
+
+        assert asyncio.run(restarted.get("k")) == api_response
+        assert restarted.stats()["disk_hits"] == 1
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_extractor_hit_skips_api_request(self, mock_request, api_response):
+        cache = OCRCache()
+        files = {"file": ("birth.pdf", b"same bytes", "application/pdf")}
+        key = cache.make_key(
+            BirthCertExtractor(files, {})._content_hash(), "BirthCertExtractor")
+        asyncio.run(cache.set(key, api_response))
+
+        with patch.object(ocr_cache, "_cache", cache):
+            data = asyncio.run(BirthCertExtractor(files, {})._fetch_api_data())
+
+        assert data == api_response
+        mock_request.assert_not_called()
+
+    def test_content_hash_of_file_object_matches_bytes(self):
+        content = b"scan" * 50000
+        from_bytes = BirthCertExtractor({"file": ("a.pdf", content)}, {})
+        from_file = BirthCertExtractor({"file": ("a.pdf", io.BytesIO(content))}, {})
+
+        assert from_file._content_hash() == from_bytes._content_hash()
@@ -0,0 +1,87 @@
+import asyncio
+import csv
+import io
+import json
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from fastapi import HTTPException, UploadFile
+from src.extractors.id_extractor import IDExtractor
+from src.utils.csv_generator import CSVGenerator
+from src.utils.extraction_process import ExtractionProcess
+from src.utils.output_formats import negotiate_format
+
+SAMPLE_PDF = b"%PDF-1.4\n1 0 obj << /Type /Page >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+ID_RESPONSE = {"data": {"fields": {"IDs_info": {"values": [
+    {"Candidate_Name": {"value": "Jane"}, "ID_Number": {"value": "123"}},
+    {"Candidate_Name": {"value": "John"}, "ID_Type": {"value": "Passport"}},
+]}}}}
+
+
+def _extract(output_format, mock_request):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = ID_RESPONSE
+    mock_request.return_value = mock_response
+    upload = UploadFile(file=io.BytesIO(SAMPLE_PDF), filename="id.pdf")
+    return asyncio.run(ExtractionProcess(IDExtractor, upload, {}, output_format).proccess_extraction())
+
+
+def _read_stream(response):
+    async def body():
+        return [chunk async for chunk in response.body_iterator]
+    chunks = asyncio.run(body())
+    return "".join(chunk if isinstance(chunk, str) else chunk.decode() for chunk in chunks)
+
+
+class TestNegotiateFormat:
+
+    def test_format_parameter_wins_over_accept(self):
+        assert negotiate_format("application/json", "csv") == "csv"
+
+    def test_accept_header_quality_and_default(self):
+        assert negotiate_format(None) == "xlsx"
+        assert negotiate_format("*/*") == "xlsx"
+        assert negotiate_format("text/csv;q=0.5, application/x-ndjson") == "ndjson"
+
+    def test_unsupported_requests_are_rejected(self):
+        with pytest.raises(HTTPException) as error:
+            negotiate_format("image/png")
+        assert error.value.status_code == 406
+        with pytest.raises(HTTPException) as error:
+            negotiate_format(None, "pdf")
+        assert error.value.status_code == 400
+
+
+class TestOutputFormats:
+
+    @patch('src.extractors.id_extractor.ExcelGenerator')
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_json_skips_workbook_generation(self, mock_request, mock_excel_generator):
+        response = _extract("json", mock_request)
+
+        assert json.loads(response.body)["id_info"][0]["Candidate Name"] == "Jane"
+        mock_excel_generator.return_value.generate_id_excel.assert_not_called()
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_csv_response(self, mock_request):
+        response = _extract("csv", mock_request)
+
+        assert response.media_type.startswith("text/csv")
+        rows = list(csv.reader(io.StringIO(_read_stream(response))))
+        assert rows[1][:2] == ["Candidate Name", "Candidate_Name"]
+        assert len(rows) == 4
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_ndjson_response(self, mock_request):
+        response = _extract("ndjson", mock_request)
+
+        lines = [json.loads(line) for line in _read_stream(response).splitlines()]
+        assert [line["value"]["Candidate Name"] for line in lines] == ["Jane", "John"]
+
+    def test_id_csv_handles_several_records(self):
+        result = CSVGenerator().generate_id_csv(
+            {"id_info": [{"ID Number": "1"}, {"ID Number": "2", "ID Type": "Passport"}]})
+
+        assert result["csv_data"].splitlines()[1:] == [
+            "ID Number,ID Type", "1,", "2,Passport"]
@@ -0,0 +1,42 @@
+import asyncio
+from src.utils.poll_scheduler import PollScheduler
+
+
+class TestPollScheduler:
+
+    def test_backs_off_while_idle_and_resets_on_work(self):
+        scheduler = PollScheduler(5, 60, backoff=2)
+
+        waits = [scheduler.record(work, 0.1) for work in (0, 0, 0, 0, 0, 3, 0)]
+
+        assert waits == [10, 20, 40, 60, 60, 5, 10]
+        stats = scheduler.stats()
+        assert (stats["busy_sweeps"], stats["idle_sweeps"], stats["idle_streak"]) == (1, 6, 1)
+
+    def test_sweeps_never_overlap(self):
+        scheduler = PollScheduler(0.01, 0.05)
+        running = []
+        peak = []
+
+        async def scenario():
+            shutdown = asyncio.Event()
+
+            async def sweep():
+                running.append(1)
+                peak.append(len(running))
+                await asyncio.sleep(0.03)
+                running.pop()
+                if len(peak) == 4:
+                    shutdown.set()
+                if len(peak) == 2:
+                    raise RuntimeError("Airtable unavailable")
+                return len(peak) % 2
+
+            await asyncio.wait_for(scheduler.run(sweep, shutdown), timeout=5)
+
+        asyncio.run(scenario())
+
+        assert peak == [1, 1, 1, 1]
+        stats = scheduler.stats()
+        assert (stats["sweeps"], stats["failed_sweeps"]) == (4, 1)
+        assert stats["last_duration"] >= 0.03
@@ -0,0 +1,82 @@
+import asyncio
+import io
+import zipfile
+import pytest
+from fastapi import HTTPException, UploadFile
+from src.utils.extraction_process import ExtractionProcess
+from src.utils.preflight import Preflight, scan_pdf
+
+
+def _pdf(pages=1, encrypted=False):
+    body = b"".join(b"%d 0 obj << /Type /Page >> endobj\n" % i for i in range(pages))
+    trailer = b"trailer << /Encrypt 9 0 R >>\n" if encrypted else b"trailer << >>\n"
+    return b"%PDF-1.7\n" + body + trailer + b"%%EOF\n"
+
+
+def _zip(*names):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name in names:
+            archive.writestr(name, "<xml/>")
+    return buffer.getvalue()
+
+
+def _reject_status(preflight, filename, content):
+    with pytest.raises(HTTPException) as error:
+        preflight.check(filename, io.BytesIO(content))
+    return error.value.status_code
+
+
+class TestPreflight:
+
+    def test_accepts_valid_pdf(self):
+        preflight = Preflight()
+
+        assert preflight.check("cv.pdf", io.BytesIO(_pdf())) == len(_pdf())
+        assert preflight.stats() == {"passed": 1, "rejected": {}}
+
+    def test_rejections_are_precise_and_counted(self):
+        preflight = Preflight(max_size=1000, max_pdf_pages=2)
+
+        assert _reject_status(preflight, "cv.pdf", b"") == 400
+        assert _reject_status(preflight, "cv.pdf", b"%PDF-" + b"x" * 1000) == 413
+        assert _reject_status(preflight, "cv.pdf", b"<!DOCTYPE html><html>") == 415
+        assert _reject_status(preflight, "cv.pdf", b"\xff\xd8\xff\xe0 jpeg") == 415
+        assert _reject_status(preflight, "cv.pdf", _pdf(encrypted=True)) == 422
+        assert _reject_status(preflight, "cv.pdf", _pdf(pages=3)) == 422
+        assert _reject_status(preflight, "cv.pdf", _pdf()[:-7]) == 422
+
+        assert preflight.stats()["rejected"] == {
+            "empty": 1, "too_large": 1, "html": 1, "type_mismatch": 1,
+            "encrypted_pdf": 1, "too_many_pages": 1, "truncated_pdf": 1}
+
+    def test_accepts_docx_cv(self):
+        preflight = Preflight()
+        docx = _zip("[Content_Types].xml", "word/document.xml")
+
+        assert preflight.check("cv.docx", io.BytesIO(docx)) == len(docx)
+        assert preflight.check("attachment", io.BytesIO(docx), declared=False) == len(docx)
+
+    def test_rejects_other_archives_and_reports_truncation(self):
+        preflight = Preflight()
+
+        assert _reject_status(preflight, "cv.docx", _zip("xl/workbook.xml")) == 415
+        with pytest.raises(HTTPException) as error:
+            preflight.check("cv.pdf", io.BytesIO(_pdf()[:-7]))
+        assert error.value.detail == "PDF is truncated (no %EOF marker)"
+
+    def test_scan_counts_pages_across_chunk_boundaries(self):
+        content = _pdf(pages=40)
+
+        result = scan_pdf(io.BytesIO(content), len(content), chunk_size=7)
+
+        assert result == {"pages": 40, "encrypted": False, "complete": True}
+
+    def test_extraction_process_returns_4xx_untouched(self):
+        upload = UploadFile(file=io.BytesIO(b"<html>502 Bad Gateway</html>"), filename="id.pdf")
+        extractor_class = object()
+
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(ExtractionProcess(extractor_class, upload, {}).proccess_extraction())
+
+        assert error.value.status_code == 415
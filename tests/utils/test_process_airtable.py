@@ -0,0 +1,142 @@
+import asyncio
+import time
+import pytest
+import src.utils.work_ledger as work_ledger
+from src.utils.process_airtable import ProcessAirtable, get_sweep_stats
+
+SAMPLE_PDF = b"%PDF-1.4\n1 0 obj << /Type /Page >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+
+class FakeExtractor:
+    output_format = "xlsx"
+    calls = 0
+
+    def __init__(self, files, headers):
+        self.files = files
+
+    async def extract(self):
+        FakeExtractor.calls += 1
+        await asyncio.sleep(0.05)
+        return {"excel_data": b"workbook", "filename": "result.xlsx",
+                "data": {"personal_info": {"Name": "Jane"}}}
+
+
+class FakeAirtable:
+    """Stand-in for UpdateAirtable with a fixed latency per call"""
+
+    def __init__(self, broken_urls=(), rejected_ids=()):
+        self.broken_urls = broken_urls
+        self.rejected_ids = rejected_ids
+        self.updates = []
+        self.downloads = 0
+        self.uploads = 0
+
+    async def download_file(self, url):
+        self.downloads += 1
+        await asyncio.sleep(0.05)
+        return None if url in self.broken_urls else SAMPLE_PDF
+
+    async def send_to_google_drive(self, file_byte, excelname):
+        self.uploads += 1
+        await asyncio.sleep(0.05)
+        return {"file_id": f"drive-{excelname}"}
+
+    async def update(self, file_id, candidate_id, column_name):
+        self.updates.append((candidate_id, column_name, file_id))
+        return {"status": "link queued", "id": candidate_id}
+
+    async def flush(self):
+        return [{"id": record_id, "fields": {}, "error": "Airtable returned status code 422"}
+                for record_id, _, _ in self.updates if record_id in self.rejected_ids]
+
+
+def _records(count):
+    return [{"id": f"rec{index}", "fields": {
+        "Name": f"Candidate {index}", "Confirm": "No Attachment",
+        "Upload": [{"id": f"att{index}", "url": f"u{index}", "filename": f"doc{index}.pdf"}]}}
+        for index in range(count)]
+
+
+def _sweep(airtable, records, concurrency=None):
+    process = ProcessAirtable({"Confirm": "Upload"}, {"extract_fake": ["Upload"]},
+                              {"extract_fake": FakeExtractor}, {"Upload": "Extracted"},
+                              {}, airtable, records, concurrency=concurrency)
+    return asyncio.run(process.process_airtable())
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    yield work_ledger.configure_work_ledger(str(tmp_path / "ledger.sqlite3"))
+    work_ledger._ledger = None
+
+
+class TestSweepPipeline:
+
+    def test_failures_stay_with_their_work_item(self):
+        airtable = FakeAirtable(broken_urls={"u1"})
+
+        statuses = _sweep(airtable, _records(3))
+
+        failed = [status for status in statuses if status["status"] == "failed"]
+        assert [(status["id"], status["stage"]) for status in failed] == [("rec1", "download")]
+        assert sorted(airtable.updates) == [
+            ("rec0", "Extracted", "drive-Candidate 0_doc0.pdf"),
+            ("rec2", "Extracted", "drive-Candidate 2_doc2.pdf")]
+        stats = get_sweep_stats()
+        assert (stats["planned"], stats["succeeded"], stats["failed"]) == (3, 2, 1)
+
+    def test_rejected_update_is_only_reported_as_failed(self):
+        statuses = _sweep(FakeAirtable(rejected_ids={"rec1"}), _records(2))
+
+        assert sorted((status["status"], status["name"]) for status in statuses) == [
+            ("failed", "Candidate 1"), ("success", "Candidate 0")]
+        assert get_sweep_stats()["succeeded"] == 1
+
+    def test_sweep_keeps_its_own_stats(self):
+        def process(records):
+            return ProcessAirtable({"Confirm": "Upload"}, {"extract_fake": ["Upload"]},
+                                   {"extract_fake": FakeExtractor}, {"Upload": "Extracted"},
+                                   {}, FakeAirtable(), records)
+        scheduled, webhook = process(_records(3)), process(_records(1))
+
+        async def scenario():
+            await asyncio.gather(scheduled.process_airtable(), webhook.process_airtable())
+
+        asyncio.run(scenario())
+
+        assert (scheduled.sweep_stats["planned"], webhook.sweep_stats["planned"]) == (3, 1)
+
+    def test_stages_overlap(self):
+        started = time.perf_counter()
+        statuses = _sweep(FakeAirtable(), _records(8),
+                          concurrency={"download": 4, "extract": 4, "drive": 4})
+        elapsed = time.perf_counter() - started
+
+        assert [status["status"] for status in statuses] == ["success"] * 8
+        # One at a time, each document would take 0.15 s of download, OCR and upload
+        assert elapsed < 8 * 0.15 / 2
+
+    def test_ledger_skips_finished_attachments(self, ledger):
+        _sweep(FakeAirtable(), _records(3))
+        calls = FakeExtractor.calls
+        airtable = FakeAirtable()
+
+        statuses = _sweep(airtable, _records(3))
+
+        assert statuses == []
+        assert (airtable.downloads, airtable.uploads, FakeExtractor.calls) == (0, 0, calls)
+        assert get_sweep_stats()["skipped"] == 3
+        assert ledger.stats() == {"update": 3}
+
+    def test_rejected_update_resumes_without_ocr_or_upload(self, ledger):
+        first = FakeAirtable(rejected_ids={"rec1"})
+        _sweep(first, _records(2))
+        calls = FakeExtractor.calls
+        airtable = FakeAirtable()
+
+        statuses = _sweep(airtable, _records(2))
+
+        assert [status["status"] for status in statuses] == ["success"]
+        assert airtable.updates == [("rec1", "Extracted", "drive-Candidate 1_doc1.pdf")]
+        assert (airtable.downloads, airtable.uploads, FakeExtractor.calls) == (0, 0, calls)
+        assert (get_sweep_stats()["skipped"], get_sweep_stats()["resumed"]) == (1, 1)
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.extractors.airtable_extractor import AirtableExtractor
+from src.utils.rate_limiter import RateLimiterRegistry, TokenBucket, get_rate_limiters
+from src.utils.resilience import configure_resilience
+
+
+class TestTokenBucket:
+
+    def test_burst_passes_then_requests_are_spaced(self):
+        bucket = TokenBucket("test", rate=10, burst=2)
+
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits[:2] == [0, 0]
+        assert waits[2] == pytest.approx(0.1, abs=0.01)
+        assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+    def test_429_halves_rate_and_pauses_until_retry_after(self):
+        bucket = TokenBucket("test", rate=10, burst=10)
+
+        bucket.observe(429, retry_after=2)
+
+        assert bucket.current_rate == 5
+        assert bucket.reserve() == pytest.approx(2.2, abs=0.01)
+        for _ in range(5):
+            bucket.observe(200)
+        assert bucket.current_rate == 10
+        assert bucket.stats()["throttled"] == 1
+
+    def test_scopes_of_a_provider_have_separate_buckets(self):
+        registry = RateLimiterRegistry({"airtable": {"rate": 1, "burst": 1}})
+
+        assert registry.get("airtable:appA") is not registry.get("airtable:appB")
+        assert registry.get("airtable:appA").rate == 1
+        assert registry.get("unknown") is None
+        assert set(registry.stats()) == {"airtable:appA", "airtable:appB"}
+
+
+class TestRateLimitedCalls:
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_airtable_429_slows_the_base_down_and_is_retried(self, mock_request):
+        configure_resilience(retry={"max_attempts": 2, "base_delay": 0, "max_delay": 0})
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "0"})
+        ok = MagicMock(status_code=200, headers={})
+        ok.json.return_value = {"records": [{"id": "rec1"}]}
+        mock_request.side_effect = [throttled, ok]
+
+        async def collect():
+            return [record async for record in AirtableExtractor(
+                files={}, headers="key", table_name="Candidates", dynamic_url="1").iter_records()]
+
+        assert asyncio.run(collect()) == [{"id": "rec1"}]
+        stats = get_rate_limiters().stats()["airtable:appZo3a2wKyMLh3UC"]
+        assert stats["acquired"] == 2
+        assert stats["throttled"] == 1
+        assert stats["current_rate"] == 3.0
@@ -0,0 +1,135 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.extractors.base_extractor import APIResponseError, CircuitOpenError
+from src.extractors.birth_cert_extractor import BirthCertExtractor
+from src.utils.resilience import CircuitBreaker, RetryPolicy, configure_resilience, parse_retry_after
+
+
+def _response(status_code, headers=None, body=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = body or {}
+    return response
+
+
+class TestRetryPolicy:
+
+    def test_gives_up_after_max_attempts(self):
+        policy = RetryPolicy(max_attempts=2, base_delay=0)
+
+        assert policy.next_delay(0) == 0
+        assert policy.next_delay(1) is None
+        assert policy.stats() == {"retries": 1, "gave_up": 1}
+
+    def test_honors_retry_after(self):
+        policy = RetryPolicy(base_delay=0, max_delay=5)
+
+        assert policy.next_delay(0, retry_after=2) == 2
+        assert policy.next_delay(0, retry_after=60) is None
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold_and_half_opens(self):
+        breaker = CircuitBreaker("finhero", failure_threshold=2, recovery_timeout=0.05)
+
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+        asyncio.run(asyncio.sleep(0.06))
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()  # only one probe at a time
+
+        breaker.record_success()
+        assert breaker.snapshot()["state"] == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("finhero", failure_threshold=1, recovery_timeout=0)
+
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.times_opened == 2
+
+    def test_released_probe_frees_the_slot(self):
+        breaker = CircuitBreaker("finhero", failure_threshold=1, recovery_timeout=0)
+
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.release()
+
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+class TestMakeApiRequestResilience:
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_retries_transient_status_then_succeeds(self, mock_request):
+        configure_resilience(retry={"max_attempts": 3, "base_delay": 0})
+        mock_request.side_effect = [
+            _response(503), _response(429, {"Retry-After": "0"}), _response(200, body={"ok": True})]
+        extractor = BirthCertExtractor({"file": ("a.pdf", b"x")}, {})
+
+        assert asyncio.run(extractor._make_api_request()) == {"ok": True}
+        assert mock_request.call_count == 3
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_client_error_is_not_retried(self, mock_request):
+        configure_resilience(retry={"max_attempts": 3, "base_delay": 0})
+        mock_request.return_value = _response(400)
+        extractor = BirthCertExtractor({"file": ("a.pdf", b"x")}, {})
+
+        with pytest.raises(APIResponseError):
+            asyncio.run(extractor._make_api_request())
+        assert mock_request.call_count == 1
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_open_circuit_fails_fast(self, mock_request):
+        configure_resilience(retry={"max_attempts": 1},
+                             breaker={"failure_threshold": 2, "recovery_timeout": 60})
+        mock_request.return_value = _response(502)
+        extractor = BirthCertExtractor({"file": ("a.pdf", b"x")}, {})
+
+        for _ in range(2):
+            with pytest.raises(APIResponseError):
+                asyncio.run(extractor._make_api_request())
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(extractor._make_api_request())
+        assert mock_request.call_count == 2
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_cancelled_probe_does_not_wedge_half_open(self, mock_request):
+        configure_resilience(retry={"max_attempts": 1},
+                             breaker={"failure_threshold": 1, "recovery_timeout": 0})
+        extractor = BirthCertExtractor({"file": ("a.pdf", b"x")}, {})
+
+        async def scenario():
+            mock_request.return_value = _response(502)
+            with pytest.raises(APIResponseError):
+                await extractor._make_api_request()
+
+            async def hang(*args, **kwargs):
+                await asyncio.sleep(10)
+            mock_request.side_effect = hang
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(extractor._make_api_request(), timeout=0.05)
+
+            mock_request.side_effect = None
+            mock_request.return_value = _response(200, body={"ok": True})
+            return await extractor._make_api_request()
+
+        assert asyncio.run(scenario()) == {"ok": True}
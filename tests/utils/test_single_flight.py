@@ -0,0 +1,93 @@
+import asyncio
+import tempfile
+import pytest
+from unittest.mock import patch
+from src.extractors.birth_cert_extractor import BirthCertExtractor
+from src.utils.http_client import read_at
+from src.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_one_execution(self):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"ok": True}
+
+        async def scenario():
+            flight = SingleFlight()
+            results = await asyncio.gather(*[flight.do("k", fetch) for _ in range(5)])
+            return flight, results
+
+        flight, results = asyncio.run(scenario())
+
+        assert len(calls) == 1
+        assert all(result == {"ok": True} for result in results)
+        assert flight.stats() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+    def test_failure_propagates_to_every_waiter(self):
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("Finhero down")
+
+        async def scenario():
+            flight = SingleFlight()
+            return await asyncio.gather(*[flight.do("k", fetch) for _ in range(3)],
+                                        return_exceptions=True)
+
+        results = asyncio.run(scenario())
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def scenario():
+            flight = SingleFlight()
+            first = asyncio.create_task(flight.do("k", fetch))
+            second = asyncio.create_task(flight.do("k", fetch))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+        assert asyncio.run(scenario()) == "done"
+
+    @pytest.mark.parametrize("spool_size", [1 << 20, 16], ids=["in_memory", "on_disk"])
+    def test_shared_call_survives_leader_closing_its_upload(self, spool_size):
+        content = b"%PDF-1.4 scan " * 100
+        release = asyncio.Event()
+        calls = []
+
+        async def make_api_request(extractor):
+            await release.wait()
+            upload = extractor.files["file"][1]
+            calls.append(upload if isinstance(upload, bytes) else read_at(upload, 0, len(content)))
+            return {"data": {}}
+
+        async def scenario():
+            upload = tempfile.SpooledTemporaryFile(max_size=spool_size)
+            upload.write(content)
+            upload.seek(0)
+            first = asyncio.create_task(
+                BirthCertExtractor({"file": ("a.pdf", upload)}, {})._fetch_api_data())
+            await asyncio.sleep(0.05)
+            second = asyncio.create_task(
+                BirthCertExtractor({"file": ("a.pdf", content)}, {})._fetch_api_data())
+            await asyncio.sleep(0.05)
+            # The leader's client disconnects and its upload is closed
+            first.cancel()
+            upload.close()
+            release.set()
+            return await second
+
+        with patch.object(BirthCertExtractor, "_make_api_request", make_api_request):
+            assert asyncio.run(scenario()) == {"data": {}}
+
+        assert calls == [content]
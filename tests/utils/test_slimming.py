@@ -0,0 +1,109 @@
+import asyncio
+import io
+import pytest
+import tempfile
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.extractors.id_extractor import IDExtractor
+from src.utils import slimming
+from src.utils.slimming import SlimmingProfile, get_slimming_stats, slim_document
+
+Image = pytest.importorskip("PIL.Image", reason="Pillow from requirements.txt is not installed")
+pypdf = pytest.importorskip("pypdf", reason="pypdf from requirements.txt is not installed")
+PdfReader, PdfWriter = pypdf.PdfReader, pypdf.PdfWriter
+
+
+def _photo(size=(4000, 3000), fmt="PNG"):
+    image = Image.linear_gradient("L").resize(size).convert("RGB")
+    output = io.BytesIO()
+    image.save(output, fmt, dpi=(600, 600))
+    return output.getvalue()
+
+
+def _pdf(pages):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    writer.add_metadata({"/Author": "scanner"})
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+class TestSlimming:
+
+    def test_downscales_and_recompresses_images(self):
+        filename, content, content_type = slim_document(
+            "id.png", _photo(), SlimmingProfile(max_pixels=1_000_000, target_dpi=None))
+
+        image = Image.open(io.BytesIO(content))
+        assert (filename, content_type, image.format) == ("id.jpg", "image/jpeg", "JPEG")
+        assert image.width * image.height <= 1_000_000
+        assert "exif" not in image.info
+
+    def test_target_dpi_limits_resolution(self):
+        _, content, _ = slim_document(
+            "id.jpg", _photo(size=(1200, 600), fmt="JPEG"), SlimmingProfile(max_pixels=None, target_dpi=200))
+
+        assert Image.open(io.BytesIO(content)).size == (400, 200)
+
+    def test_keeps_configured_pdf_pages(self):
+        _, content, _ = slim_document("birth.pdf", _pdf(3), SlimmingProfile(pages=(0,)))
+
+        reader = PdfReader(io.BytesIO(content))
+        assert len(reader.pages) == 1
+        assert "/Author" not in (reader.metadata or {})
+
+    def test_unsupported_or_unshrinkable_documents_are_left_alone(self):
+        profile = SlimmingProfile(pages=(0,))
+
+        assert slim_document("a.pdf", b"not a document", profile) is None
+        assert slim_document("a.pdf", _pdf(1), profile) is None
+
+    def test_slims_spooled_file_in_place(self, monkeypatch):
+        read_at = MagicMock(wraps=slimming.read_at)
+        monkeypatch.setattr(slimming, "read_at", read_at)
+        spooled = tempfile.SpooledTemporaryFile(max_size=1024)
+        spooled.write(_photo())
+
+        filename, content, _ = slim_document(
+            "id.png", spooled, SlimmingProfile(max_pixels=1_000_000))
+
+        assert filename == "id.jpg"
+        assert Image.open(io.BytesIO(content)).format == "JPEG"
+        # Only the type sniff is copied out of the file
+        assert [call.args[2] for call in read_at.call_args_list] == [16]
+
+    def test_missing_library_disables_slimming(self, monkeypatch):
+        monkeypatch.setattr(slimming, "Image", None)
+        monkeypatch.setattr(slimming, "PdfReader", None)
+
+        assert slim_document("id.png", _photo(), SlimmingProfile(max_pixels=1_000_000)) is None
+        assert slim_document("id.pdf", _pdf(3), SlimmingProfile(pages=[0])) is None
+
+    def test_failed_request_does_not_skew_counts(self):
+        stats = slimming.SlimmingStats()
+        # Slimmed, but the API call failed
+        stats.record_slimming("IDExtractor", 1000, 400, 0.1)
+        stats.record_slimming("IDExtractor", 1000, 400, 0.1)
+        stats.record_request("IDExtractor", True, 2.0)
+
+        entry = stats.stats()["IDExtractor"]
+        assert (entry["documents"], entry["slimmed"], entry["bytes_saved"]) == (1, 1, 1200)
+        assert (entry["avg_api_seconds_slimmed"], entry["avg_api_seconds_original"]) == (2.0, None)
+
+    @patch('src.utils.http_client.HTTPTransport.request', new_callable=AsyncMock)
+    def test_extractor_uploads_slimmed_document(self, mock_request):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"data": {"fields": {}}}
+        mock_request.return_value = mock_response
+        photo = _photo()
+
+        extractor = IDExtractor({"file": ("front.png", io.BytesIO(photo))}, {})
+        asyncio.run(extractor._fetch_api_data())
+
+        options, _, sent = mock_request.call_args.kwargs["data"]._fields[0]
+        assert options["filename"] == "front.jpg"
+        assert len(sent) < len(photo)
+        stats = get_slimming_stats().stats()["IDExtractor"]
+        assert stats["bytes_saved"] >= len(photo) - len(sent)
@@ -0,0 +1,27 @@
+from src.utils.work_ledger import WorkLedger
+
+
+class TestWorkLedger:
+
+    def test_stages_keep_earlier_values(self, tmp_path):
+        ledger = WorkLedger(str(tmp_path / "ledger.sqlite3"))
+        ledger.record("rec1", "att1", "hash1", "extract_id", "download")
+        ledger.record("rec1", "att1", "hash1", "extract_id", "extract",
+                      output=b"workbook", extracted={"IDs_info": [{"ID Number": "123"}]})
+        ledger.record("rec1", "att1", "hash1", "extract_id", "drive", file_id="drive1")
+
+        entry = WorkLedger(str(tmp_path / "ledger.sqlite3")).latest("rec1", "att1", "extract_id")
+
+        assert entry == {"attachment_hash": "hash1", "stage": "drive", "output": b"workbook",
+                         "extracted": {"IDs_info": [{"ID Number": "123"}]}, "file_id": "drive1"}
+        assert ledger.latest("rec1", "att1", "extract_cv") is None
+
+    def test_confirmed_update_drops_output(self, tmp_path):
+        ledger = WorkLedger(str(tmp_path / "ledger.sqlite3"))
+        ledger.record("rec1", "att1", "hash1", "extract_id", "extract", output=b"workbook")
+        ledger.record("rec1", "att1", "hash1", "extract_id", "update")
+
+        entry = ledger.latest("rec1", "att1", "extract_id")
+
+        assert (entry["stage"], entry["output"]) == ("update", None)
+        assert ledger.stats() == {"update": 1}
@@ -0,0 +1,82 @@
+import io
+import re
+import zipfile
+from unittest.mock import MagicMock
+from src.utils.excel_generator import ExcelGenerator
+from src.utils.workbook_writer import BLANK_CELL_TEXT, SheetWriter
+
+CV_DATA = {
+    "personal_info": {"Candidate Name": "Jane", "Email": ""},
+    "introduction": "Line one\nline two",
+    "work_experience": [{"Company": "Acme", "Position": "Engineer"},
+                        {"Company": "Globex", "EndDate": "2020"}],
+    "technical_skills": ["Python"],
+    "education": [],
+    "awards": ["Best paper"],
+}
+
+
+def _sheet_xml(excel_data, number):
+    return zipfile.ZipFile(io.BytesIO(excel_data)).read(
+        f"xl/worksheets/sheet{number}.xml").decode()
+
+
+def _sheet_texts(excel_data, number):
+    return re.findall(r"<t[^>]*>([^<]*)</t>", _sheet_xml(excel_data, number))
+
+
+def _highlight_ranges(excel_data):
+    return [re.findall(r'<conditionalFormatting sqref="([^"]+)"', _sheet_xml(excel_data, number))
+            for number in range(1, 7)]
+
+
+class TestWorkbookWriter:
+
+    def test_writes_every_sheet_once_with_blanks_highlighted_per_sheet(self):
+        excel_data = ExcelGenerator().generate_cv_excel(CV_DATA)["excel_data"]
+
+        names = re.findall(r'<sheet name="([^"]+)"', zipfile.ZipFile(
+            io.BytesIO(excel_data)).read("xl/workbook.xml").decode())
+        assert names == ["Personal Info", "Introduction", "Work Experience",
+                         "Technical Skills", "Education", "Awards"]
+        assert _sheet_texts(excel_data, 1) == ["Candidate Name", "Email", "Jane", BLANK_CELL_TEXT]
+        assert _sheet_texts(excel_data, 2) == ["Introduction", "Line one line two"]
+        assert _sheet_texts(excel_data, 3) == [
+            "Company", "Position", "EndDate",
+            "Acme", "Engineer", BLANK_CELL_TEXT,
+            "Globex", BLANK_CELL_TEXT, "2020"]
+        assert _sheet_texts(excel_data, 5) == ["Education"]
+
+    def test_pandas_engine_is_still_available(self):
+        excel_data = ExcelGenerator(engine="pandas").generate_birth_cert_excel(
+            {"personal_info": {"Name": "Jane"}})["excel_data"]
+
+        assert excel_data[:2] == b"PK"
+
+    def test_blank_highlighting_uses_each_sheets_own_dimensions(self):
+        expected = [["A2:B2"], ["A2"], ["A2:C3"], ["A2"], [], ["A2"]]
+
+        for engine in ("streaming", "pandas"):
+            excel_data = ExcelGenerator(engine=engine).generate_cv_excel(CV_DATA)["excel_data"]
+
+            assert _highlight_ranges(excel_data) == expected, engine
+
+    def test_formats_are_created_once_per_workbook(self):
+        many_rows = {**CV_DATA, "technical_skills": ["Python", ""] * 500}
+
+        excel_data = ExcelGenerator().generate_cv_excel(many_rows)["excel_data"]
+
+        styles = zipfile.ZipFile(io.BytesIO(excel_data)).read("xl/styles.xml").decode()
+        assert re.search(r'<cellXfs count="(\d+)"', styles).group(1) == "3"
+        assert re.search(r'<dxfs count="(\d+)"', styles).group(1) == "1"
+
+    def test_column_layout_is_set_once_per_sheet(self):
+        worksheet = MagicMock()
+        formats = {"header": "header", "cell": "cell", "blank": "blank"}
+
+        sheet = SheetWriter(worksheet, formats, ["Name"])
+        sheet.write_row({"Name": ""})
+        sheet.finish()
+
+        worksheet.set_column.assert_called_once()
+        worksheet.conditional_format.assert_called_once()